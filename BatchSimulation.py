@@ -0,0 +1,310 @@
+# Author: Andrea Vaiuso
+# Version: 1.0
+# Date: 18.10.2026
+# Description: This module defines the BatchSimulation class, which flies a whole population of drones
+# (for example a set of PID gain candidates) along the same waypoints in a single time loop.
+# Every drone keeps its own dynamic target, waypoint progress and termination status.
+
+import numpy as np
+from Drone import BatchQuadcopterModel
+from World import World
+from Wind import dryden_response
+from Monitors import MotionMonitor
+from FlightRecorder import FlightRecorder
+from CompiledPath import CompiledPath
+import time
+
+
+class BatchSimulation:
+    def __init__(self, drone: BatchQuadcopterModel, world: World, waypoints,
+                 dt: float = 0.007, max_simulation_time: float = 200.0, frame_skip: int = 8,
+                 target_reached_threshold: float = 2.0,
+                 dynamic_target_shift_threshold_distance: float = 5,
+                 motion_monitor: MotionMonitor = None):
+        """
+        Initialize the batched simulation with the batched drone model, world, waypoints, and parameters.
+        Parameters:
+            drone (BatchQuadcopterModel): The batch of drones to simulate.
+            world (World): The world in which the simulation takes place.
+            waypoints (list or CompiledPath): List of waypoints with 'x', 'y', 'z', and 'v' keys, or a
+                CompiledPath built from it, shared by all drones.
+            dt (float): Time step for the simulation.
+            max_simulation_time (float): Maximum simulation time in seconds.
+            frame_skip (int): Number of steps to skip for data collection.
+            target_reached_threshold (float): Threshold distance to consider the target reached.
+            dynamic_target_shift_threshold_distance (float): Distance to consider for shifting the target.
+            motion_monitor (MotionMonitor): Batched detector (n_drones = N) used to stop the drones that are
+                not moving. Default is a MotionMonitor considering all the logged frames after 5 s.
+
+        The dynamic target strategy is the same as in Simulation, evaluated for all drones at once.
+        A drone stops being integrated as soon as it reaches the final target or is detected as not moving;
+        the simulation ends when no drone is active anymore or the maximum simulation time is reached.
+        """
+        self.drone = drone
+        self.world = world
+        self.path = waypoints if isinstance(waypoints, CompiledPath) else CompiledPath(waypoints)
+        self.waypoints = self.path.waypoints
+        self.waypoint_positions = self.path.seg_end
+        self.waypoint_speeds = self.path.seg_speed
+        self.dt = dt
+        self.max_simulation_time = max_simulation_time
+        self.frame_skip = frame_skip
+        self.target_reached_threshold = target_reached_threshold
+        self.dynamic_target_shift_threshold_distance = dynamic_target_shift_threshold_distance
+
+        # Wind simulation parameters
+        self.wind_signals = []
+        self.simulate_wind = False
+
+        n = self.drone.n_drones
+        self.motion_monitor = motion_monitor if motion_monitor is not None else MotionMonitor(n_drones=n)
+        self.n_frames = np.zeros(n, dtype=int)
+        self.navigation_time = np.full(n, np.nan)
+        self.has_moved = np.ones(n, dtype=bool)
+        self.has_reached_target = np.zeros(n, dtype=bool)
+        self.simulation_time = 0.0
+        n_rotors = self.drone.n_rotors
+        self.recorder = FlightRecorder(
+            {'time': (), 'position': (n, 3), 'angles': (n, 3), 'rpm': (n, n_rotors),
+             'horiz_speed': (n,), 'vertical_speed': (n,), 'target': (n, 3),
+             'thrust': (n, n_rotors), 'delta_b': (n,)},
+            FlightRecorder.frames_for(max_simulation_time, dt, frame_skip))
+
+    # Logged histories: zero-copy views of the recorder columns, of shape (n_frames, N, ...)
+    @property
+    def time_history(self) -> np.ndarray:
+        return self.recorder['time']
+
+    @property
+    def positions(self) -> np.ndarray:
+        return self.recorder['position']
+
+    @property
+    def angles_history(self) -> np.ndarray:
+        return self.recorder['angles']
+
+    @property
+    def rpms_history(self) -> np.ndarray:
+        return self.recorder['rpm']
+
+    @property
+    def horiz_speed_history(self) -> np.ndarray:
+        return self.recorder['horiz_speed']
+
+    @property
+    def vertical_speed_history(self) -> np.ndarray:
+        return self.recorder['vertical_speed']
+
+    @property
+    def targets(self) -> np.ndarray:
+        return self.recorder['target']
+
+    @property
+    def thrust_history(self) -> np.ndarray:
+        return self.recorder['thrust']
+
+    @property
+    def delta_b_history(self) -> np.ndarray:
+        return self.recorder['delta_b']
+
+    def setWind(self, max_simulation_time: float, dt: float, height: float = 100,
+                airspeed: float = 10, turbulence_level: int = 30,
+                axis=['u', 'v', 'w'], seed=None):
+        """
+        Set the wind conditions for the simulation using a Dryden wind model.
+        The same wind realization is applied to every drone of the batch, so that candidates are compared
+        under identical disturbances.
+        Parameters:
+            max_simulation_time (float): Maximum simulation time in seconds.
+            dt (float): Time step for the simulation.
+            height (float): Height above ground level for the wind model.
+            airspeed (float): Airspeed of the drone.
+            turbulence_level (int): Level of turbulence to simulate.
+
+        The new signals replace any wind set before.
+        """
+        num_steps = int(max_simulation_time / dt)
+        if isinstance(axis, str):
+            axis = [axis]
+        self.wind_signals = []
+        for ax in axis:
+            self.wind_signals.append(
+                dryden_response(axis=ax, height=height, airspeed=airspeed,
+                                turbulence_level=turbulence_level, time_steps=num_steps, seed=seed)
+            )
+        self.simulate_wind = True
+
+    def setWindSignals(self, wind_signals: np.ndarray):
+        """
+        Use precomputed wind signals, e.g. from Wind.dryden_wind_batch.
+        Parameters:
+            wind_signals (np.ndarray): Wind speeds in m/s, either of shape (n_axes, n_steps) to apply the same
+                realization to every drone, or of shape (N, n_axes, n_steps) to give each drone its own
+                realization. Axes are in the order of setWind ('u', 'v', 'w'); the third one is applied as the
+                vertical component. The data is used without copying.
+        """
+        wind_signals = np.asarray(wind_signals)
+        num_steps = int(self.max_simulation_time / self.dt)
+        if wind_signals.ndim not in (2, 3) or wind_signals.shape[-1] < num_steps or \
+                (wind_signals.ndim == 3 and wind_signals.shape[0] != self.drone.n_drones):
+            raise ValueError(f"Wind signals must have shape (n_axes, n_steps) or (N, n_axes, n_steps) "
+                             f"with N = {self.drone.n_drones} and at least {num_steps} steps.")
+        # Axis first, so that wind_signals[axis][..., step] is a scalar or an array of shape (N,)
+        self.wind_signals = list(np.moveaxis(wind_signals, -2, 0))
+        self.simulate_wind = True
+
+    def _compute_moving_targets(self, drone_pos: np.ndarray, seg_start: np.ndarray, seg_end: np.ndarray,
+                                v_des: np.ndarray, max_target_length: np.ndarray, k: float = 1.0) -> tuple:
+        """
+        Vectorized version of Simulation._compute_moving_target.
+        Parameters:
+            drone_pos (np.ndarray): Current drone positions, shape (N, 3).
+            seg_start (np.ndarray): Start points of the current segments, shape (N, 3).
+            seg_end (np.ndarray): End points of the current segments, shape (N, 3).
+            v_des (np.ndarray): Desired speed of the current segments, shape (N,).
+            max_target_length (np.ndarray): Furthest target length reached so far on each segment, shape (N,).
+                Updated in place so that targets never move backward.
+            k (float): Scaling factor for the look-ahead distance.
+        Returns:
+            tuple: (targets, distances) with shapes (N, 3) and (N,).
+        """
+        seg_vector = seg_end - seg_start
+        seg_length = np.linalg.norm(seg_vector, axis=1)
+        degenerate = seg_length == 0
+        seg_dir = seg_vector / np.where(degenerate, 1.0, seg_length)[:, None]
+
+        proj_length = np.einsum('ij,ij->i', drone_pos - seg_start, seg_dir)
+        L = k * v_des
+        np.maximum(max_target_length, np.where(degenerate, max_target_length, proj_length + L), out=max_target_length)
+        target_length = np.minimum(max_target_length, seg_length)
+
+        targets = seg_start + target_length[:, None] * seg_dir
+        targets[degenerate] = seg_end[degenerate]
+        distances = np.linalg.norm(drone_pos - targets, axis=1)
+        distances[degenerate] = 1.0
+        return targets, distances
+
+    def startSimulation(self, stop_at_target: bool = True, verbose: bool = True, stop_sim_if_not_moving: bool = False):
+        """
+        Start the simulation of all the drones following dynamic targets along the waypoints.
+        Parameters:
+            stop_at_target (bool): If True, a drone stops when it reaches the final target.
+            verbose (bool): If True, print simulation progress and completion messages.
+            stop_sim_if_not_moving (bool): If True, a drone stops if it has not been moving for a certain period.
+
+        Histories are stored as arrays of shape (n_frames, N, ...); n_frames[i] tells how many frames
+        are valid for drone i (see get_drone_history).
+        """
+        n = self.drone.n_drones
+        n_waypoints = len(self.waypoints)
+        num_steps = int(self.max_simulation_time / self.dt)
+        self.recorder.reset(FlightRecorder.frames_for(self.max_simulation_time, self.dt, self.frame_skip))
+        self.n_frames[:] = 0
+        self.navigation_time[:] = np.nan
+        self.has_moved[:] = True
+        self.has_reached_target[:] = False
+
+        self.drone.reset_state()
+        self.motion_monitor.reset()
+
+        t_0 = time.time()
+
+        # Per-drone dynamic targeting state
+        seg_idx = np.zeros(n, dtype=int)
+        seg_start = self.drone.pos.copy()
+        seg_end = np.repeat(self.waypoint_positions[:1], n, axis=0)
+        v_des = np.full(n, self.waypoint_speeds[0])
+        max_target_length = np.zeros(n)
+        k_lookahead = 1.0
+        final_target = self.waypoint_positions[-1]
+
+        active = np.ones(n, dtype=bool)
+
+        for step in range(num_steps):
+            # Compute dynamic targets
+            targets, distances = self._compute_moving_targets(
+                self.drone.pos, seg_start, seg_end, v_des, max_target_length, k=k_lookahead)
+
+            # Shift to next segment if needed
+            shift = active & (distances <= self.dynamic_target_shift_threshold_distance)
+            if shift.any():
+                seg_idx[shift] += 1
+                advance = shift & (seg_idx < n_waypoints)
+                finished = shift & ~advance
+                if advance.any():
+                    seg_start[advance] = seg_end[advance]
+                    seg_end[advance] = self.waypoint_positions[seg_idx[advance]]
+                    v_des[advance] = self.waypoint_speeds[seg_idx[advance]]
+                    new_max_length = np.zeros(int(advance.sum()))
+                    new_targets, _ = self._compute_moving_targets(
+                        self.drone.pos[advance], seg_start[advance], seg_end[advance], v_des[advance],
+                        new_max_length, k=k_lookahead)
+                    max_target_length[advance] = new_max_length
+                    targets[advance] = new_targets
+                targets[finished] = seg_end[finished]
+                seg_idx[finished] = n_waypoints
+
+            # Update drone states
+            self.drone.update_state(targets, self.dt, active=active)
+            # Apply wind if enabled
+            if self.simulate_wind and len(self.wind_signals) >= 3:
+                self.drone.update_wind(self.wind_signals[2][..., step], simulate_wind=True)  # Only use 'w' axis wind for vertical component
+
+            current_time = step * self.dt
+
+            # Store data at specified intervals
+            if step % self.frame_skip == 0:
+                vel = self.drone.vel
+                h_speed = np.linalg.norm(vel[:, :2], axis=1)
+                self.recorder.record(time=current_time, position=self.drone.pos, angles=self.drone.angles,
+                                     rpm=self.drone.rpm, horiz_speed=h_speed, vertical_speed=vel[:, 2],
+                                     target=targets, thrust=self.drone.thrust, delta_b=self.drone.delta_b)
+                self.n_frames[active] = len(self.recorder)
+                self.motion_monitor.update(h_speed, vel[:, 2], mask=active)
+
+            # Check for final target reached only if all the other waypoints have been reached
+            if stop_at_target:
+                reached = active & (seg_idx == n_waypoints) & \
+                    (np.linalg.norm(self.drone.pos - final_target, axis=1) < self.target_reached_threshold)
+                self.navigation_time[reached] = current_time
+                self.has_reached_target[reached] = True
+                active &= ~reached
+
+            # Check if drones are not moving
+            if stop_sim_if_not_moving:
+                stalled = active & self.motion_monitor.is_stalled(current_time)
+                self.navigation_time[stalled] = current_time
+                self.has_moved[stalled] = False
+                active &= ~stalled
+
+            if not active.any():
+                break
+
+        # Trim histories to the frames actually logged
+        self.recorder.trim()
+
+        self.simulation_time = time.time() - t_0
+        if verbose:
+            print(f"Batch of {n} drones simulated in {self.simulation_time:.2f} seconds "
+                  f"({int(self.has_reached_target.sum())} reached the final target).")
+
+    def get_drone_history(self, i: int) -> dict:
+        """
+        Return the logged data of a single drone of the batch, trimmed to the frames recorded while it was active.
+        Parameters:
+            i (int): Index of the drone in the batch.
+        Returns:
+            dict: Arrays with the same meaning as the Simulation histories.
+        """
+        n = self.n_frames[i]
+        return {
+            'positions': self.positions[:n, i],
+            'angles_history': self.angles_history[:n, i],
+            'rpms_history': self.rpms_history[:n, i],
+            'time_history': self.time_history[:n],
+            'horiz_speed_history': self.horiz_speed_history[:n, i],
+            'vertical_speed_history': self.vertical_speed_history[:n, i],
+            'targets': self.targets[:n, i],
+            'thrust_history': self.thrust_history[:n, i],
+            'delta_b_history': self.delta_b_history[:n, i],
+        }
@@ -0,0 +1,107 @@
+# Author: Andrea Vaiuso
+# Version: 1.0
+# Date: 18.10.2026
+# Description: This module defines the CompiledPath class, an immutable precompiled description of the path
+# defined by a list of waypoints (segment end points, unit directions, lengths, cumulative distance and speeds).
+# A CompiledPath is built once and can be shared read-only by any number of simulations, also across
+# worker processes since it is picklable.
+
+import numpy as np
+
+class CompiledPath:
+    def __init__(self, waypoints: list, start_position: np.ndarray = None):
+        """
+        Compile a list of waypoints.
+
+        Parameters:
+            waypoints (list): List of waypoints with 'x', 'y', 'z', and 'v' keys.
+            start_position (np.ndarray): Position [x, y, z] from which the first segment starts, usually
+                the initial position of the drone. If None, the first segment starts at the first waypoint
+                (zero length) until a start position is given with with_start.
+
+        Segment i goes from waypoint i-1 (or the start position for i = 0) to waypoint i, and is flown at
+        the speed 'v' of waypoint i. All the arrays are read-only.
+        """
+        if len(waypoints) == 0:
+            raise ValueError("A path needs at least one waypoint.")
+        waypoint_array = np.array([[wp['x'], wp['y'], wp['z'], wp['v']] for wp in waypoints], dtype=float)
+        self._set_geometry(waypoint_array, start_position)
+
+    def _set_geometry(self, waypoint_array: np.ndarray, start_position: np.ndarray) -> None:
+        seg_end = waypoint_array[:, :3]
+        has_start = start_position is not None
+        first_start = np.asarray(start_position, dtype=float) if has_start else seg_end[0]
+        seg_start = np.vstack([first_start, seg_end[:-1]])
+        seg_vector = seg_end - seg_start
+        seg_length = np.array([np.linalg.norm(v) for v in seg_vector])
+        seg_dir = np.zeros_like(seg_vector)
+        nonzero = seg_length > 0
+        seg_dir[nonzero] = seg_vector[nonzero] / seg_length[nonzero, None]
+
+        arrays = {
+            'waypoint_array': waypoint_array,
+            'start_position': first_start.copy() if has_start else None,
+            'seg_start': seg_start,
+            'seg_end': seg_end,
+            'seg_dir': seg_dir,
+            'seg_length': seg_length,
+            'seg_speed': waypoint_array[:, 3],
+            'cumulative_length': np.concatenate([[0.0], np.cumsum(seg_length)]),
+        }
+        for name, array in arrays.items():
+            if array is not None:
+                array.flags.writeable = False
+            object.__setattr__(self, name, array)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CompiledPath is immutable.")
+
+    def __len__(self) -> int:
+        return len(self.waypoint_array)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CompiledPath):
+            return NotImplemented
+        same_start = (self.start_position is None and other.start_position is None) or \
+            (self.start_position is not None and other.start_position is not None and
+             np.array_equal(self.start_position, other.start_position))
+        return same_start and np.array_equal(self.waypoint_array, other.waypoint_array)
+
+    __hash__ = None
+
+    def __getstate__(self) -> dict:
+        return {'waypoint_array': np.array(self.waypoint_array), 'start_position': self.start_position}
+
+    def __setstate__(self, state: dict) -> None:
+        self._set_geometry(state['waypoint_array'], state['start_position'])
+
+    @property
+    def final_target(self) -> np.ndarray:
+        return self.seg_end[-1]
+
+    @property
+    def total_length(self) -> float:
+        return float(self.cumulative_length[-1])
+
+    @property
+    def waypoints(self) -> list:
+        """
+        The waypoints as a list of dictionaries with 'x', 'y', 'z', and 'v' keys.
+        """
+        return [{'x': x, 'y': y, 'z': z, 'v': v} for x, y, z, v in self.waypoint_array.tolist()]
+
+    def with_start(self, start_position: np.ndarray) -> 'CompiledPath':
+        """
+        Return the path starting from the given position. If the path already starts there, it is returned as is.
+
+        Parameters:
+            start_position (np.ndarray): Position [x, y, z] from which the first segment starts.
+
+        Returns:
+            CompiledPath: The path starting at start_position.
+        """
+        if self.start_position is not None and np.array_equal(self.start_position, start_position):
+            return self
+        path = object.__new__(CompiledPath)
+        path._set_geometry(self.waypoint_array, start_position)
+        return path
@@ -205,4 +205,146 @@ class QuadCopterController:
                 kp_att, ki_att, kd_att,
                 kp_yaw, ki_yaw, kd_yaw,
                 kp_hsp, ki_hsp, kd_hsp,
-                kp_vsp, ki_vsp, kd_vsp)
\ No newline at end of file
+                kp_vsp, ki_vsp, kd_vsp)
+
+class BatchPIDController:
+    def __init__(self, kp: np.ndarray, ki: np.ndarray, kd: np.ndarray, windup_limit: np.ndarray):
+        """
+        Initialize a bank of independent PID controllers evaluated as one vectorized operation.
+
+        Parameters:
+            kp (np.ndarray): Proportional gains, one per drone.
+            ki (np.ndarray): Integral gains, one per drone.
+            kd (np.ndarray): Derivative gains, one per drone.
+            windup_limit (np.ndarray): Maximum absolute value for each integral term (anti-windup).
+        """
+        self.kp = np.asarray(kp, dtype=float)
+        self.ki = np.asarray(ki, dtype=float)
+        self.kd = np.asarray(kd, dtype=float)
+        self.integral_limit = np.abs(np.asarray(windup_limit, dtype=float))
+        self.integral = np.zeros_like(self.kp)
+        self.prev_error = np.zeros_like(self.kp)
+
+    @classmethod
+    def from_controllers(cls, controllers: list) -> 'BatchPIDController':
+        """
+        Stack the gains and anti-windup limits of several PIDController instances.
+
+        Parameters:
+            controllers (list): List of PIDController objects.
+
+        Returns:
+            BatchPIDController: Batched controller with one lane per input controller.
+        """
+        return cls(kp=[c.kp for c in controllers],
+                   ki=[c.ki for c in controllers],
+                   kd=[c.kd for c in controllers],
+                   windup_limit=[c.integral_limit for c in controllers])
+
+    def reset(self) -> None:
+        """
+        Reset the integral and derivative memory of every lane.
+        """
+        self.integral[:] = 0.0
+        self.prev_error[:] = 0.0
+
+    def update(self, current_value: np.ndarray, target_value: np.ndarray, dt: float) -> np.ndarray:
+        """
+        Compute the PID outputs with anti-windup for all lanes.
+
+        Parameters:
+            current_value (np.ndarray): The current measurements.
+            target_value (np.ndarray): The desired setpoints.
+            dt (float): Time step.
+
+        Returns:
+            np.ndarray: Control outputs.
+        """
+        error = target_value - current_value
+        self.integral += error * dt
+        # Anti-windup: clamp the integral term
+        np.clip(self.integral, -self.integral_limit, self.integral_limit, out=self.integral)
+        derivative = (error - self.prev_error) / dt if dt > 0 else 0
+        self.prev_error = error
+        return self.kp * error + self.ki * self.integral + self.kd * derivative
+
+
+class BatchQuadCopterController:
+    PID_NAMES = ('pid_x', 'pid_y', 'pid_z', 'pid_roll', 'pid_pitch', 'pid_yaw', 'pid_h_speed', 'pid_v_speed')
+
+    def __init__(self, controllers: list):
+        """
+        Vectorized counterpart of QuadCopterController: every drone of a batch keeps its own gains,
+        limits and integrator state, but all of them are updated with a single set of array operations.
+
+        Parameters:
+            controllers (list): List of QuadCopterController objects, one per drone in the batch.
+        """
+        self.n_drones = len(controllers)
+        self.u1_limit = np.array([c.u1_limit for c in controllers], dtype=float)
+        self.u2_limit = np.array([c.u2_limit for c in controllers], dtype=float)
+        self.u3_limit = np.array([c.u3_limit for c in controllers], dtype=float)
+        self.u4_limit = np.array([c.u4_limit for c in controllers], dtype=float)
+        self.max_h_speed_limit = np.array([c.max_h_speed_limit for c in controllers], dtype=float)
+        self.max_v_speed_limit = np.array([c.max_v_speed_limit for c in controllers], dtype=float)
+        self.max_angle_limit_rad = np.array([c.max_angle_limit_rad for c in controllers], dtype=float)
+
+        for name in self.PID_NAMES:
+            setattr(self, name, BatchPIDController.from_controllers([getattr(c, name) for c in controllers]))
+
+    def reset(self) -> None:
+        """
+        Reset the memory of all the PID controllers of the batch.
+        """
+        for name in self.PID_NAMES:
+            getattr(self, name).reset()
+
+    def update(self, pos: np.ndarray, vel: np.ndarray, angles: np.ndarray, target: np.ndarray,
+               dt: float, m: np.ndarray, g: float = 9.81) -> tuple:
+        """
+        Compute the control commands for every drone of the batch.
+
+        Parameters:
+            pos (np.ndarray): Positions, shape (N, 3).
+            vel (np.ndarray): Velocities, shape (N, 3).
+            angles (np.ndarray): Roll, pitch and yaw angles in radians, shape (N, 3).
+            target (np.ndarray): Target positions, shape (N, 3).
+            dt (float): Time step.
+            m (np.ndarray): Mass of each drone, shape (N,).
+            g (float): Gravity acceleration (default 9.81 m/s^2).
+
+        Returns:
+            tuple: (thrust_command, roll_command, pitch_command, yaw_command), each of shape (N,).
+        """
+        x, y, z = pos[:, 0], pos[:, 1], pos[:, 2]
+        roll, pitch, yaw = angles[:, 0], angles[:, 1], angles[:, 2]
+        x_t, y_t, z_t = target[:, 0], target[:, 1], target[:, 2]
+        v_x, v_y, v_z = vel[:, 0], vel[:, 1], vel[:, 2]
+
+        desired_v_speed = self.max_v_speed_limit
+        desired_h_speed = self.max_h_speed_limit
+
+        # Outer loop: altitude control with feed-forward for hover
+        compensation = np.clip(1.0 / (np.cos(pitch) * np.cos(roll)), 1.0, 1.5)
+        hover_thrust = m * g * compensation
+        vz_t = np.clip(self.pid_z.update(z, z_t, dt), -desired_v_speed, desired_v_speed)
+        vz_output = self.pid_v_speed.update(v_z, vz_t, dt)
+        thrust_command = np.clip(hover_thrust + vz_output, 0, self.u1_limit)
+
+        # Position controllers compute desired velocities, speed controllers compute desired angles
+        vx_t = np.clip(self.pid_x.update(x, x_t, dt), -desired_h_speed, desired_h_speed)
+        vy_t = np.clip(self.pid_y.update(y, y_t, dt), -desired_h_speed, desired_h_speed)
+        pitch_des = np.clip(self.pid_h_speed.update(v_x, vx_t, dt), -self.max_angle_limit_rad, self.max_angle_limit_rad)
+        roll_des = np.clip(-self.pid_h_speed.update(v_y, vy_t, dt), -self.max_angle_limit_rad, self.max_angle_limit_rad)
+
+        # Inner loop: attitude control
+        roll_command = self.pid_roll.update(roll, roll_des, dt)
+        pitch_command = self.pid_pitch.update(pitch, pitch_des, dt)
+        yaw_command = self.pid_yaw.update(yaw, 0, dt)
+
+        # Saturate the commands
+        roll_command = np.clip(roll_command, -self.u2_limit, self.u2_limit)
+        pitch_command = np.clip(pitch_command, -self.u3_limit, self.u3_limit)
+        yaw_command = np.clip(yaw_command, -self.u4_limit, self.u4_limit)
+
+        return (thrust_command, roll_command, pitch_command, yaw_command)
@@ -3,19 +3,36 @@
 # Date: 18.07.2025
 # Description: This module defines the QuadcopterModel class, which simulates the dynamics of a quadcopter drone using BEMT.
 # It includes methods for translational and rotational dynamics, state updates, and wind effects.
+# BatchQuadcopterModel steps N drones at once with the same physics, as vectorized NumPy operations.
 
+import math
+from functools import lru_cache
+from types import MappingProxyType
 import numpy as np
-from Controller import QuadCopterController
+from Controller import QuadCopterController, BatchQuadCopterController
 from utils import wrap_angle
-import numpy as np
-from Rotor.TorchRotorModel import RotorModel
+from Rotor.NumpyRotorModel import get_shared_rotor_model, FusedRotorModel
+from Rotor.RotorLookupTable import RotorLookupTable
+
+
+@lru_cache(maxsize=None)
+def _shared_lookup_table(rotor_model, max_rpm: float, lut_options: tuple) -> RotorLookupTable:
+    """
+    Build (once per process) the lookup table of a shared rotor model for the given RPM range and options.
+    """
+    return RotorLookupTable.from_rotor_model(rotor_model, max_rpm, **dict(lut_options))
 
 
 class QuadcopterModel:
+    # Layout of the flat state buffer: integrated states first, rotor quantities after
+    STATE_KEYS = ('pos', 'vel', 'angles', 'ang_vel')
+    ROTOR_KEYS = ('rpm', 'thrust', 'torque', 'power')
+
     def __init__(self, m: float, I: np.ndarray, d: float, l: float, Cd: float, 
                 Ca: np.ndarray, Jr: float,
                 init_state: dict, controller: QuadCopterController, n_rotors = 4,
-                max_rpm: float = 8000.0, rotor_model_path: str = 'Rotor/rotor_model.pth', rotor_data_path: str = 'Rotor/rotor_config.ini'):
+                max_rpm: float = 8000.0, rotor_model_path: str = 'Rotor/rotor_model.pth', rotor_data_path: str = 'Rotor/rotor_config.ini',
+                aero_backend = 'mlp', lut_options: dict = None, norm_params_path: str = 'Rotor/normalization_params.pth'):
         """
         Initialize the physical model of the quadcopter.
 
@@ -32,7 +49,18 @@ class QuadcopterModel:
             n_rotors (int): Number of rotors. Default is 4 for a quadcopter.
             max_rpm (float): Maximum RPM for the motors.
             rotor_model_path (str): Path to the pre-trained rotor model. Default is 'Rotor/rotor_model.pth'.
+                .npz exports are evaluated with NumPy, without importing torch; .pth checkpoints use torch.
             rotor_data_path (str): Path to the rotor configuration file. Default is 'Rotor/rotor_config.ini'.
+            aero_backend (str or object): Backend used to evaluate the rotor aerodynamics. 'mlp' evaluates the
+                neural rotor model one rotor at a time, as the original per-rotor loop did. 'mlp_batch' evaluates
+                all the rotors in one forward pass (faster, but its outputs differ in the last bits, so trajectories
+                diverge from 'mlp'). 'lut' samples the model once into a RotorLookupTable over [0, max_rpm].
+                Any object exposing predict_aerodynamic_batch(rpms) can also be passed. Default is 'mlp'.
+            lut_options (dict): Optional arguments for RotorLookupTable (n_samples, method, tolerance) when aero_backend is 'lut'.
+            norm_params_path (str): Path to the rotor model normalization parameters (used by .pth checkpoints only).
+
+        The rotor model (and its lookup table) is loaded once per process and shared by all the rotors
+        of all the drones, see get_shared_rotor_model.
         """
 
         self.rho = 1.225  # Air density in kg/m³
@@ -45,14 +73,15 @@ class QuadcopterModel:
         self.Cd = Cd
         self.Ca = Ca
         self.Jr = Jr
-        self.state = init_state
         self.init_state = init_state.copy()  # Store the initial state for reset
         self.controller = controller
         self.max_rpm = max_rpm
         self.delta_b = 0.0
-        self.thrust = 0.0 
         self.thrust_no_wind = 0.0  # Thrust without wind effect
 
+        self._allocate_state(n_rotors)
+        self._load_state(init_state)
+
         # From rotor ini file, read rotor radius
         with open(rotor_data_path, 'r') as f:
             for line in f:
@@ -63,18 +92,81 @@ class QuadcopterModel:
 
         self.A = np.pi * (self.R ** 2)  # Rotor area
 
-        self.rotors: list[RotorModel] = []
-        for _ in range(n_rotors):
-            rotor_model = RotorModel(1,6, norm_params_path="Rotor/normalization_params.pth")
-            rotor_model.load_model(rotor_model_path)
-            self.rotors.append(rotor_model)
+        self.n_rotors = n_rotors
+        self.rotor_model = get_shared_rotor_model(rotor_model_path, norm_params_path)
         
         self.max_rpm_sq = (self.max_rpm * 2 * np.pi / 60)**2 # Maximum RPM squared for clipping
 
+        if aero_backend == 'mlp':
+            self.aero_backend = self.rotor_model
+        elif aero_backend == 'mlp_batch':
+            self.aero_backend = FusedRotorModel(self.rotor_model)
+        elif aero_backend == 'lut':
+            self.aero_backend = _shared_lookup_table(self.rotor_model, float(self.max_rpm),
+                                                     tuple(sorted((lut_options or {}).items())))
+        elif isinstance(aero_backend, str):
+            raise ValueError(f"Unknown aerodynamic backend '{aero_backend}'. Use 'mlp', 'mlp_batch' or 'lut'.")
+        else:
+            self.aero_backend = aero_backend
+
         self.c_t = 0
         self.c_q = 0
 
 
+    def _allocate_state(self, n_rotors: int) -> None:
+        """
+        Allocate the flat float64 state buffer, its named views and the RK4 scratch buffers.
+        The buffer holds [pos(3), vel(3), angles(3), ang_vel(3), rpm, thrust, torque, power (n_rotors each)].
+        """
+        self._n_states = 3 * len(self.STATE_KEYS)
+        self._buffer = np.zeros(self._n_states + n_rotors * len(self.ROTOR_KEYS))
+        self._y = self._buffer[:self._n_states]  # Integrated part of the state
+
+        slices = {key: slice(3 * i, 3 * i + 3) for i, key in enumerate(self.STATE_KEYS)}
+        for i, key in enumerate(self.ROTOR_KEYS):
+            start = self._n_states + i * n_rotors
+            slices[key] = slice(start, start + n_rotors)
+
+        self._pos, self._vel, self._angles, self._ang_vel = (self._buffer[slices[key]] for key in self.STATE_KEYS)
+        self._rpm, self._thrust, self._torque, self._power = (self._buffer[slices[key]] for key in self.ROTOR_KEYS)
+
+        # Read-only views exposed through the state property
+        readonly = {}
+        for key, sl in slices.items():
+            view = self._buffer[sl]
+            view.flags.writeable = False
+            readonly[key] = view
+        self._state_view = MappingProxyType(readonly)
+
+        # Scratch buffers for the RK4 stages
+        self._k = np.empty((4, self._n_states))
+        self._y_stage = np.empty(self._n_states)
+
+    def _load_state(self, state: dict) -> None:
+        """
+        Copy a state dictionary into the flat state buffer. Scalar entries (e.g. thrust = 0.0) are broadcast.
+        """
+        self._buffer[:] = 0.0
+        for key in self.STATE_KEYS + self.ROTOR_KEYS:
+            if key in state:
+                getattr(self, f'_{key}')[:] = state[key]
+
+    @property
+    def state(self) -> MappingProxyType:
+        """
+        Read-only dictionary view of the current state with keys 'pos', 'vel', 'angles', 'ang_vel',
+        'rpm', 'thrust', 'torque' and 'power'. The arrays are live views on the state buffer:
+        copy them to keep a snapshot.
+        """
+        return self._state_view
+
+    @property
+    def thrust(self) -> np.ndarray:
+        """
+        Snapshot of the thrust of each rotor in N.
+        """
+        return self._thrust.copy()
+
     def compute_hover_rpm(self, c_t) -> None:
         """
         Compute the RPM value needed for hovering flight nondepending on thrust coefficient.
@@ -90,66 +182,65 @@ class QuadcopterModel:
         """
         Return a string representation of the quadcopter model.
         """
-        return f"Quadcopter Model: state = {self.state}"
+        return f"Quadcopter Model: state = {dict(self.state)}"
 
-    def _translational_dynamics(self, state: dict) -> np.ndarray:
+    def _translational_dynamics(self, y: np.ndarray, out: np.ndarray) -> np.ndarray:
         """
         Compute the translational accelerations.
 
         Parameters:
-            state (dict): Current state.
+            y (np.ndarray): Integrated state [pos, vel, angles, ang_vel].
+            out (np.ndarray): Output buffer of length 3.
 
         Returns:
-            np.ndarray: Acceleration vector [x_ddot, y_ddot, z_ddot].
+            np.ndarray: Acceleration vector [x_ddot, y_ddot, z_ddot] (the out buffer).
         """
-        x_dot, y_dot, z_dot = state['vel']
-        roll, pitch, yaw = state['angles'] # Respect to the world frame in radians
-        T = np.sum(state['thrust'])  # Total thrust from all rotors
+        x_dot, y_dot, z_dot = y[3], y[4], y[5]
+        roll, pitch, yaw = y[6], y[7], y[8] # Respect to the world frame in radians
+        T = self._thrust.sum()  # Total thrust from all rotors
 
-        x_ddot = (T / self.m *
-                  (np.cos(yaw) * np.sin(pitch) * np.cos(roll) + np.sin(yaw) * np.sin(roll))
-                  - self.Cd[0] / self.m * x_dot)
-        y_ddot = (T / self.m *
-                  (np.sin(yaw) * np.sin(pitch) * np.cos(roll) - np.cos(yaw) * np.sin(roll))
-                  - self.Cd[1] / self.m * y_dot)
-        z_ddot = (T / self.m *
-                  (np.cos(pitch) * np.cos(roll))
-                  - self.Cd[2] / self.m * z_dot - self.g)
+        cr, sr = math.cos(roll), math.sin(roll)
+        cp, sp = math.cos(pitch), math.sin(pitch)
+        cy, sy = math.cos(yaw), math.sin(yaw)
 
-        return np.array([x_ddot, y_ddot, z_ddot])
+        out[0] = T / self.m * (cy * sp * cr + sy * sr) - self.Cd[0] / self.m * x_dot
+        out[1] = T / self.m * (sy * sp * cr - cy * sr) - self.Cd[1] / self.m * y_dot
+        out[2] = T / self.m * (cp * cr) - self.Cd[2] / self.m * z_dot - self.g
+        return out
 
-    def _rotational_dynamics(self, state: dict) -> np.ndarray:
+    def _rotational_dynamics(self, y: np.ndarray, out: np.ndarray) -> np.ndarray:
         """
         Compute the rotational accelerations.
 
         Parameters:
-            state (dict): Current state.
+            y (np.ndarray): Integrated state [pos, vel, angles, ang_vel].
+            out (np.ndarray): Output buffer of length 3.
 
         Returns:
-            np.ndarray: Angular acceleration vector [phi_ddot, theta_ddot, psi_ddot].
+            np.ndarray: Angular acceleration vector [phi_ddot, theta_ddot, psi_ddot] (the out buffer).
         """
-        omega = self.get_omega()
-        phi_dot, theta_dot, psi_dot = state['ang_vel']
-        
-        u_2 = self.l * (state['thrust'][3] - state['thrust'][1])
-        u_3 = self.l * (state['thrust'][2] - state['thrust'][0])
-        u_4 = state['torque'][0] - state['torque'][1] + state['torque'][2] - state['torque'][3]
-        Omega_r = (omega[0] - omega[1] + omega[2] - omega[3])
-        Omega_r_J_r = self.Jr * Omega_r 
-
-        phi_ddot = (u_2 / self.I[0]
-                    - self.Ca[0] * np.sign(phi_dot) * phi_dot**2 / self.I[0]
-                    - Omega_r_J_r / self.I[0] * theta_dot
-                    - (self.I[2] - self.I[1]) / self.I[0] * theta_dot * psi_dot)
-        theta_ddot = (u_3 / self.I[1]
-                      - self.Ca[1] * np.sign(theta_dot) * theta_dot**2 / self.I[1]
-                      + Omega_r_J_r / self.I[1] * phi_dot
-                      - (self.I[0] - self.I[2]) / self.I[1] * phi_dot * psi_dot)
-        psi_ddot = (u_4 / self.I[2]
-                    - self.Ca[2] * np.sign(psi_dot) * psi_dot**2 / self.I[2]
-                    - (self.I[1] - self.I[0]) / self.I[2] * phi_dot * theta_dot)
-
-        return np.array([phi_ddot, theta_ddot, psi_ddot])
+        phi_dot, theta_dot, psi_dot = y[9], y[10], y[11]
+        thrust, torque, rpm = self._thrust, self._torque, self._rpm
+
+        u_2 = self.l * (thrust[3] - thrust[1])
+        u_3 = self.l * (thrust[2] - thrust[0])
+        u_4 = torque[0] - torque[1] + torque[2] - torque[3]
+        omega = self._rpm_to_omega(rpm)
+        Omega_r = omega[0] - omega[1] + omega[2] - omega[3]
+        Omega_r_J_r = self.Jr * Omega_r
+
+        out[0] = (u_2 / self.I[0]
+                  - self.Ca[0] * math.copysign(phi_dot**2, phi_dot) / self.I[0]
+                  - Omega_r_J_r / self.I[0] * theta_dot
+                  - (self.I[2] - self.I[1]) / self.I[0] * theta_dot * psi_dot)
+        out[1] = (u_3 / self.I[1]
+                  - self.Ca[1] * math.copysign(theta_dot**2, theta_dot) / self.I[1]
+                  + Omega_r_J_r / self.I[1] * phi_dot
+                  - (self.I[0] - self.I[2]) / self.I[1] * phi_dot * psi_dot)
+        out[2] = (u_4 / self.I[2]
+                  - self.Ca[2] * math.copysign(psi_dot**2, psi_dot) / self.I[2]
+                  - (self.I[1] - self.I[0]) / self.I[2] * phi_dot * theta_dot)
+        return out
 
     def _mixer(self, u1: float, u2: float, u3: float, u4: float) -> tuple:
         """
@@ -186,7 +277,16 @@ class QuadcopterModel:
 
         return rpm1, rpm2, rpm3, rpm4
 
-    def _rk4_step(self, state_old: dict, dt: float) -> dict: #Check physical meaning
+    def _derivatives(self, y: np.ndarray, out: np.ndarray) -> None:
+        """
+        Time derivative of the integrated state, written into out.
+        """
+        out[0:3] = y[3:6]
+        self._translational_dynamics(y, out[3:6])
+        out[6:9] = y[9:12]
+        self._rotational_dynamics(y, out[9:12])
+
+    def _rk4_step(self, dt: float) -> None:
         """
         Performs a single integration step using the classical 4th-order Runge-Kutta (RK4) method.
         The RK4 method is a numerical technique for solving ordinary differential equations (ODEs).
@@ -194,54 +294,42 @@ class QuadcopterModel:
         each representing the derivative of the state at different points within the interval. These increments
         are combined to produce a weighted average, providing a more accurate estimate than simpler methods
         like Euler integration.
-        The state is represented as a dictionary containing position ('pos'), velocity ('vel'), angles ('angles'),
-        angular velocity ('ang_vel'), and motor RPM ('rpm'). The function advances the state by time step `dt`
-        using the system's translational and rotational dynamics.
+        The integrated state (position, velocity, angles and angular velocity) lives in the flat state buffer
+        and is advanced in place by time step `dt`, using preallocated scratch buffers for the stages.
+        Motor RPM, thrust, torque and power are held constant over the step.
 
         Parameters:
-            state (dict): Current state of the quadcopter.
             dt (float): Time step.
-
-        Returns:
-            dict: New state after the integration step.
-        """
-        def f(s: dict) -> dict:
-            return {
-                'pos': s['vel'],
-                'vel': self._translational_dynamics(s),
-                'angles': s['ang_vel'],
-                'ang_vel': self._rotational_dynamics(s),
-            }
-        
-        state = state_old.copy()  # Create a copy of the current state to avoid modifying it directly
-        
-        reminder_data = {
-            'thrust': state['thrust'],  # Keep the same thrust for the first half step
-            'torque': state['torque'],  # Keep the same torque for the first half step
-            'power': state['power'],  # Keep the same power for the first half step
-            'rpm': state['rpm']  # Keep the same RPM for the first half step
-        }
-
-        k1 = f(state)
-        state1 = {key: state[key] + k1[key] * (dt / 2) for key in ['pos', 'vel', 'angles', 'ang_vel']} 
-        state1.update(reminder_data)  # Include reminder data in the first half step
-        k2 = f(state1)
-        
-        state2 = {key: state[key] + k2[key] * (dt / 2) for key in ['pos', 'vel', 'angles', 'ang_vel']}
-        state2.update(reminder_data)  # Include reminder data in the second half step
-        k3 = f(state2)
-        
-        state3 = {key: state[key] + k3[key] * dt for key in ['pos', 'vel', 'angles', 'ang_vel']}
-        state3.update(reminder_data)  # Include reminder data in the final step
-        k4 = f(state3)
-
-        state_new = {}
-        for key in ['pos', 'vel', 'angles', 'ang_vel']:
-            state_new[key] = state[key] + (dt / 6) * (k1[key] + 2 * k2[key] + 2 * k3[key] + k4[key])
-        state_new['angles'] = np.array([wrap_angle(a) for a in state_new['angles']])
-        state_new['ang_vel'] = np.clip(state_new['ang_vel'], -10, 10)
-        state_new.update(reminder_data)
-        return state_new
+        """
+        y, k, stage = self._y, self._k, self._y_stage
+
+        self._derivatives(y, k[0])
+        np.multiply(k[0], dt / 2, out=stage)
+        stage += y
+        self._derivatives(stage, k[1])
+        np.multiply(k[1], dt / 2, out=stage)
+        stage += y
+        self._derivatives(stage, k[2])
+        np.multiply(k[2], dt, out=stage)
+        stage += y
+        self._derivatives(stage, k[3])
+
+        # y += dt / 6 * (k1 + 2 * k2 + 2 * k3 + k4), evaluated in this order: any other one rounds
+        # differently, and the closed loop amplifies it into a different trajectory
+        k[1] *= 2
+        np.add(k[0], k[1], out=stage)
+        k[2] *= 2
+        stage += k[2]
+        stage += k[3]
+        stage *= dt / 6
+        y += stage
+
+        # Wrap angles in [-pi, pi] and saturate angular velocities
+        angles = self._angles
+        angles += np.pi
+        np.remainder(angles, 2 * np.pi, out=angles)
+        angles -= np.pi
+        np.clip(self._ang_vel, -10, 10, out=self._ang_vel)
 
     def update_wind(self, V: float, simulate_wind=True) -> None:
         """
@@ -261,7 +349,7 @@ class QuadcopterModel:
         """
         Reset the drone's state to the initial state.
         """
-        self.state = self.init_state.copy()
+        self._load_state(self.init_state)
         self.delta_b = 0.0
 
     def get_omega(self) -> np.ndarray:
@@ -270,7 +358,7 @@ class QuadcopterModel:
         Returns:
             np.ndarray: Angular velocities of the motors in rad/s.
         """
-        return self._rpm_to_omega(self.state['rpm'])
+        return self._rpm_to_omega(self._rpm)
 
     @staticmethod
     def _rpm_to_omega(rpm: np.ndarray) -> np.ndarray:
@@ -299,25 +387,15 @@ class QuadcopterModel:
         return omega * 60 / (2 * np.pi)
     
     def compute_rotor_effects(self):
-        # Compute thrust and thrust coefficient
-        T = []
-        Q = []
-        P = []
-        CT = 0 ; CQ = 0 ; CP = 0
-        for i, rotor in enumerate(self.rotors):
-            t, q, p, ct, cq, cp =  rotor.predict_aerodynamic(self.state['rpm'][i])
-            T.append(t)
-            Q.append(q)
-            P.append(p)
-            CT += ct ; CQ += cq ; CP += cp
-        
-        self.state['thrust'] = T  # Thrust from all rotors
-        self.thrust = self.state['thrust']
-        self.state['torque'] = Q  # Torque from all rotors
-        self.state['power'] = P # Power from all rotors
-        self.c_t = CT / len(self.rotors)  # Average thrust coefficient from all rotors
-        self.c_q = CQ / len(self.rotors)  # Average torque coefficient from all rotors
-        self.c_p = CP / len(self.rotors)  # Average power coefficient from all rotors
+        # Evaluate all the rotors with a single call to the aerodynamic backend ('mlp' still runs the network once per rotor)
+        output = self.aero_backend.predict_aerodynamic_batch(self._rpm)
+
+        self._thrust[:] = output[:, 0]  # Thrust from all rotors
+        self._torque[:] = output[:, 1]  # Torque from all rotors
+        self._power[:] = output[:, 2]  # Power from all rotors
+        self.c_t = output[:, 3].mean()  # Average thrust coefficient from all rotors
+        self.c_q = output[:, 4].mean()  # Average torque coefficient from all rotors
+        self.c_p = output[:, 5].mean()  # Average power coefficient from all rotors
 
     
     def update_state(self, target: dict, dt: float, ground_control: bool = True, hit_accel_threshold: float = 1.0, verbose = True) -> None:
@@ -337,26 +415,322 @@ class QuadcopterModel:
         u1, u2, u3, u4 = self.controller.update(self.state, target, dt, self.m)
         # print(f"Control inputs: u1={u1:.2f}, u2={u2:.2f}, u3={u3:.2f}, u4={u4:.2f}")
         # Update the state with the new RPMs
-        rpm1, rpm2, rpm3, rpm4 = self._mixer(u1, u2, u3, u4) 
-        self.state["rpm"] = np.array([rpm1, rpm2, rpm3, rpm4]) 
+        self._rpm[:] = self._mixer(u1, u2, u3, u4)
 
         self.compute_rotor_effects()  # Compute thrust, torque, and power from the rotors
 
         # Perform a Runge-Kutta 4th order integration step to update the state
-        self.state = self._rk4_step(self.state, dt) 
+        self._rk4_step(dt)
 
         #print(f"(t+1): {self.state}", end='\r')
 
         # Ground control logic
-        if self.state['pos'][2] <= 0 and ground_control:
-            self.state['pos'][2] = 0
-            self.state['vel'][2] = 0  # Reset vertical velocity to zero
+        if self._pos[2] <= 0 and ground_control:
+            self._pos[2] = 0
+            self._vel[2] = 0  # Reset vertical velocity to zero
             # check if vertical acceleration is too high and differenciate from landing to hit
             if verbose:
-                if self.state['vel'][2] < -hit_accel_threshold:  # If the vertical velocity is exceeds the threshold
+                if self._vel[2] < -hit_accel_threshold:  # If the vertical velocity is exceeds the threshold
                     print("[WARNING] Drone has hit the ground")
                 else:
                     print("[INFO] Drone has landed.")
         
         # print(f"Thrust: {self.thrust:.2f} N, Thrust Coefficient: {self.c_t:.4f}, RPM to hover: {self.compute_hover_rpm(self.c_t):.1f} rpm")
 
+
+
+class BatchQuadcopterModel:
+    # Column layout of the batched state matrix
+    POS = slice(0, 3)
+    VEL = slice(3, 6)
+    ANGLES = slice(6, 9)
+    ANG_VEL = slice(9, 12)
+    STATE_SIZE = 12
+
+    def __init__(self, m: np.ndarray, I: np.ndarray, l: np.ndarray, Cd: np.ndarray,
+                 Ca: np.ndarray, Jr: np.ndarray, init_state: np.ndarray,
+                 controller: BatchQuadCopterController, aero_backend,
+                 max_rpm: np.ndarray, R: float, n_rotors: int = 4):
+        """
+        Initialize a batch of N quadcopters integrated together as vectorized NumPy operations.
+        The physics is the same as QuadcopterModel, but every parameter is an array with one entry
+        per drone, so a whole population of controller candidates can be stepped at once.
+
+        Parameters:
+            m (np.ndarray): Masses, shape (N,).
+            I (np.ndarray): Moment of inertia vectors, shape (N, 3).
+            l (np.ndarray): Distances from the center to the rotor, shape (N,).
+            Cd (np.ndarray): Traslational drag coefficients, shape (N, 3).
+            Ca (np.ndarray): Aerodynamic friction coefficients, shape (N, 3).
+            Jr (np.ndarray): Rotor inertias, shape (N,).
+            init_state (np.ndarray): Initial states [pos, vel, angles, ang_vel], shape (N, 12).
+            controller (BatchQuadCopterController): Batched controller for the drones.
+            aero_backend: Rotor aerodynamic backend (exposing predict_aerodynamic_batch) shared by all the rotors of the batch.
+            max_rpm (np.ndarray): Maximum RPM for the motors of each drone, shape (N,).
+            R (float): Rotor radius.
+            n_rotors (int): Number of rotors. Default is 4 for a quadcopter.
+        """
+        self.rho = 1.225  # Air density in kg/m³
+        self.g = 9.81
+
+        self.m = np.asarray(m, dtype=float)
+        self.n_drones = self.m.shape[0]
+        self.I = np.asarray(I, dtype=float).reshape(self.n_drones, 3)
+        self.l = np.asarray(l, dtype=float)
+        self.Cd = np.asarray(Cd, dtype=float).reshape(self.n_drones, 3)
+        self.Ca = np.asarray(Ca, dtype=float).reshape(self.n_drones, 3)
+        self.Jr = np.asarray(Jr, dtype=float)
+        self.max_rpm = np.asarray(max_rpm, dtype=float)
+        self.max_rpm_sq = (self.max_rpm * 2 * np.pi / 60)**2
+        self.R = R
+        self.n_rotors = n_rotors
+        self.controller = controller
+        self.aero_backend = aero_backend
+
+        self.init_state = np.ascontiguousarray(init_state, dtype=float).reshape(self.n_drones, self.STATE_SIZE).copy()
+        self.state = self.init_state.copy()
+        self.rpm = np.zeros((self.n_drones, n_rotors))
+        self.thrust = np.zeros((self.n_drones, n_rotors))
+        self.torque = np.zeros((self.n_drones, n_rotors))
+        self.power = np.zeros((self.n_drones, n_rotors))
+        self.c_t = np.zeros(self.n_drones)
+        self.c_q = np.zeros(self.n_drones)
+        self.c_p = np.zeros(self.n_drones)
+        self.delta_b = np.zeros(self.n_drones)
+        self.thrust_no_wind = np.zeros(self.n_drones)
+
+    @classmethod
+    def from_models(cls, drones: list) -> 'BatchQuadcopterModel':
+        """
+        Build a batch from already configured QuadcopterModel instances, copying their physical
+        parameters, initial states and controller gains. The aerodynamic backend of the first drone
+        is shared by the whole batch.
+
+        Parameters:
+            drones (list): List of QuadcopterModel objects.
+
+        Returns:
+            BatchQuadcopterModel: Batch with one lane per input drone.
+        """
+        init_state = np.array([np.concatenate([d.init_state['pos'], d.init_state['vel'],
+                                               d.init_state['angles'], d.init_state['ang_vel']])
+                               for d in drones])
+        return cls(m=[d.m for d in drones],
+                   I=[d.I for d in drones],
+                   l=[d.l for d in drones],
+                   Cd=[d.Cd for d in drones],
+                   Ca=[d.Ca for d in drones],
+                   Jr=[d.Jr for d in drones],
+                   init_state=init_state,
+                   controller=BatchQuadCopterController([d.controller for d in drones]),
+                   aero_backend=drones[0].aero_backend,
+                   max_rpm=[d.max_rpm for d in drones],
+                   R=drones[0].R,
+                   n_rotors=drones[0].n_rotors)
+
+    @property
+    def pos(self) -> np.ndarray:
+        return self.state[:, self.POS]
+
+    @property
+    def vel(self) -> np.ndarray:
+        return self.state[:, self.VEL]
+
+    @property
+    def angles(self) -> np.ndarray:
+        return self.state[:, self.ANGLES]
+
+    @property
+    def ang_vel(self) -> np.ndarray:
+        return self.state[:, self.ANG_VEL]
+
+    def _translational_dynamics(self, state: np.ndarray) -> np.ndarray:
+        """
+        Compute the translational accelerations of all drones.
+
+        Parameters:
+            state (np.ndarray): Current states, shape (N, 12).
+
+        Returns:
+            np.ndarray: Acceleration vectors [x_ddot, y_ddot, z_ddot], shape (N, 3).
+        """
+        x_dot, y_dot, z_dot = state[:, 3], state[:, 4], state[:, 5]
+        roll, pitch, yaw = state[:, 6], state[:, 7], state[:, 8]
+        T_m = self.thrust.sum(axis=1) / self.m
+
+        cr, sr = np.cos(roll), np.sin(roll)
+        cp, sp = np.cos(pitch), np.sin(pitch)
+        cy, sy = np.cos(yaw), np.sin(yaw)
+
+        acc = np.empty((self.n_drones, 3))
+        acc[:, 0] = T_m * (cy * sp * cr + sy * sr) - self.Cd[:, 0] / self.m * x_dot
+        acc[:, 1] = T_m * (sy * sp * cr - cy * sr) - self.Cd[:, 1] / self.m * y_dot
+        acc[:, 2] = T_m * (cp * cr) - self.Cd[:, 2] / self.m * z_dot - self.g
+        return acc
+
+    def _rotational_dynamics(self, state: np.ndarray) -> np.ndarray:
+        """
+        Compute the rotational accelerations of all drones.
+
+        Parameters:
+            state (np.ndarray): Current states, shape (N, 12).
+
+        Returns:
+            np.ndarray: Angular acceleration vectors [phi_ddot, theta_ddot, psi_ddot], shape (N, 3).
+        """
+        omega = self._rpm_to_omega(self.rpm)
+        phi_dot, theta_dot, psi_dot = state[:, 9], state[:, 10], state[:, 11]
+        I_x, I_y, I_z = self.I[:, 0], self.I[:, 1], self.I[:, 2]
+
+        u_2 = self.l * (self.thrust[:, 3] - self.thrust[:, 1])
+        u_3 = self.l * (self.thrust[:, 2] - self.thrust[:, 0])
+        u_4 = self.torque[:, 0] - self.torque[:, 1] + self.torque[:, 2] - self.torque[:, 3]
+        Omega_r_J_r = self.Jr * (omega[:, 0] - omega[:, 1] + omega[:, 2] - omega[:, 3])
+
+        # Squaring an array is exact (x * x) while QuadcopterModel squares scalars with pow(), which can differ
+        # in the last bit: the batched trajectories are not bit-identical to the single-drone ones
+        acc = np.empty((self.n_drones, 3))
+        acc[:, 0] = (u_2 / I_x
+                     - self.Ca[:, 0] * np.sign(phi_dot) * phi_dot**2 / I_x
+                     - Omega_r_J_r / I_x * theta_dot
+                     - (I_z - I_y) / I_x * theta_dot * psi_dot)
+        acc[:, 1] = (u_3 / I_y
+                     - self.Ca[:, 1] * np.sign(theta_dot) * theta_dot**2 / I_y
+                     + Omega_r_J_r / I_y * phi_dot
+                     - (I_x - I_z) / I_y * phi_dot * psi_dot)
+        acc[:, 2] = (u_4 / I_z
+                     - self.Ca[:, 2] * np.sign(psi_dot) * psi_dot**2 / I_z
+                     - (I_y - I_x) / I_z * phi_dot * theta_dot)
+        return acc
+
+    def _mixer(self, u1: np.ndarray, u2: np.ndarray, u3: np.ndarray, u4: np.ndarray) -> np.ndarray:
+        """
+        Compute the RPM of each motor of each drone based on the control inputs.
+
+        Parameters:
+            u1, u2, u3, u4 (np.ndarray): Control inputs, shape (N,).
+        Returns:
+            np.ndarray: RPM values, shape (N, 4).
+        """
+        b = 0.001
+        d = 7.5e-7
+        l = self.l
+
+        w_sq = np.empty((self.n_drones, 4))
+        w_sq[:, 0] = (u1 / (4 * b)) - (u3 / (2 * b * l)) + (u4 / (4 * d))
+        w_sq[:, 1] = (u1 / (4 * b)) - (u2 / (2 * b * l)) - (u4 / (4 * d))
+        w_sq[:, 2] = (u1 / (4 * b)) + (u3 / (2 * b * l)) + (u4 / (4 * d))
+        w_sq[:, 3] = (u1 / (4 * b)) + (u2 / (2 * b * l)) - (u4 / (4 * d))
+        np.clip(w_sq, 0.0, self.max_rpm_sq[:, None], out=w_sq)
+
+        return self._omega_to_rpm(np.sqrt(w_sq))
+
+    def _derivatives(self, state: np.ndarray) -> np.ndarray:
+        """
+        Time derivative of the batched state, shape (N, 12).
+        """
+        ds = np.empty_like(state)
+        ds[:, self.POS] = state[:, self.VEL]
+        ds[:, self.VEL] = self._translational_dynamics(state)
+        ds[:, self.ANGLES] = state[:, self.ANG_VEL]
+        ds[:, self.ANG_VEL] = self._rotational_dynamics(state)
+        return ds
+
+    def _rk4_step(self, state: np.ndarray, dt: float) -> np.ndarray:
+        """
+        Advance all the drones by one classical RK4 step. Thrust, torque and RPM are held constant
+        over the step, as in QuadcopterModel._rk4_step.
+
+        Parameters:
+            state (np.ndarray): Current states, shape (N, 12).
+            dt (float): Time step.
+
+        Returns:
+            np.ndarray: New states after the integration step, shape (N, 12).
+        """
+        k1 = self._derivatives(state)
+        k2 = self._derivatives(state + k1 * (dt / 2))
+        k3 = self._derivatives(state + k2 * (dt / 2))
+        k4 = self._derivatives(state + k3 * dt)
+
+        state_new = state + (dt / 6) * (k1 + 2 * k2 + 2 * k3 + k4)
+        state_new[:, self.ANGLES] = wrap_angle(state_new[:, self.ANGLES])
+        np.clip(state_new[:, self.ANG_VEL], -10, 10, out=state_new[:, self.ANG_VEL])
+        return state_new
+
+    def update_wind(self, V: np.ndarray, simulate_wind=True) -> None:
+        """
+        Update the wind signal of every drone of the batch.
+
+        Parameters:
+            V (np.ndarray): Wind speed in m/s, scalar or shape (N,).
+            simulate_wind (bool): Whether to simulate wind effects. Default is True.
+        """
+        if simulate_wind:
+            theta_0 = 2 * np.pi / 180  # Initial angle in radians
+            omega = self._rpm_to_omega(2500)  # Example RPM for wind effect calculation
+            self.delta_b = (3/2) * (self.c_t / ((theta_0 * omega * self.R) + 1e-6)) * V
+        else:
+            self.delta_b = np.zeros(self.n_drones)
+
+    def reset_state(self) -> None:
+        """
+        Reset every drone of the batch to its initial state and clear the controller memory.
+        """
+        self.state = self.init_state.copy()
+        self.rpm[:] = 0.0
+        self.thrust[:] = 0.0
+        self.torque[:] = 0.0
+        self.power[:] = 0.0
+        self.delta_b = np.zeros(self.n_drones)
+        self.controller.reset()
+
+    _rpm_to_omega = staticmethod(QuadcopterModel._rpm_to_omega)
+    _omega_to_rpm = staticmethod(QuadcopterModel._omega_to_rpm)
+
+    def compute_rotor_effects(self) -> None:
+        """
+        Evaluate thrust, torque and power of all the rotors of all the drones with a single
+        batched call to the aerodynamic backend.
+        """
+        output = self.aero_backend.predict_aerodynamic_batch(self.rpm)
+
+        self.thrust[:] = output[:, :, 0]
+        self.torque[:] = output[:, :, 1]
+        self.power[:] = output[:, :, 2]
+        self.c_t = output[:, :, 3].mean(axis=1)
+        self.c_q = output[:, :, 4].mean(axis=1)
+        self.c_p = output[:, :, 5].mean(axis=1)
+
+    def update_state(self, targets: np.ndarray, dt: float, active: np.ndarray = None,
+                     ground_control: bool = True) -> None:
+        """
+        Update the state of all the drones by computing control commands, mixing motor RPMs
+        and integrating the dynamics.
+
+        Parameters:
+            targets (np.ndarray): Target positions, shape (N, 3).
+            dt (float): Time step.
+            active (np.ndarray): Optional boolean mask, shape (N,). Drones that are not active keep their state.
+            ground_control (bool): Whether to apply ground control logic. Default is True.
+        """
+        u1, u2, u3, u4 = self.controller.update(self.pos, self.vel, self.angles, targets, dt, self.m, self.g)
+        rpm = self._mixer(u1, u2, u3, u4)
+        if active is None:
+            self.rpm[:] = rpm
+        else:
+            self.rpm[active] = rpm[active]
+
+        self.compute_rotor_effects()
+
+        state_new = self._rk4_step(self.state, dt)
+
+        if ground_control:
+            on_ground = state_new[:, 2] <= 0
+            state_new[on_ground, 2] = 0.0
+            state_new[on_ground, 5] = 0.0
+
+        if active is None:
+            self.state = state_new
+        else:
+            self.state[active] = state_new[active]
@@ -0,0 +1,101 @@
+# Author: Andrea Vaiuso
+# Version: 1.0
+# Date: 18.10.2026
+# Description: This module defines the FlightRecorder class, a preallocated struct-of-arrays buffer for the
+# data logged during a simulation. Each column is a NumPy array with one row per logged frame, and the
+# recorded data is exposed as zero-copy views trimmed to the frames actually logged.
+
+import numpy as np
+
+class FlightRecorder:
+    def __init__(self, columns: dict, capacity: int, dtype=float):
+        """
+        Initialize the recorder and allocate its buffers.
+
+        Parameters:
+            columns (dict): Column names mapped to the shape of a single frame, e.g.
+                {'time': (), 'position': (3,), 'rpm': (4,)}.
+            capacity (int): Maximum number of frames that can be recorded.
+            dtype: Data type of the buffers. Default is float.
+        """
+        self.column_shapes = {name: tuple(shape) for name, shape in columns.items()}
+        self.dtype = dtype
+        self.capacity = 0
+        self.n_frames = 0
+        self._buffers = {}
+        self.reset(capacity)
+
+    @staticmethod
+    def frames_for(max_simulation_time: float, dt: float, frame_skip: int) -> int:
+        """
+        Number of frames logged by a simulation lasting max_simulation_time that logs one frame every frame_skip steps.
+
+        Parameters:
+            max_simulation_time (float): Maximum simulation time in seconds.
+            dt (float): Time step of the simulation.
+            frame_skip (int): Number of steps between two logged frames.
+
+        Returns:
+            int: The required recorder capacity.
+        """
+        return int(max_simulation_time / dt) // frame_skip + 1
+
+    def reset(self, capacity: int = None) -> None:
+        """
+        Discard the recorded frames. The buffers are reused, with the rows of the discarded frames zeroed, and
+        reallocated only if a different capacity is requested.
+
+        Parameters:
+            capacity (int): New capacity. If None, the current capacity is kept.
+        """
+        n_used = self.n_frames
+        self.n_frames = 0
+        if capacity is None or capacity == self.capacity:
+            for buffer in self._buffers.values():
+                buffer[:n_used] = 0
+            return
+        self.capacity = int(capacity)
+        self._buffers = {name: np.zeros((self.capacity,) + shape, dtype=self.dtype)
+                         for name, shape in self.column_shapes.items()}
+
+    def record(self, **values) -> None:
+        """
+        Append a frame. Every keyword is a column name and its value the data of the frame for that column;
+        columns that are not given keep zeros.
+        """
+        if self.n_frames >= self.capacity:
+            raise IndexError(f"FlightRecorder is full ({self.capacity} frames).")
+        i = self.n_frames
+        for name, value in values.items():
+            self._buffers[name][i] = value
+        self.n_frames += 1
+
+    def trim(self) -> None:
+        """
+        Shrink the capacity to the recorded frames. The recorded data is copied into buffers of the exact size,
+        so the preallocated buffers are released (views returned before trimming keep them alive).
+        """
+        self._buffers = {name: buffer[:self.n_frames].copy() for name, buffer in self._buffers.items()}
+        self.capacity = self.n_frames
+
+    @property
+    def columns(self) -> tuple:
+        return tuple(self.column_shapes)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._buffers
+
+    def __len__(self) -> int:
+        return self.n_frames
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """
+        Zero-copy view of the recorded frames of a column, of shape (n_frames, *frame_shape).
+        """
+        return self._buffers[name][:self.n_frames]
+
+    def as_dict(self) -> dict:
+        """
+        Return all the columns as a dictionary of zero-copy views.
+        """
+        return {name: self[name] for name in self._buffers}
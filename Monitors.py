@@ -0,0 +1,174 @@
+# Author: Andrea Vaiuso
+# Version: 1.0
+# Date: 18.10.2026
+# Description: This module defines reusable early-termination monitors for the simulations.
+# MotionMonitor detects drones that are not moving from the logged speeds, updating running
+# statistics incrementally so that the check costs O(1) per logged frame.
+# FlightPruner detects flights that are not worth completing (unstable, diverging, or already worse than
+# a cost bound) and reports why they should be aborted.
+
+import numpy as np
+
+class MotionMonitor:
+    def __init__(self, min_time: float = 5.0, threshold: float = 1e-2, window: int = None, n_drones: int = None):
+        """
+        Initialize the motion monitor.
+
+        Parameters:
+            min_time (float): Simulation time in seconds before which a drone is never considered stalled.
+            threshold (float): A drone is stalled when the norm of both its logged horizontal speeds and its
+                logged vertical speeds is below this value.
+            window (int): Number of most recent logged frames considered. If None, all the frames logged
+                since the last reset are considered (running sums of squares); otherwise a ring buffer is used.
+            n_drones (int): Number of drones monitored at once. If None, a single drone is monitored and
+                scalars are used; otherwise updates and checks work on arrays of shape (n_drones,).
+        """
+        if window is not None and window < 1:
+            raise ValueError("window must be a positive number of frames or None.")
+        self.min_time = min_time
+        self.threshold = threshold
+        self.window = window
+        self.n_drones = n_drones
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Clear the accumulated statistics.
+        """
+        shape = () if self.n_drones is None else (self.n_drones,)
+        self.horiz_sq_sum = np.zeros(shape)
+        self.vertical_sq_sum = np.zeros(shape)
+        if self.window is not None:
+            self._horiz_sq = np.zeros((self.window,) + shape)
+            self._vertical_sq = np.zeros((self.window,) + shape)
+            self._head = np.zeros(shape, dtype=int)
+
+    def update(self, horiz_speed, vertical_speed, mask: np.ndarray = None) -> None:
+        """
+        Add a logged frame to the statistics.
+
+        Parameters:
+            horiz_speed (float or np.ndarray): Horizontal speed of the drone(s).
+            vertical_speed (float or np.ndarray): Vertical speed of the drone(s).
+            mask (np.ndarray): Optional boolean array selecting the drones to update (batched monitors only).
+        """
+        h_sq = np.square(horiz_speed)
+        v_sq = np.square(vertical_speed)
+        if self.window is None:
+            if mask is None:
+                self.horiz_sq_sum += h_sq
+                self.vertical_sq_sum += v_sq
+            else:
+                self.horiz_sq_sum[mask] += h_sq[mask]
+                self.vertical_sq_sum[mask] += v_sq[mask]
+            return
+
+        if self.n_drones is None:
+            head = int(self._head)
+            self.horiz_sq_sum += h_sq - self._horiz_sq[head]
+            self.vertical_sq_sum += v_sq - self._vertical_sq[head]
+            self._horiz_sq[head] = h_sq
+            self._vertical_sq[head] = v_sq
+            self._head = np.asarray((head + 1) % self.window)
+        else:
+            idx = np.arange(self.n_drones) if mask is None else np.flatnonzero(mask)
+            head = self._head[idx]
+            self.horiz_sq_sum[idx] += h_sq[idx] - self._horiz_sq[head, idx]
+            self.vertical_sq_sum[idx] += v_sq[idx] - self._vertical_sq[head, idx]
+            self._horiz_sq[head, idx] = h_sq[idx]
+            self._vertical_sq[head, idx] = v_sq[idx]
+            self._head[idx] = (head + 1) % self.window
+        # Guard against negative round-off left by the subtraction of the oldest frame
+        np.maximum(self.horiz_sq_sum, 0.0, out=self.horiz_sq_sum)
+        np.maximum(self.vertical_sq_sum, 0.0, out=self.vertical_sq_sum)
+
+    def is_stalled(self, current_time: float):
+        """
+        Check whether the drone(s) can be considered not moving.
+
+        Parameters:
+            current_time (float): Current simulation time in seconds.
+
+        Returns:
+            bool or np.ndarray: True for the drones that are not moving.
+        """
+        stalled = (current_time > self.min_time) & \
+            (np.sqrt(self.horiz_sq_sum) < self.threshold) & (np.sqrt(self.vertical_sq_sum) < self.threshold)
+        return bool(stalled) if self.n_drones is None else stalled
+
+
+class FlightPruner:
+    # Reason codes returned by update
+    NAN_STATE = 'nan_state'
+    ATTITUDE = 'attitude_blowup'
+    DIVERGENCE = 'divergence'
+    COST_BOUND = 'cost_bound'
+
+    def __init__(self, max_attitude: float = np.pi / 2, max_target_distance: float = 50.0,
+                 cost_bound: float = None, osc_weight: float = 3.0, thrust_osc_scale: float = 1e-5):
+        """
+        Initialize the flight pruner.
+
+        Parameters:
+            max_attitude (float): Maximum absolute roll or pitch angle in radians. Above it the drone is
+                considered flipped.
+            max_target_distance (float): Maximum distance in meters between the drone and its dynamic target.
+                Above it the flight is considered diverging.
+            cost_bound (float): Optional cost above which the flight is aborted. The partial cost is a lower bound
+                of the final cost: the elapsed time plus the weighted oscillations accumulated so far.
+            osc_weight (float): Weight of the pitch, roll and thrust oscillations in the partial cost.
+            thrust_osc_scale (float): Scale of the thrust oscillation in the partial cost.
+
+        The oscillations are accumulated over the logged frames exactly as the optimization costs compute
+        them from the histories, so the partial cost never exceeds the cost of the complete flight.
+        """
+        self.max_attitude = max_attitude
+        self.max_target_distance = max_target_distance
+        self.cost_bound = cost_bound
+        self.osc_weight = osc_weight
+        self.thrust_osc_scale = thrust_osc_scale
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Clear the accumulated oscillations.
+        """
+        self.pitch_osc = 0.0
+        self.roll_osc = 0.0
+        self.thrust_osc = 0.0
+        self.partial_cost = 0.0
+        self._last_angles = None
+
+    def update(self, current_time: float, position: np.ndarray, angles: np.ndarray, target: np.ndarray,
+               thrust: np.ndarray):
+        """
+        Add a logged frame and check whether the flight should be aborted.
+
+        Parameters:
+            current_time (float): Simulation time of the frame in seconds.
+            position (np.ndarray): Drone position [x, y, z].
+            angles (np.ndarray): Drone angles [roll, pitch, yaw] in radians (the drone state order). As in the
+                cost of pid_optimization, pitch_osc accumulates the changes of angles[0] and roll_osc those
+                of angles[1]; the cost only uses their sum.
+            target (np.ndarray): Current dynamic target [x, y, z].
+            thrust (np.ndarray): Thrust of each rotor.
+
+        Returns:
+            str: Reason code of the abort, or None if the flight can go on.
+        """
+        if not (np.all(np.isfinite(position)) and np.all(np.isfinite(angles)) and np.all(np.isfinite(thrust))):
+            return self.NAN_STATE
+        if abs(angles[0]) > self.max_attitude or abs(angles[1]) > self.max_attitude:
+            return self.ATTITUDE
+        if np.linalg.norm(position - target) > self.max_target_distance:
+            return self.DIVERGENCE
+
+        if self._last_angles is not None:
+            self.pitch_osc += abs(angles[0] - self._last_angles[0])
+            self.roll_osc += abs(angles[1] - self._last_angles[1])
+        self._last_angles = (angles[0], angles[1])
+        self.thrust_osc += np.sum(np.abs(np.diff(thrust))) * self.thrust_osc_scale
+        self.partial_cost = current_time + self.osc_weight * (self.pitch_osc + self.roll_osc + self.thrust_osc)
+        if self.cost_bound is not None and self.partial_cost > self.cost_bound:
+            return self.COST_BOUND
+        return None
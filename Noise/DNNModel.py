@@ -28,4 +28,23 @@ class RotorSoundModel():
         swl = swl_ref_rpm + 10 * np.log10(np.average(rpms) / self.rpm_reference) 
         # Sound Pressure Level adjusted for distance
         spl = swl - abs(10 * np.log10(1/(4 * np.pi * ((distance+1e-4)**2)))) 
-        return abs(spl), abs(swl)
\ No newline at end of file
+        return abs(spl), abs(swl)
+
+    def get_noise_emissions_batch(self, zeta_angles, rpms, distances) -> tuple:
+        """
+        Vectorized version of get_noise_emissions for many receivers at once.
+
+        Parameters:
+            zeta_angles (np.ndarray): Zeta angles in radians, shape (M,).
+            rpms (np.ndarray): RPM values for the rotors, shape (n_rotors,) shared by all receivers or (M, n_rotors).
+            distances (np.ndarray): Distances from the noise source in meters, shape (M,).
+        Returns:
+            tuple: (SPL, SWL) arrays of shape (M,).
+        """
+        zeta_angles = np.asarray(zeta_angles, dtype=float)
+        distances = np.asarray(distances, dtype=float)
+        zeta_index = np.minimum((zeta_angles * 180 / np.pi).astype(np.intp), len(self.noise_data) - 1)
+        swl_ref_rpm = np.asarray(self.noise_data[zeta_index], dtype=float)
+        swl = swl_ref_rpm + 10 * np.log10(np.mean(rpms, axis=-1) / self.rpm_reference)
+        spl = swl - np.abs(10 * np.log10(1/(4 * np.pi * ((distances+1e-4)**2))))
+        return np.abs(spl), np.abs(swl)
@@ -1,8 +1,6 @@
 from scipy.optimize import minimize
 import numpy as np
-from sklearn.preprocessing import MinMaxScaler
 import joblib
-import pandas as pd
 
 def convert_rpm_to_scaled_radians(rpm):
     return (rpm * 2 * np.pi / 60) / 10
@@ -27,9 +25,21 @@ lw_ref = np.array([58.06334401, 63.39435536, 89.61406778, 87.6743877 , 88.476051
        36.13367194, 38.50438545, 38.89934827])
 
 class NoiseModel:
+    # Order of the features expected by the scaler
+    SCALER_FEATURES = ('delta_zeta', 'RPM1', 'RPM2', 'RPM3', 'RPM4', 'C_proc')
+
     def __init__(self, scaler_filename="scaler.joblib"):
         self.params = None
         self.scaler = joblib.load(scaler_filename) if scaler_filename else None
+        # MinMaxScaler.transform is X * scale_ + min_: keep the two arrays so that inputs can be
+        # scaled with plain NumPy, without building DataFrames at every call
+        self.scaler_scale = None
+        self.scaler_min = None
+        if self.scaler is not None:
+            feature_names = list(getattr(self.scaler, 'feature_names_in_', self.SCALER_FEATURES))
+            order = [feature_names.index(name) for name in self.SCALER_FEATURES]
+            self.scaler_scale = np.asarray(self.scaler.scale_, dtype=float)[order]
+            self.scaler_min = np.asarray(self.scaler.min_, dtype=float)[order]
 
     def _calculate_predicted_Lw_total(self, data, num_rotors=4):
         """
@@ -61,6 +71,30 @@ class NoiseModel:
 
         return np.array(predicted_Lw_total)
 
+    def _predict_Lw_total_batch(self, zeta, rpms, C_proc, num_rotors=4):
+        """
+        Closed-form vectorized version of _calculate_predicted_Lw_total for already scaled inputs.
+
+        Parameters:
+        - zeta (array-like): Scaled zeta angles, shape (M,).
+        - rpms (array-like): Scaled RPMs, shape (M, num_rotors).
+        - C_proc (array-like): Scaled C_proc values, shape (M,).
+        - num_rotors (int): Number of rotors (default: 4).
+
+        Returns:
+        - predicted_Lw_total (np.ndarray): Predicted total sound power levels, shape (M, n_frequencies).
+        """
+        if self.params is None:
+            raise ValueError("Model parameters are not set. Please fit the model first using model_fit().")
+        n_frequencies = len(lw_ref)
+        a, b, c, d = self.params[:n_frequencies], self.params[n_frequencies:2 * n_frequencies], self.params[2 * n_frequencies:3 * n_frequencies], self.params[3 * n_frequencies:]
+        zeta = zeta[:, None]
+        RPM = rpms[:, :, None]
+        # Individual rotor levels, shape (M, num_rotors, n_frequencies)
+        Lw_individual = (lw_ref + a * (zeta ** 2) + b * np.abs(zeta))[:, None, :] + c * RPM + d * (RPM ** 2) \
+            + C_proc[:, None, None] - 10 * np.log10(num_rotors)
+        return 10 * np.log10(np.sum(10 ** (Lw_individual / 10), axis=1))
+
     def _regression_loss(self, data, num_rotors=4):
         """
         Compute the loss (mean squared error) between predicted and actual Lw_total.
@@ -139,35 +173,35 @@ class NoiseModel:
         Returns:
             tuple: (SPL, SWL) where SPL is the Sound Pressure Level and SWL is the Sound Power Level.
         """
-        # Scale input parameters using the scaler
-        rpm1, rpm2, rpm3, rpm4 = rpms
-        input_df = pd.DataFrame([{
-            'delta_zeta': zeta_angle,
-            'RPM1': rpm1,
-            'RPM2': rpm2,
-            'RPM3': rpm3,
-            'RPM4': rpm4,
-            'C_proc': 1.0
-        }])
-        norm_data = self.scaler.transform(input_df)
-        
-        zeta_angle_scaled = norm_data[0][0]
-        rpms_scaled = norm_data[0][1:5]
-        rpms_scaled = rpms_scaled / 15
-        C_proc_scaled = norm_data[0][5]
-
-        input_data = {
-            'Lw_ref': [lw_ref],
-            'zeta': [zeta_angle_scaled],
-            'RPM': [rpms_scaled],
-            'C_proc': [C_proc_scaled]
-        }
-
-        predicted_Lw_total = self.predict(input_data)
-        swl = calculate_loudness(predicted_Lw_total[0])
-        spl =  swl - abs(10 * np.log10(1/(4 * np.pi * ((distance+1e-4)**2))))
-        return abs(spl), abs(swl)
+        spl, swl = self.get_noise_emissions_batch([zeta_angle], rpms, [distance])
+        return spl[0], swl[0]
 
+    def get_noise_emissions_batch(self, zeta_angles, rpms, distances) -> tuple:
+        """
+        Vectorized version of get_noise_emissions for many receivers at once. The inputs are scaled with
+        the scaler coefficients extracted at load time and the whole Lw_total / loudness / SPL chain is
+        evaluated in closed form with NumPy.
+
+        Parameters:
+            zeta_angles (np.ndarray): Zeta angles in radians, shape (M,).
+            rpms (np.ndarray): RPM values for the rotors, shape (4,) shared by all receivers or (M, 4).
+            distances (np.ndarray): Distances from the noise source in meters, shape (M,).
+        Returns:
+            tuple: (SPL, SWL) arrays of shape (M,).
+        """
+        zeta_angles = np.asarray(zeta_angles, dtype=float)
+        distances = np.asarray(distances, dtype=float)
+        rpms = np.broadcast_to(np.asarray(rpms, dtype=float), zeta_angles.shape + (4,))
+
+        # Same scaling as MinMaxScaler.transform on the features (delta_zeta, RPM1..RPM4, C_proc)
+        zeta_angle_scaled = zeta_angles * self.scaler_scale[0] + self.scaler_min[0]
+        rpms_scaled = (rpms * self.scaler_scale[1:5] + self.scaler_min[1:5]) / 15
+        C_proc_scaled = np.full(zeta_angles.shape, 1.0 * self.scaler_scale[5] + self.scaler_min[5])
+
+        predicted_Lw_total = self._predict_Lw_total_batch(zeta_angle_scaled, rpms_scaled, C_proc_scaled)
+        swl = 20 * np.log10(np.sqrt(np.mean(predicted_Lw_total**2, axis=-1)))
+        spl = swl - np.abs(10 * np.log10(1/(4 * np.pi * ((distances+1e-4)**2))))
+        return np.abs(spl), np.abs(swl)
 
     def save_model(self, a, b, c, d, filename):
         """
@@ -0,0 +1,155 @@
+# Author: Andrea Vaiuso
+# Version: 1.0
+# Date: 18.10.2026
+# Description: This module defines the NumpyRotorModel class, a torch-free inference path for the rotor model.
+# It evaluates the exported RotorModel weights (see RotorModel.export_numpy) with NumPy on batched RPM arrays.
+
+import os
+from functools import lru_cache
+import numpy as np
+
+class NumpyRotorModel:
+    def __init__(self, n_inputs=1, n_outputs=6, norm_params_path=None):
+        """
+        Initialize an empty model. Weights and normalization parameters are read by load_model from
+        the .npz file written by RotorModel.export_numpy.
+        Args:
+            n_inputs (int): Number of inputs of the network. Default is 1 (RPM).
+            n_outputs (int): Number of outputs of the network. Default is 6 (T, Q, P, CT, CQ, CP).
+            norm_params_path (str): Unused, kept for compatibility with RotorModel: the normalization
+                parameters are stored in the .npz file.
+        """
+        self.n_inputs = n_inputs
+        self.n_outputs = n_outputs
+        self.norm_params_path = norm_params_path
+        self.layers = []
+        self.input_mean = None
+        self.input_std = None
+        self.output_mean = None
+        self.output_std = None
+
+    def forward(self, x: np.ndarray) -> np.ndarray:
+        for i, (weight, bias) in enumerate(self.layers):
+            x = x @ weight.T + bias
+            if i < len(self.layers) - 1:
+                np.maximum(x, 0.0, out=x)  # ReLU
+        return x
+
+    def normalize(self, X, mean, std):
+        return (X - mean) / std
+
+    def denormalize(self, X, mean, std):
+        return X * std + mean
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """
+        Predict the denormalized outputs for a batch of inputs.
+        Args:
+            X (np.ndarray): Inputs of shape (n, n_inputs).
+        Returns:
+            np.ndarray: Outputs of shape (n, n_outputs).
+        """
+        X_norm = self.normalize(np.asarray(X, dtype=np.float64), self.input_mean, self.input_std)
+        y_norm = self.forward(X_norm)
+        return self.denormalize(y_norm, self.output_mean, self.output_std)
+
+    def predict_aerodynamic_batch(self, rpms) -> np.ndarray:
+        """
+        Predict aerodynamic coefficients for several RPM values with a single forward pass.
+        Args:
+            rpms (array-like): RPM values, any shape (...).
+        Returns:
+            np.ndarray: Array of shape (..., 6) with (T, Q, P, CT, CQ, CP), with negative values replaced by zero.
+        """
+        rpms = np.asarray(rpms, dtype=np.float64)
+        output = self.predict(rpms.reshape(-1, 1))
+        np.maximum(output, 0.0, out=output)
+        return output.reshape(rpms.shape + (self.n_outputs,))
+
+    def predict_aerodynamic_fused(self, rpms) -> np.ndarray:
+        """
+        Same as predict_aerodynamic_batch, which already evaluates all the values in one forward pass.
+        """
+        return self.predict_aerodynamic_batch(rpms)
+
+    def predict_aerodynamic(self, rpm: float):
+        """
+        Predict aerodynamic coefficients for a given RPM.
+        Args:
+            rpm (float): The RPM value to predict aerodynamic coefficients for.
+        Returns:
+            tuple: A tuple containing the predicted values (T, Q, P, CT, CQ, CP).
+        """
+        return tuple(self.predict_aerodynamic_batch(rpm).tolist())
+
+    def load_model(self, filename: str):
+        """
+        Load the network weights and normalization parameters from a .npz file.
+        Args:
+            filename (str): The .npz filename written by RotorModel.export_numpy.
+        """
+        with np.load(filename) as data:
+            self.layers = [(data[f'fc{i}_weight'].astype(np.float64), data[f'fc{i}_bias'].astype(np.float64))
+                           for i in (1, 2, 3)]
+            self.input_mean = data['input_mean'].astype(np.float64)
+            self.input_std = data['input_std'].astype(np.float64)
+            self.output_mean = data['output_mean'].astype(np.float64)
+            self.output_std = data['output_std'].astype(np.float64)
+        self.n_inputs = self.layers[0][0].shape[1]
+        self.n_outputs = self.layers[-1][0].shape[0]
+
+
+class FusedRotorModel:
+    def __init__(self, rotor_model):
+        """
+        Aerodynamic backend that evaluates all the RPM values of a call with a single forward pass of the
+        rotor model (predict_aerodynamic_fused). Faster than the per-value evaluation of RotorModel, but its
+        outputs differ in the last bits, so trajectories are not identical to the default backend.
+        Args:
+            rotor_model (NumpyRotorModel or RotorModel): The model to evaluate.
+        """
+        self.rotor_model = rotor_model
+
+    def predict_aerodynamic_batch(self, rpms) -> np.ndarray:
+        return self.rotor_model.predict_aerodynamic_fused(rpms)
+
+    def predict_aerodynamic(self, rpm: float):
+        return tuple(self.predict_aerodynamic_batch(rpm).tolist())
+
+
+def load_rotor_model(model_path: str, norm_params_path: str = 'Rotor/normalization_params.pth'):
+    """
+    Load a rotor model for inference. Exported .npz models are evaluated with NumPy; any other
+    file is treated as a torch checkpoint, and torch is only imported in that case.
+    Args:
+        model_path (str): Path to the model (.npz export or .pth state dictionary).
+        norm_params_path (str): Path to the normalization parameters, used by torch checkpoints only.
+    Returns:
+        NumpyRotorModel or RotorModel: The loaded model.
+    """
+    if model_path.endswith('.npz'):
+        model = NumpyRotorModel()
+    else:
+        from Rotor.TorchRotorModel import RotorModel
+        model = RotorModel(1, 6, norm_params_path=norm_params_path)
+    model.load_model(model_path)
+    return model
+
+
+def get_shared_rotor_model(model_path: str, norm_params_path: str = 'Rotor/normalization_params.pth'):
+    """
+    Return the process-wide rotor model for the given (model path, normalization path) pair, loading it
+    from disk only the first time. All the rotors of all the drones built in a process share this instance,
+    so it must be treated as read-only.
+    Args:
+        model_path (str): Path to the model (.npz export or .pth state dictionary).
+        norm_params_path (str): Path to the normalization parameters, used by torch checkpoints only.
+    Returns:
+        NumpyRotorModel or RotorModel: The shared model.
+    """
+    return _cached_rotor_model(os.path.abspath(model_path), os.path.abspath(norm_params_path))
+
+
+@lru_cache(maxsize=None)
+def _cached_rotor_model(model_path: str, norm_params_path: str):
+    return load_rotor_model(model_path, norm_params_path)
@@ -0,0 +1,130 @@
+# Author: Andrea Vaiuso
+# Version: 1.0
+# Date: 18.10.2026
+# Description: This module defines the RotorLookupTable class, a precomputed RPM -> (T, Q, P, CT, CQ, CP) table
+# sampled from a rotor model and evaluated with vectorized linear or cubic interpolation for all rotors at once.
+
+import numpy as np
+
+class RotorLookupTable:
+    OUTPUTS = ('T', 'Q', 'P', 'CT', 'CQ', 'CP')
+
+    def __init__(self, predict_fn, max_rpm: float, n_samples: int = 1025, method: str = 'linear',
+                 tolerance: float = None, max_samples: int = 65537, check_factor: int = 8):
+        """
+        Sample a rotor model on a uniform RPM grid over [0, max_rpm] and build the interpolation table.
+
+        Parameters:
+            predict_fn (callable): Function mapping an array of RPMs of shape (n,) to an array of shape (n, 6)
+                with the aerodynamic outputs (T, Q, P, CT, CQ, CP), e.g. RotorModel.predict_aerodynamic_batch.
+            max_rpm (float): Maximum RPM covered by the table. Queries are clamped to [0, max_rpm].
+            n_samples (int): Number of grid samples. Default is 1025.
+            method (str): Interpolation method, 'linear' or 'cubic'. Default is 'linear'.
+            tolerance (float): Optional error bound. If given, the grid is refined (doubling the number of
+                intervals) until the maximum relative deviation from predict_fn is below the tolerance
+                or max_samples is reached.
+            max_samples (int): Maximum number of grid samples used when refining. Default is 65537.
+            check_factor (int): Number of check points per grid interval used to measure the deviation.
+        """
+        if method not in ('linear', 'cubic'):
+            raise ValueError(f"Unknown interpolation method '{method}'. Use 'linear' or 'cubic'.")
+        self.predict_fn = predict_fn
+        self.max_rpm = float(max_rpm)
+        self.method = method
+        self.tolerance = tolerance
+        self.check_factor = check_factor
+
+        self._build(n_samples)
+        if tolerance is not None:
+            while np.max(self.max_rel_error) > tolerance and 2 * (self.n_samples - 1) + 1 <= max_samples:
+                self._build(2 * (self.n_samples - 1) + 1)
+
+    @classmethod
+    def from_rotor_model(cls, rotor_model, max_rpm: float, **kwargs) -> 'RotorLookupTable':
+        """
+        Build a lookup table from a rotor model exposing predict_aerodynamic_batch.
+
+        Parameters:
+            rotor_model: Rotor model (e.g. RotorModel) to sample.
+            max_rpm (float): Maximum RPM covered by the table.
+            **kwargs: Additional arguments for the RotorLookupTable constructor.
+
+        Returns:
+            RotorLookupTable: The lookup table.
+        """
+        return cls(rotor_model.predict_aerodynamic_batch, max_rpm, **kwargs)
+
+    def _build(self, n_samples: int) -> None:
+        """
+        Sample predict_fn on the grid, compute the interpolation coefficients and measure the deviation
+        from predict_fn on a denser check grid.
+        """
+        self.n_samples = int(n_samples)
+        self.rpm_grid = np.linspace(0.0, self.max_rpm, self.n_samples)
+        self.step = self.rpm_grid[1] - self.rpm_grid[0]
+        self.values = np.asarray(self.predict_fn(self.rpm_grid), dtype=float)
+
+        if self.method == 'cubic':
+            from scipy.interpolate import CubicSpline
+            # Piecewise polynomial coefficients, shape (4, n_samples - 1, 6), highest order first
+            self._coefficients = CubicSpline(self.rpm_grid, self.values, axis=0).c
+
+        rpm_check = np.linspace(0.0, self.max_rpm, (self.n_samples - 1) * self.check_factor + 1)
+        reference = np.asarray(self.predict_fn(rpm_check), dtype=float)
+        deviation = np.abs(self.predict_aerodynamic_batch(rpm_check) - reference)
+        self.max_abs_error = deviation.max(axis=0)
+        self.max_rel_error = self.max_abs_error / np.maximum(np.abs(reference).max(axis=0), 1e-12)
+
+    def predict_aerodynamic_batch(self, rpms: np.ndarray) -> np.ndarray:
+        """
+        Interpolate the aerodynamic outputs for an array of RPMs.
+
+        Parameters:
+            rpms (np.ndarray): RPM values, any shape (...).
+
+        Returns:
+            np.ndarray: Array of shape (..., 6) with (T, Q, P, CT, CQ, CP), with negative values replaced by zero.
+                Non-finite RPMs (NaN, inf) give NaN outputs.
+        """
+        rpms = np.asarray(rpms, dtype=float)
+        finite = np.isfinite(rpms)
+        all_finite = finite.all()
+        if not all_finite:
+            # Index the table with a placeholder RPM and overwrite the outputs below
+            rpms = np.where(finite, rpms, 0.0)
+        rpms = np.clip(rpms, 0.0, self.max_rpm)
+        x = rpms / self.step
+        idx = np.minimum(x.astype(np.intp), self.n_samples - 2)
+        if self.method == 'linear':
+            frac = (x - idx)[..., None]
+            out = self.values[idx] * (1.0 - frac) + self.values[idx + 1] * frac
+        else:
+            t = (rpms - self.rpm_grid[idx])[..., None]
+            c = self._coefficients
+            out = ((c[0, idx] * t + c[1, idx]) * t + c[2, idx]) * t + c[3, idx]
+        np.maximum(out, 0.0, out=out)
+        if not all_finite:
+            out[~finite] = np.nan
+        return out
+
+    def predict_aerodynamic(self, rpm: float) -> tuple:
+        """
+        Interpolate the aerodynamic outputs for a single RPM value.
+
+        Parameters:
+            rpm (float): The RPM value.
+
+        Returns:
+            tuple: (T, Q, P, CT, CQ, CP).
+        """
+        return tuple(self.predict_aerodynamic_batch(rpm).tolist())
+
+    def error_report(self) -> dict:
+        """
+        Return the maximum absolute and relative deviation of the table from the sampled model, per output.
+
+        Returns:
+            dict: {output_name: {'abs': float, 'rel': float}}.
+        """
+        return {name: {'abs': float(a), 'rel': float(r)}
+                for name, a, r in zip(self.OUTPUTS, self.max_abs_error, self.max_rel_error)}
@@ -3,6 +3,7 @@
 # Date: 21.07.2025
 # Description: This module defines the RotorModel class for predicting rotor aerodynamic coefficients using a neural network.
 
+import numpy as np
 import torch
 import torch.nn as nn
 import torch.optim as optim
@@ -123,6 +124,35 @@ class RotorModel(nn.Module):
         # Replace negative values with zero
         return max(T, 0.0), max(Q, 0.0), max(P, 0.0), max(CT, 0.0), max(CQ, 0.0), max(CP, 0.0)
 
+    def predict_aerodynamic_batch(self, rpms):
+        """
+        Predict aerodynamic coefficients for several RPM values, evaluating each value on its own exactly
+        like predict_aerodynamic. The outputs are bit-identical to calling predict_aerodynamic in a loop;
+        use predict_aerodynamic_fused for a single (faster, numerically different) forward pass.
+        Args:
+            rpms (array-like): RPM values, any shape (...).
+        Returns:
+            np.ndarray: Array of shape (..., 6) with (T, Q, P, CT, CQ, CP), with negative values replaced by zero.
+        """
+        rpms = np.asarray(rpms, dtype=np.float64)
+        output = np.array([self.predict_aerodynamic(rpm) for rpm in rpms.ravel().tolist()], dtype=np.float64)
+        return output.reshape(rpms.shape + (6,))
+
+    def predict_aerodynamic_fused(self, rpms):
+        """
+        Predict aerodynamic coefficients for several RPM values with a single float32 forward pass.
+        The batched matrix products accumulate in a different order than the per-value pass, so the
+        outputs differ from predict_aerodynamic in the last bits.
+        Args:
+            rpms (array-like): RPM values, any shape (...).
+        Returns:
+            np.ndarray: Array of shape (..., 6) with (T, Q, P, CT, CQ, CP), with negative values replaced by zero.
+        """
+        rpms = np.asarray(rpms, dtype=np.float32)
+        output = self.predict(torch.from_numpy(rpms.reshape(-1, 1))).numpy().astype(np.float64)
+        np.maximum(output, 0.0, out=output)
+        return output.reshape(rpms.shape + (output.shape[-1],))
+
     def save_model(self, filename: str):
         """
         Save the model state dictionary to a file.
@@ -131,10 +161,43 @@ class RotorModel(nn.Module):
         """
         torch.save(self.state_dict(), filename)
     
+    def export_numpy(self, filename: str):
+        """
+        Export the network weights and the normalization parameters to a .npz file
+        that can be loaded by NumpyRotorModel without importing torch.
+        Args:
+            filename (str): The .npz filename to write.
+        """
+        arrays = {name.replace('.', '_'): tensor.detach().cpu().numpy() for name, tensor in self.state_dict().items()}
+        for key in ('input_mean', 'input_std', 'output_mean', 'output_std'):
+            value = getattr(self, key)
+            if value is None:
+                raise ValueError("Normalization parameters are not set. Train the model or provide norm_params_path.")
+            arrays[key] = value.detach().cpu().numpy() if isinstance(value, torch.Tensor) else np.asarray(value)
+        np.savez(filename, **arrays)
+
     def load_model(self, filename: str):
         """
         Load the model state dictionary from a file.
         Args:
             filename (str): The filename to load the model state dictionary from.
         """
-        self.load_state_dict(torch.load(filename))
\ No newline at end of file
+        self.load_state_dict(torch.load(filename))
+
+
+def export_rotor_model_to_npz(model_path: str, norm_params_path: str, npz_path: str, n_inputs: int = 1, n_outputs: int = 6):
+    """
+    Load a trained rotor model checkpoint and its normalization parameters, and export them to a .npz file.
+    Args:
+        model_path (str): Path to the model state dictionary (.pth).
+        norm_params_path (str): Path to the normalization parameters (.pth).
+        npz_path (str): Output .npz filename.
+    """
+    model = RotorModel(n_inputs, n_outputs, norm_params_path=norm_params_path)
+    model.load_model(model_path)
+    model.export_numpy(npz_path)
+
+
+if __name__ == "__main__":
+    export_rotor_model_to_npz('Rotor/rotor_model.pth', 'Rotor/normalization_params.pth', 'Rotor/rotor_model.npz')
+    print("Rotor model exported to Rotor/rotor_model.npz")
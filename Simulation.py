@@ -8,9 +8,14 @@
 import numpy as np
 from Drone import QuadcopterModel
 from World import World
-from Wind import dryden_response
+from Wind import dryden_response, DrydenGenerator, ScheduledDrydenGenerator, get_dryden_table
 from matplotlib import pyplot as plt
 from Noise.DNNModel import RotorSoundModel
+from Monitors import MotionMonitor, FlightPruner
+from FlightRecorder import FlightRecorder
+from Telemetry import TelemetrySink
+from CompiledPath import CompiledPath
+from WindField import WindField
 import time
 
 MIN_HEIGHT_FROM_GROUND = 1e-4  # Minimum height from ground to avoid singularities in noise calculations
@@ -18,17 +23,19 @@ MIN_HEIGHT_FROM_GROUND = 1e-4  # Minimum height from ground to avoid singulariti
 # --- Main: Simulation and Plotting ---
 
 class Simulation:
-    def __init__(self, drone: QuadcopterModel, world: World, waypoints: list,
+    def __init__(self, drone: QuadcopterModel, world: World, waypoints,
                  dt: float = 0.007, max_simulation_time: float = 200.0, frame_skip: int = 8,
                  target_reached_threshold: float = 2.0,
                  dynamic_target_shift_threshold_distance: float = 5,
-                 noise_model: RotorSoundModel = None, noise_annoyance_radius: int = 100):
+                 noise_model: RotorSoundModel = None, noise_annoyance_radius: int = 100,
+                 motion_monitor: MotionMonitor = None, pruner: FlightPruner = None):
         """
         Initialize the simulation with the drone model, world, waypoints, and parameters.
         Parameters:
             drone (QuadcopterModel): The drone model to simulate.
             world (World): The world in which the simulation takes place.
-            waypoints (list): List of waypoints with 'x', 'y', 'z', and 'v' keys.
+            waypoints (list or CompiledPath): List of waypoints with 'x', 'y', 'z', and 'v' keys, or a
+                CompiledPath built from it, which can be shared by many simulations.
             dt (float): Time step for the simulation.
             max_simulation_time (float): Maximum simulation time in seconds.
             frame_skip (int): Number of steps to skip for data collection.
@@ -36,6 +43,10 @@ class Simulation:
             dynamic_target_shift_threshold_distance (float): Distance to consider for shifting the target.
             noise_model (RotorSoundModel): Optional noise model for simulating drone noise emissions.
             noise_annoyance_radius (int): Radius around the drone to consider for noise emissions.
+            motion_monitor (MotionMonitor): Detector used by startSimulation to stop the simulation if the drone
+                is not moving. Default is a MotionMonitor considering all the logged frames after 5 s.
+            pruner (FlightPruner): Optional detector checked at every logged frame; when it reports a reason the
+                simulation is aborted and the reason is stored in prune_reason.
 
         This simulation implements a dynamic target strategy where the drone follows a moving target
         along a path defined by waypoints. The target is computed dynamically based on the drone's position
@@ -45,8 +56,10 @@ class Simulation:
         """
         self.drone = drone
         self.world = world
-        self.waypoints = waypoints
-        self.max_target_length = [0.0] * len(self.waypoints)
+        self.path = waypoints if isinstance(waypoints, CompiledPath) else \
+            CompiledPath(waypoints, start_position=self.drone.state['pos'])
+        self.waypoints = self.path.waypoints
+        self.max_target_length = np.zeros(len(self.path))
         self.dt = dt
         self.max_simulation_time = max_simulation_time
         self.frame_skip = frame_skip
@@ -54,24 +67,19 @@ class Simulation:
         self.dynamic_target_shift_threshold_distance = dynamic_target_shift_threshold_distance
         self.noise_model = noise_model
         self.noise_annoyance_radius = noise_annoyance_radius
+        self.motion_monitor = motion_monitor if motion_monitor is not None else MotionMonitor()
+        self.pruner = pruner
+        self.prune_reason = None
 
         # Wind simulation parameters
         self.wind_signals = []
+        self.wind_generator = None
+        self.wind_field = None
         self.simulate_wind = False
 
-        # Histories for simulation data
-        self.positions = []
-        self.angles_history = []
-        self.rpms_history = []
-        self.time_history = []
-        self.horiz_speed_history = []
-        self.vertical_speed_history = []
-        self.targets = []
-        self.spl_history = []
-        self.swl_history = []
-        self.thrust_history = []
-        self.delta_b_history = []
-        self.thrust_no_wind_history = []
+        # Preallocated histories for simulation data (see the history properties below)
+        self.recorder = FlightRecorder(self._recorder_columns(),
+                                       FlightRecorder.frames_for(max_simulation_time, dt, frame_skip))
 
         # Simulation runtime
         self.simulation_time = 0.0
@@ -79,9 +87,73 @@ class Simulation:
         self.has_moved = True
         self.has_reached_target = False
 
+    def _recorder_columns(self) -> dict:
+        n_rotors = self.drone.n_rotors
+        columns = {
+            'time': (), 'position': (3,), 'angles': (3,), 'rpm': (n_rotors,),
+            'horiz_speed': (), 'vertical_speed': (), 'target': (3,),
+            'thrust': (n_rotors,), 'delta_b': (), 'thrust_no_wind': (),
+        }
+        if self.noise_model:
+            columns.update({'spl': (), 'swl': ()})
+        return columns
+
+    def _history(self, column: str) -> np.ndarray:
+        return self.recorder[column] if column in self.recorder else np.empty(0)
+
+    # Logged histories: zero-copy views of the recorder columns, one row per logged frame
+    @property
+    def positions(self) -> np.ndarray:
+        return self._history('position')
+
+    @property
+    def angles_history(self) -> np.ndarray:
+        return self._history('angles')
+
+    @property
+    def rpms_history(self) -> np.ndarray:
+        return self._history('rpm')
+
+    @property
+    def time_history(self) -> np.ndarray:
+        return self._history('time')
+
+    @property
+    def horiz_speed_history(self) -> np.ndarray:
+        return self._history('horiz_speed')
+
+    @property
+    def vertical_speed_history(self) -> np.ndarray:
+        return self._history('vertical_speed')
+
+    @property
+    def targets(self) -> np.ndarray:
+        return self._history('target')
+
+    @property
+    def spl_history(self) -> np.ndarray:
+        return self._history('spl')
+
+    @property
+    def swl_history(self) -> np.ndarray:
+        return self._history('swl')
+
+    @property
+    def thrust_history(self) -> np.ndarray:
+        return self._history('thrust')
+
+    @property
+    def delta_b_history(self) -> np.ndarray:
+        return self._history('delta_b')
+
+    @property
+    def thrust_no_wind_history(self) -> np.ndarray:
+        return self._history('thrust_no_wind')
+
     def setWind(self, max_simulation_time: float, dt: float, height: float = 100,
                 airspeed: float = 10, turbulence_level: int = 30,
-                axis=['u', 'v', 'w'], plot_wind_signal: bool = False, seed=None):
+                axis=['u', 'v', 'w'], plot_wind_signal: bool = False, seed=None, streaming: bool = False,
+                schedule: bool = False):
         """
         Set the wind conditions for the simulation using a Dryden wind model.
         Parameters:
@@ -90,13 +162,32 @@ class Simulation:
             height (float): Height above ground level for the wind model.
             airspeed (float): Airspeed of the drone.
             turbulence_level (int): Level of turbulence to simulate.
-            plot_wind_signal (bool): If True, plot the generated wind signal for debugging.
+            plot_wind_signal (bool): If True, plot the generated wind signal for debugging. Ignored when streaming.
+            seed (int): Seed of the random wind signal.
+            streaming (bool): If True, the wind is not generated up front: a DrydenGenerator produces one sample
+                per simulation step, with constant memory whatever the simulation length. Every call to
+                startSimulation restarts it from the same seed.
+            schedule (bool): If True (streaming only), the filter follows the flight conditions: at every step its
+                coefficients are interpolated for the current drone height and speed from a shared
+                DrydenCoefficientTable, and the height and airspeed arguments are ignored.
 
         This method generates a wind signal using the Dryden wind model, which simulates atmospheric turbulence.
+        It replaces any wind set before (wind signals, generator or wind field).
         """
         num_steps = int(max_simulation_time / dt)
         if isinstance(axis, str):
             axis = [axis]
+        self._clear_wind()
+        if streaming and schedule:
+            self.wind_generator = ScheduledDrydenGenerator(get_dryden_table(dt, axis=tuple(axis)),
+                                                           turbulence_level=turbulence_level, seed=seed)
+            self.simulate_wind = True
+            return
+        if streaming:
+            self.wind_generator = DrydenGenerator(dt, height=height, airspeed=airspeed,
+                                                  turbulence_level=turbulence_level, axis=axis, seed=seed)
+            self.simulate_wind = True
+            return
         for ax in axis:
             self.wind_signals.append(
                 dryden_response(axis=ax, height=height, airspeed=airspeed,
@@ -116,40 +207,69 @@ class Simulation:
 
         self.simulate_wind = True
 
-    def _compute_moving_target(self, drone_pos: np.ndarray, seg_start: np.ndarray,
-                               seg_end: np.ndarray, v_des: float,
-                               k: float = 1.0) -> tuple:
+    def setWindSignals(self, wind_signals: np.ndarray):
+        """
+        Use precomputed wind signals, e.g. one realization of Wind.dryden_wind_batch.
+        Parameters:
+            wind_signals (np.ndarray): Wind speeds in m/s of shape (n_axes, n_steps), one row per axis in the
+                order of setWind ('u', 'v', 'w'); the third row is applied as the vertical component.
+                The rows are used without copying. They replace any wind set before (generator or wind field).
+        """
+        wind_signals = np.asarray(wind_signals)
+        num_steps = int(self.max_simulation_time / self.dt)
+        if wind_signals.ndim != 2 or wind_signals.shape[1] < num_steps:
+            raise ValueError(f"Wind signals must have shape (n_axes, n_steps) with at least {num_steps} steps.")
+        self._clear_wind()
+        self.wind_signals = list(wind_signals)
+        self.simulate_wind = True
+
+    def setWindField(self, wind_field: WindField):
+        """
+        Use a spatially correlated wind field: at every step the wind is sampled at the drone position
+        (the turbulence is frozen and advected by the mean wind of the field).
+        Parameters:
+            wind_field (WindField): The wind field, e.g. WindField.from_dryden(world, seed=...), or None to
+                disable the wind. Its tiles are computed on demand as the drone moves and cached.
+                It replaces any wind set before (wind signals or generator).
+        """
+        self._clear_wind()
+        self.wind_field = wind_field
+        self.simulate_wind = wind_field is not None
+
+    def _clear_wind(self):
+        """
+        Remove the wind sources (wind signals, generator and wind field) and disable the wind.
+        """
+        self.wind_signals = []
+        self.wind_generator = None
+        self.wind_field = None
+        self.simulate_wind = False
+
+    def _compute_moving_target(self, drone_pos: np.ndarray, seg_idx: int, k: float = 1.0) -> tuple:
         """
         Compute the dynamic target point along a segment with a look-ahead distance of L = k*v_des.
         Ensures that the target position along the segment does not move backward if the drone regresses.
         Parameters:
             drone_pos (np.ndarray): Current drone position [x, y, z].
-            seg_start (np.ndarray): Start point of the segment.
-            seg_end (np.ndarray): End point of the segment.
-            v_des (float): Desired speed for this segment.
+            seg_idx (int): Index of the current segment of self.path.
             k (float): Scaling factor for the look-ahead distance.
         Returns:
             tuple: (target, distance) where target is the dynamic target point [x, y, z],
                 and distance is the distance from the drone to the target.
         """
-        seg_vector = seg_end - seg_start
-        seg_length = np.linalg.norm(seg_vector)
-
+        path = self.path
+        seg_length = path.seg_length[seg_idx]
         if seg_length == 0:
-            return seg_end, 1.0
-        seg_dir = seg_vector / seg_length
+            return path.seg_end[seg_idx], 1.0
+        seg_start = path.seg_start[seg_idx]
+        seg_dir = path.seg_dir[seg_idx]
 
         proj_length = np.dot(drone_pos - seg_start, seg_dir)  # Projected length of drone position onto segment
-        L = k * v_des  # Look-ahead distance based on desired speed
+        L = k * path.seg_speed[seg_idx]  # Look-ahead distance based on desired speed
 
         # Ensure target does not move backward along the segment
-        idx = self.waypoints.index({'x': seg_end[0], 'y': seg_end[1], 'z': seg_end[2], 'v': v_des}) \
-            if {'x': seg_end[0], 'y': seg_end[1], 'z': seg_end[2], 'v': v_des} in self.waypoints else None
-        if idx is not None:
-            self.max_target_length[idx] = max(self.max_target_length[idx], proj_length + L)
-            target_length = min(self.max_target_length[idx], seg_length)
-        else:
-            target_length = min(proj_length + L, seg_length)
+        self.max_target_length[seg_idx] = max(self.max_target_length[seg_idx], proj_length + L)
+        target_length = min(self.max_target_length[seg_idx], seg_length)
 
         target = seg_start + target_length * seg_dir  # Compute target position along the segment
 
@@ -157,45 +277,54 @@ class Simulation:
         distance = np.linalg.norm(drone_pos - target)
         return target, distance
 
-    def startSimulation(self, stop_at_target: bool = True, verbose: bool = True, stop_sim_if_not_moving: bool = False):
+    def startSimulation(self, stop_at_target: bool = True, verbose: bool = True, stop_sim_if_not_moving: bool = False,
+                        telemetry: TelemetrySink = None):
         """
         Start the simulation of the drone following dynamic targets along the waypoints.
         Parameters:
             stop_at_target (bool): If True, stop when the final target is reached.
             verbose (bool): If True, print simulation progress and completion messages.
             stop_sim_if_not_moving (bool): If True, stop simulation if the drone is not moving for a certain period.
+            telemetry (TelemetrySink): Optional sink to which the logged frames are streamed in chunks while
+                the simulation runs (see Telemetry.load_telemetry to read them back).
 
         This method updates the drone's state at each time step and stores data in class attributes.
+        When a telemetry sink is given, at most telemetry.chunk_frames frames are kept in memory: the histories
+        only hold the frames logged after the last chunk written to the sink.
         """
         # Reset runtime and histories
         self.simulation_time = 0.0
-        self.positions.clear()
-        self.angles_history.clear()
-        self.rpms_history.clear()
-        self.time_history.clear()
-        self.horiz_speed_history.clear()
-        self.vertical_speed_history.clear()
-        self.targets.clear()
-        self.spl_history.clear()
-        self.swl_history.clear()
-        self.thrust_history.clear()
-        self.delta_b_history.clear()
-        self.thrust_no_wind_history.clear()
+        capacity = FlightRecorder.frames_for(self.max_simulation_time, self.dt, self.frame_skip)
+        if telemetry is not None:
+            capacity = min(capacity, telemetry.chunk_frames)
+            telemetry.open(self.recorder.column_shapes, metadata={
+                'dt': self.dt, 'frame_skip': self.frame_skip, 'max_simulation_time': self.max_simulation_time,
+                'noise_annoyance_radius': self.noise_annoyance_radius, 'waypoints': self.waypoints})
+        self.recorder.reset(capacity)
 
         # Reset drone state to initial conditions
         self.drone.reset_state() 
-
-        # Initialize histories for dynamic targeting
-        self.max_target_length = [0.0] * len(self.waypoints)
+        self.motion_monitor.reset()
+        self.prune_reason = None
+        if self.pruner is not None:
+            self.pruner.reset()
+        if self.wind_generator is not None:
+            self.wind_generator.reset()
+            # Only the 'w' axis wind is used, for the vertical component
+            w_axis = self.wind_generator.axis.index('w') if 'w' in self.wind_generator.axis else None
+
+        # Start the path from the initial drone position and initialize the histories for dynamic targeting
+        self.path = self.path.with_start(self.drone.state['pos'])
+        self.max_target_length = np.zeros(len(self.path))
+        n_waypoints = len(self.path)
+        final_target = self.path.final_target
 
         # Start timer
         t_0 = time.time()
 
         # Initialize dynamic targeting
-        current_seg_idx = 0
-        seg_start = self.drone.state['pos'].copy()
-        seg_end = np.array([self.waypoints[0]['x'], self.waypoints[0]['y'], self.waypoints[0]['z']])
-        v_des = self.waypoints[0]['v']
+        current_seg_idx = 0  # Index of the segment being followed, n_waypoints once the last one is completed
+        seg_idx = 0  # Index of the segment used to compute the target
         k_lookahead = 1.0
 
         num_steps = int(self.max_simulation_time / self.dt)
@@ -203,72 +332,85 @@ class Simulation:
         for step in range(num_steps):
             # Compute dynamic target
             target_dynamic, distance = self._compute_moving_target(
-                self.drone.state['pos'], seg_start, seg_end, v_des, k=k_lookahead)
+                self.drone.state['pos'], seg_idx, k=k_lookahead)
 
             # Shift to next segment if needed
             if distance <= self.dynamic_target_shift_threshold_distance:
                 current_seg_idx += 1
-                if current_seg_idx < len(self.waypoints):
-                    seg_start = seg_end
-                    seg_end = np.array([
-                        self.waypoints[current_seg_idx]['x'],
-                        self.waypoints[current_seg_idx]['y'],
-                        self.waypoints[current_seg_idx]['z']])
-                    v_des = self.waypoints[current_seg_idx]['v']
+                if current_seg_idx < n_waypoints:
+                    seg_idx = current_seg_idx
                     target_dynamic, _ = self._compute_moving_target(
-                        self.drone.state['pos'], seg_start, seg_end, v_des, k=k_lookahead)
+                        self.drone.state['pos'], seg_idx, k=k_lookahead)
                 else:
-                    target_dynamic = seg_end
-                    current_seg_idx = len(self.waypoints)  # Final segment reached
+                    target_dynamic = self.path.seg_end[seg_idx]
+                    current_seg_idx = n_waypoints  # Final segment reached
 
             # Update drone state
             self.drone.update_state({'x': target_dynamic[0], 'y': target_dynamic[1], 'z': target_dynamic[2]},
                                      self.dt, verbose=False)
             # Apply wind if enabled
-            if self.simulate_wind and len(self.wind_signals) >= 3:
+            if self.simulate_wind and self.wind_field is not None:
+                wind = self.wind_field.sample(self.drone.state['pos'], t=step * self.dt)
+                self.drone.update_wind(wind[2], simulate_wind=True)  # Vertical component
+            elif self.simulate_wind and self.wind_generator is not None:
+                if isinstance(self.wind_generator, ScheduledDrydenGenerator):
+                    state = self.drone.state
+                    wind = self.wind_generator.step(height=state['pos'][2], airspeed=np.linalg.norm(state['vel']))
+                else:
+                    wind = self.wind_generator.step()
+                if w_axis is not None:
+                    self.drone.update_wind(wind[w_axis], simulate_wind=True)
+            elif self.simulate_wind and len(self.wind_signals) >= 3:
                 self.drone.update_wind(self.wind_signals[2][step], simulate_wind=True) #Only use 'w' axis wind for vertical component
 
             current_time = step * self.dt
 
             # Store data at specified intervals
             if step % self.frame_skip == 0:
-                self.positions.append(self.drone.state['pos'].copy())
-                self.angles_history.append(self.drone.state['angles'].copy())
-                self.rpms_history.append(self.drone.state['rpm'].copy())
-                self.time_history.append(current_time)
-                self.horiz_speed_history.append(np.linalg.norm(self.drone.state['vel'][:2]))
-                self.vertical_speed_history.append(self.drone.state['vel'][2])
-                self.targets.append(target_dynamic.copy())
-                self.thrust_history.append(self.drone.thrust)
-                self.delta_b_history.append(self.drone.delta_b)
-                self.thrust_no_wind_history.append(self.drone.thrust_no_wind)
+                state = self.drone.state
+                horiz_speed = np.linalg.norm(state['vel'][:2])
+                vertical_speed = state['vel'][2]
+                self.motion_monitor.update(horiz_speed, vertical_speed)
+                frame = dict(time=current_time, position=state['pos'], angles=state['angles'], rpm=state['rpm'],
+                             horiz_speed=horiz_speed, vertical_speed=vertical_speed, target=target_dynamic,
+                             thrust=self.drone.thrust, delta_b=self.drone.delta_b,
+                             thrust_no_wind=self.drone.thrust_no_wind)
 
                 if self.noise_model:
                     # Compute noise emissions around the drone
-                    avg_spl = 0.0
-                    avg_swl = 0.0
                     x_d, y_d, z_d = self.drone.state['pos']
                     # If position is not valid, set position to zero
                     if np.isnan(x_d) or np.isnan(y_d) or np.isnan(z_d):
                         x_d, y_d, z_d = 0.0, 0.0, MIN_HEIGHT_FROM_GROUND
-                    areas, params = self.world.get_areas_in_circle(
+                    areas, area_ids = self.world.get_areas_in_circle_array(
                         x=int(x_d), y=int(y_d), height=MIN_HEIGHT_FROM_GROUND,
                         radius=self.noise_annoyance_radius, include_areas_out_of_bounds=True)
-                    for area in areas:
-                        x_a, y_a, _ = area
-                        dist = np.linalg.norm([x_d, y_d, z_d] - np.array([x_a, y_a, MIN_HEIGHT_FROM_GROUND]))
-                        zeta = np.arctan2(abs(z_d), dist)
-                        spl, swl = self.noise_model.get_noise_emissions(
-                            zeta_angle=zeta, rpms=self.drone.state['rpm'], distance=dist)
-                        avg_spl += spl
-                        avg_swl += swl
-                    count = len(areas) if areas else 1
-                    self.spl_history.append(avg_spl / count)
-                    self.swl_history.append(avg_swl / count)
+                    # Distances and zeta angles of all the receivers at once
+                    offsets = np.array([x_d, y_d, z_d]) - areas
+                    offsets[:, 2] = z_d - MIN_HEIGHT_FROM_GROUND
+                    dist = np.linalg.norm(offsets, axis=1)
+                    zeta = np.arctan2(abs(z_d), dist)
+                    spl, swl = self.noise_model.get_noise_emissions_batch(
+                        zeta_angles=zeta, rpms=self.drone.state['rpm'], distances=dist)
+                    count = len(areas) if len(areas) else 1
+                    frame['spl'] = np.sum(spl) / count
+                    frame['swl'] = np.sum(swl) / count
+                self.recorder.record(**frame)
+                if telemetry is not None and len(self.recorder) == self.recorder.capacity:
+                    telemetry.write(self.recorder.as_dict())
+                    self.recorder.reset()
+
+                # Abort flights that are not worth completing
+                if self.pruner is not None:
+                    self.prune_reason = self.pruner.update(current_time, state['pos'], state['angles'],
+                                                           target_dynamic, self.drone.thrust)
+                    if self.prune_reason is not None:
+                        if verbose:
+                            print(f"Simulation aborted at time {current_time:.2f} s ({self.prune_reason}).")
+                        self.navigation_time = current_time
+                        break
             # Check for final target reached only if all the other waypoints have been reached
-            if stop_at_target and current_seg_idx == len(self.waypoints):
-                final_target = np.array([
-                    self.waypoints[-1]['x'], self.waypoints[-1]['y'], self.waypoints[-1]['z']])
+            if stop_at_target and current_seg_idx == n_waypoints:
                 if np.linalg.norm(self.drone.state['pos'] - final_target) < self.target_reached_threshold:
                     if verbose:
                         print(f"Final target reached at time: {current_time:.2f} s")
@@ -277,7 +419,7 @@ class Simulation:
                     break
 
             # Check if drone is not moving 
-            if current_time > 5 and np.linalg.norm(self.horiz_speed_history) < 1e-2 and np.linalg.norm(self.vertical_speed_history) < 1e-2 and stop_sim_if_not_moving:
+            if stop_sim_if_not_moving and self.motion_monitor.is_stalled(current_time):
                 
                 if verbose:
                     print(f"Drone stopped at time because was not moving: {current_time:.2f} s")
@@ -286,6 +428,11 @@ class Simulation:
                 self.has_moved = False
                 break
 
+        if telemetry is not None:
+            telemetry.write(self.recorder.as_dict())
+            telemetry.close()
+        self.recorder.trim()
+
         # End timer
         self.simulation_time = time.time() - t_0
         if verbose:
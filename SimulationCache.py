@@ -0,0 +1,224 @@
+# Author: Andrea Vaiuso
+# Version: 1.0
+# Date: 18.10.2026
+# Description: This module defines the SimulationCache class, a persistent content-addressed cache of simulation
+# results used by the PID optimization scripts. Entries are keyed by a SHA-256 hash of the (quantized) PID gains
+# and of a context describing everything else the result depends on: simulation parameters, waypoints, and the
+# digests of the world and model files. The cache is bounded on disk and evicts the least recently used entries.
+
+import hashlib
+import json
+import os
+import numpy as np
+
+# Bump when a change of the simulation or cost code invalidates the cached results
+CACHE_VERSION = 5
+
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    SHA-256 digest of a file, or None if the file does not exist.
+    """
+    if path is None or not os.path.isfile(path):
+        return None
+    sha = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def simulation_context(parameters: dict, waypoints, objective: str, **extra) -> dict:
+    """
+    Build the part of the cache key that does not depend on the PID gains.
+
+    Parameters:
+        parameters (dict): Configuration parameters (parameters.yaml). The PID gains it contains are ignored,
+            since the gains of each evaluation are part of the key.
+        waypoints (list or CompiledPath): Waypoints flown by the simulations.
+        objective (str): Name of the cost function, so that scripts computing different costs do not share entries.
+        **extra: Any other JSON-serializable value the result depends on (e.g. the maximum simulation time).
+
+    Returns:
+        dict: The context, with the digests of the world and model files.
+    """
+    waypoint_array = getattr(waypoints, 'waypoint_array', None)
+    if waypoint_array is None:
+        waypoint_array = [[wp['x'], wp['y'], wp['z'], wp['v']] for wp in waypoints]
+    return {
+        'version': CACHE_VERSION,
+        'objective': objective,
+        'parameters': {k: v for k, v in parameters.items()
+                       if not k.startswith(('kp_', 'ki_', 'kd_')) and not k.startswith('simulation_cache')},
+        'waypoints': np.asarray(waypoint_array, dtype=float).tolist(),
+        'files': {
+            'world': file_digest(parameters.get('world_data_path')),
+            'rotor_model': file_digest(parameters.get('rotor_model_path')),
+            'norm_params': file_digest(parameters.get('norm_params_path')),
+            'rotor_config': file_digest(parameters.get('rotor_data_path', 'Rotor/rotor_config.ini')),
+        },
+        'extra': extra,
+    }
+
+
+class SimulationCache:
+    # An eviction brings the cache down to this fraction of its limits, so that the next one (and the directory
+    # rescan that precedes it) only happens after that many new entries
+    EVICTION_TARGET = 0.9
+    # Puts between two rescans of the directory when no limit on the number of entries is set
+    RESCAN_INTERVAL = 1000
+
+    def __init__(self, directory: str, context: dict, max_entries: int = 100000, max_mb: float = None,
+                 gain_digits: int = 10):
+        """
+        Open (or create) a cache directory.
+
+        Parameters:
+            directory (str): Directory where the entries are stored.
+            context (dict): Context of the cached simulations (see simulation_context).
+            max_entries (int): Maximum number of entries kept on disk.
+            max_mb (float): Optional maximum size of the cache in megabytes.
+            gain_digits (int): Number of significant digits kept when hashing the gains. Gains equal up to
+                this precision share the same entry.
+        """
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = None if max_mb is None else int(max_mb * 1024 * 1024)
+        self.gain_digits = gain_digits
+        self.context_digest = hashlib.sha256(
+            json.dumps(context, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        self._index = self._scan()
+        self._total_bytes = sum(size for _, size in self._index.values())
+        self._puts_since_scan = 0
+        # Rescanning every (1 - EVICTION_TARGET) * max_entries puts keeps the amortized cost of a put constant
+        self._rescan_interval = (max(1, int(max_entries * (1 - self.EVICTION_TARGET)))
+                                 if max_entries is not None else self.RESCAN_INTERVAL)
+
+    def _scan(self, known: dict = None) -> dict:
+        """
+        Index of the entries on disk: {key: [last use time, size in bytes]}. An entry exists once its .json file
+        is written (after the telemetry). Entries already in known are reused without calling stat again, so
+        refreshing the index only lists the directory and stats the entries written by other processes since.
+        """
+        known = known or {}
+        index = {}
+        for name in os.listdir(self.directory):
+            key, ext = os.path.splitext(name)
+            if ext != '.json':
+                continue
+            if key in known:
+                index[key] = known[key]
+                continue
+            try:
+                stat = os.stat(self._path(key))
+            except FileNotFoundError:
+                continue  # Evicted by another process meanwhile
+            entry = index[key] = [stat.st_mtime, stat.st_size]
+            try:
+                entry[1] += os.path.getsize(self._path(key, '.npz'))
+            except OSError:
+                pass  # No telemetry
+        return index
+
+    def _path(self, key: str, ext: str = '.json') -> str:
+        return os.path.join(self.directory, key + ext)
+
+    def make_key(self, pid_gains: dict) -> str:
+        """
+        Content address of a simulation with the given PID gains in the cache context.
+        """
+        gains = {k: float(f"{float(v):.{self.gain_digits}g}") for k, v in sorted(pid_gains.items())}
+        payload = json.dumps({'context': self.context_digest, 'gains': gains}, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> dict:
+        """
+        Return the cached value for key, or None. A hit refreshes the entry for the LRU eviction.
+        """
+        path = self._path(key)
+        try:
+            with open(path) as file:
+                value = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+            if key in self._index:
+                self._index[key][0] = os.path.getmtime(path)
+        except OSError:
+            pass  # Evicted by another process after the read, the value is still valid
+        self.hits += 1
+        return value
+
+    def get_telemetry(self, key: str) -> dict:
+        """
+        Return the telemetry stored with an entry (dictionary of arrays), or None.
+        """
+        try:
+            with np.load(self._path(key, '.npz')) as data:
+                return {name: data[name] for name in data.files}
+        except OSError:
+            return None
+
+    def put(self, key: str, value: dict, telemetry: dict = None) -> None:
+        """
+        Store a value (JSON-serializable dictionary) and optional telemetry (dictionary of arrays, stored
+        compressed as float32), then evict the least recently used entries if the cache is over its limits.
+        Files are written atomically, so concurrent workers can share the same directory.
+        A put only updates the local index. The directory is rescanned, to account for the entries written by
+        the other workers, when the local index goes over a limit and every _rescan_interval puts; an eviction
+        then brings the cache down to EVICTION_TARGET of its limits. The amortized cost of a put is therefore
+        constant, and with W workers the directory exceeds its limits by at most W * _rescan_interval entries
+        between two rescans (the last use times of entries already indexed are not re-read, so hits in other
+        processes are not seen).
+        """
+        size = 0
+        if telemetry is not None:
+            tmp = self._path(key, f'.npz.{os.getpid()}.tmp')
+            with open(tmp, 'wb') as file:
+                np.savez_compressed(file, **{k: np.asarray(v, dtype=np.float32) for k, v in telemetry.items()})
+            os.replace(tmp, self._path(key, '.npz'))
+            size += os.path.getsize(self._path(key, '.npz'))
+        tmp = self._path(key, f'.json.{os.getpid()}.tmp')
+        with open(tmp, 'w') as file:
+            json.dump(value, file, default=float)
+        os.replace(tmp, self._path(key))
+        size += os.path.getsize(self._path(key))
+        previous = self._index.pop(key, None)
+        if previous is not None:
+            self._total_bytes -= previous[1]
+        self._index[key] = [os.path.getmtime(self._path(key)), size]
+        self._total_bytes += size
+        self._puts_since_scan += 1
+        if self._over_limits(1.0) or self._puts_since_scan >= self._rescan_interval:
+            self._index = self._scan(self._index)
+            self._total_bytes = sum(size for _, size in self._index.values())
+            self._puts_since_scan = 0
+            if self._over_limits(1.0):
+                self._evict()
+
+    def _over_limits(self, fraction: float) -> bool:
+        """
+        Whether the indexed entries exceed the given fraction of the entry or size limit.
+        """
+        if self.max_entries is not None and len(self._index) > self.max_entries * fraction:
+            return True
+        return self.max_bytes is not None and self._total_bytes > self.max_bytes * fraction
+
+    def _evict(self) -> None:
+        for key in sorted(self._index, key=lambda k: self._index[k][0]):
+            if not self._over_limits(self.EVICTION_TARGET):
+                break
+            self._total_bytes -= self._index.pop(key)[1]
+            for ext in ('.json', '.npz'):
+                try:
+                    os.remove(self._path(key, ext))
+                except FileNotFoundError:
+                    pass
+
+    def __len__(self) -> int:
+        return len(self._index)
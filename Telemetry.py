@@ -0,0 +1,153 @@
+# Author: Andrea Vaiuso
+# Version: 1.0
+# Date: 18.10.2026
+# Description: This module defines the TelemetrySink class, which streams the frames logged by a simulation to an
+# append-only binary file while the simulation runs, and the load_telemetry function to read such files back.
+# The file is made of a JSON header followed by fixed-size little-endian records, one per logged frame, so it can
+# be memory-mapped and a file left by an interrupted run is still readable up to its last complete record.
+
+import json
+import os
+import struct
+import numpy as np
+
+TELEMETRY_MAGIC = b'DRONETLM'
+TELEMETRY_VERSION = 1
+_HEADER_ALIGNMENT = 64
+
+
+def _record_dtype(columns: list) -> np.dtype:
+    """
+    Structured dtype of a telemetry record from the list of column descriptions of the header.
+    """
+    return np.dtype([(c['name'], c['dtype'], tuple(c['shape'])) for c in columns])
+
+
+class TelemetrySink:
+    def __init__(self, filename: str, chunk_frames: int = 1024, fsync: bool = False):
+        """
+        Initialize the telemetry sink.
+
+        Parameters:
+            filename (str): Path of the telemetry file. An existing file is overwritten when the sink is opened.
+            chunk_frames (int): Number of frames kept in memory before they are written to the file.
+                A simulation streaming to this sink never holds more than chunk_frames logged frames.
+            fsync (bool): If True, force every written chunk to disk (slower, but safer against system crashes).
+        """
+        if chunk_frames < 1:
+            raise ValueError("chunk_frames must be at least 1.")
+        self.filename = filename
+        self.chunk_frames = int(chunk_frames)
+        self.fsync = fsync
+        self.frames_written = 0
+        self._file = None
+        self._dtype = None
+
+    def open(self, columns: dict, metadata: dict = None) -> None:
+        """
+        Create the file and write its header.
+
+        Parameters:
+            columns (dict): Column names mapped to the shape of a single frame (see FlightRecorder).
+            metadata (dict): Optional JSON-serializable information stored in the header (e.g. dt, waypoints).
+        """
+        self.close()
+        column_list = [{'name': name, 'shape': list(shape), 'dtype': '<f8'} for name, shape in columns.items()]
+        self._dtype = _record_dtype(column_list)
+        header = json.dumps({'version': TELEMETRY_VERSION, 'columns': column_list,
+                             'record_size': self._dtype.itemsize, 'metadata': metadata or {}},
+                            default=float).encode('utf-8')
+        # Pad the header so that records start on an aligned offset
+        prefix_size = len(TELEMETRY_MAGIC) + 4
+        header += b' ' * (-(prefix_size + len(header)) % _HEADER_ALIGNMENT)
+
+        self._file = open(self.filename, 'wb')
+        self._file.write(TELEMETRY_MAGIC + struct.pack('<I', len(header)) + header)
+        self._file.flush()
+        self.frames_written = 0
+
+    def write(self, frames: dict) -> None:
+        """
+        Append a chunk of frames to the file and flush it.
+
+        Parameters:
+            frames (dict): Column names mapped to arrays of shape (n_frames, *frame_shape), e.g. FlightRecorder.as_dict().
+        """
+        if self._file is None:
+            raise RuntimeError("TelemetrySink is not open.")
+        n_frames = len(next(iter(frames.values()))) if frames else 0
+        if n_frames == 0:
+            return
+        records = np.zeros(n_frames, dtype=self._dtype)
+        for name, values in frames.items():
+            records[name] = values
+        self._file.write(records.tobytes())
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self.frames_written += n_frames
+
+    def close(self) -> None:
+        """
+        Close the file. Closing a sink that is not open has no effect.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def read_telemetry_header(filename: str) -> tuple:
+    """
+    Read the header of a telemetry file.
+
+    Parameters:
+        filename (str): Path of the telemetry file.
+
+    Returns:
+        tuple: (header, data_offset) where header is the decoded JSON header and data_offset is the
+            position of the first record in the file.
+    """
+    with open(filename, 'rb') as file:
+        magic = file.read(len(TELEMETRY_MAGIC))
+        if magic != TELEMETRY_MAGIC:
+            raise ValueError(f"{filename} is not a telemetry file.")
+        (header_size,) = struct.unpack('<I', file.read(4))
+        header = json.loads(file.read(header_size).decode('utf-8'))
+    return header, len(TELEMETRY_MAGIC) + 4 + header_size
+
+
+def load_telemetry(filename: str, columns: list = None, mmap: bool = True) -> tuple:
+    """
+    Load the frames stored in a telemetry file. A trailing incomplete record (e.g. left by an interrupted run) is ignored.
+
+    Parameters:
+        filename (str): Path of the telemetry file.
+        columns (list): Names of the columns to return. If None, all the columns are returned.
+        mmap (bool): If True, the returned arrays are read-only views of a memory map of the file;
+            otherwise they are loaded in memory.
+
+    Returns:
+        tuple: (data, metadata) where data maps the column names to arrays of shape (n_frames, *frame_shape)
+            and metadata is the dictionary stored in the header.
+    """
+    header, offset = read_telemetry_header(filename)
+    dtype = _record_dtype(header['columns'])
+    n_frames = (os.path.getsize(filename) - offset) // dtype.itemsize
+
+    if n_frames == 0:
+        records = np.zeros(0, dtype=dtype)
+    elif mmap:
+        records = np.memmap(filename, dtype=dtype, mode='r', offset=offset, shape=(n_frames,))
+    else:
+        with open(filename, 'rb') as file:
+            file.seek(offset)
+            records = np.fromfile(file, dtype=dtype, count=n_frames)
+
+    names = dtype.names if columns is None else columns
+    return {name: records[name] for name in names}, header['metadata']
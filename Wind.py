@@ -1,16 +1,28 @@
 # dryden.py
 import numpy as np
 import math
+from bisect import bisect_right
+from functools import lru_cache
 from scipy import signal
+from scipy.linalg import block_diag
 
-def _dryden_tf(height, airspeed, axis='u', turbulence_level=30):
-    h = height
-    V = airspeed
+def dryden_scales(height, turbulence_level=30):
+    """
+    Length scale and standard deviation of the Dryden turbulence at a given height.
 
+    Returns:
+        tuple: (Lv, sigma) length scale in m and standard deviation of the wind speed in m/s.
+    """
+    h = height
     sigma_w = 0.1 * turbulence_level  # Standard deviation of the wind speed in m/s, scaled by turbulence level
     coeff = (0.177 + 0.000823 * h) # Coefficient based on height
     Lv = h / coeff**0.2 # Length scale of the turbulence in m
     sigma = sigma_w / coeff**0.4 # Standard deviation of the wind speed in m/s, adjusted by the coefficient
+    return Lv, sigma
+
+def _dryden_tf(height, airspeed, axis='u', turbulence_level=30):
+    V = airspeed
+    Lv, sigma = dryden_scales(height, turbulence_level)
 
     if axis == 'u':
         num = [sigma * np.sqrt(2 * Lv / (np.pi * V)) * V]
@@ -34,4 +46,253 @@ def dryden_response(axis, height=100, airspeed=10, turbulence_level=30, time_ste
     return y
 
 
+def dryden_filter(dt, height=100, airspeed=10, axis='u', turbulence_level=30, method='zoh'):
+    """
+    Discrete-time Dryden filter of one axis, as the coefficients of a difference equation.
+
+    Parameters:
+        dt (float): Time step of the samples in seconds.
+        height (float): Height above ground level for the wind model.
+        airspeed (float): Airspeed of the drone.
+        axis (str): Axis of the filter ('u', 'v' or 'w').
+        turbulence_level (int): Level of turbulence to simulate.
+        method (str): Discretization method of scipy.signal.cont2discrete, e.g. 'zoh' or 'bilinear'.
+
+    Returns:
+        tuple: (b, a) numerator and denominator coefficients, usable with scipy.signal.lfilter.
+    """
+    tf = _dryden_tf(height, airspeed, axis, turbulence_level)
+    num, den, _ = signal.cont2discrete((tf.num, tf.den), dt, method=method)
+    return np.ravel(num), np.ravel(den)
+
+def dryden_wind_batch(seeds, time_steps, dt, height=100, airspeed=10, turbulence_level=30,
+                      axis=('u', 'v', 'w'), method='zoh'):
+    """
+    Generate many Dryden wind realizations at once, filtering a whole white-noise tensor through the
+    discretized transfer function of each axis with scipy.signal.lfilter.
+
+    Parameters:
+        seeds (sequence): One seed per realization (None for an unseeded one).
+        time_steps (int): Number of samples of each realization.
+        dt (float): Time step of the samples in seconds.
+        height (float): Height above ground level for the wind model.
+        airspeed (float): Airspeed of the drone.
+        turbulence_level (int): Level of turbulence to simulate.
+        axis (str or sequence): Axes to generate ('u', 'v', 'w').
+        method (str): Discretization method of scipy.signal.cont2discrete, e.g. 'zoh' or 'bilinear'.
+
+    Returns:
+        np.ndarray: Contiguous wind speeds in m/s, shape (n_seeds, n_axes, time_steps). The realization of a
+            seed is the sequence that DrydenGenerator produces with the same seed and parameters.
+    """
+    axis = [axis] if isinstance(axis, str) else list(axis)
+    noise = np.empty((len(seeds), len(axis), time_steps))
+    for i, seed in enumerate(seeds):
+        # Same draw order as DrydenGenerator.step: one sample per axis at each time step
+        noise[i] = np.random.default_rng(seed).standard_normal((time_steps, len(axis))).T
+    noise *= np.sqrt(np.pi / dt)
+    for j, ax in enumerate(axis):
+        b, a = dryden_filter(dt, height, airspeed, ax, turbulence_level, method)
+        noise[:, j] = signal.lfilter(b, a, noise[:, j], axis=-1)
+    return noise
+
+
+class DrydenGenerator:
+    def __init__(self, dt, height=100, airspeed=10, turbulence_level=30, axis=('u', 'v', 'w'), seed=None,
+                 method='zoh'):
+        """
+        Streaming Dryden turbulence generator. The transfer functions of the requested axes are discretized
+        once into a single small state-space filter, and wind samples are produced one time step at a time,
+        so arbitrarily long flights need constant memory.
+
+        Parameters:
+            dt (float): Time step of the samples in seconds.
+            height (float): Height above ground level for the wind model.
+            airspeed (float): Airspeed of the drone.
+            turbulence_level (int): Level of turbulence to simulate.
+            axis (str or sequence): Axes to generate ('u', 'v', 'w'), in the order of the returned samples.
+            seed (int): Seed of the private random generator (the global NumPy random state is not used).
+            method (str): Discretization method of scipy.signal.cont2discrete, e.g. 'zoh' or 'bilinear'.
+
+        The input white noise has variance pi / dt, so that the standard deviation of the samples
+        approaches the sigma of the Dryden spectrum when dt is small compared to the turbulence time scale.
+        """
+        self.axis = [axis] if isinstance(axis, str) else list(axis)
+        self.dt = dt
+        self.seed = seed
+        A, B, C, D = [], [], [], []
+        for ax in self.axis:
+            tf = _dryden_tf(height, airspeed, ax, turbulence_level)
+            Ad, Bd, Cd, Dd, _ = signal.cont2discrete(signal.tf2ss(tf.num, tf.den), dt, method=method)
+            A.append(Ad); B.append(Bd); C.append(Cd); D.append(Dd)
+        # One block per axis: x[k+1] = A x[k] + B n[k], y[k] = C x[k] + D n[k]
+        self.A = block_diag(*A)
+        self.B = block_diag(*B)
+        self.C = block_diag(*C)
+        self.D = block_diag(*D)
+        self.noise_scale = np.sqrt(np.pi / dt)
+        self.reset()
+
+    def reset(self, seed=None) -> None:
+        """
+        Restart the generator from a zero filter state.
+
+        Parameters:
+            seed (int): New seed. If None, the seed given at construction is used again, so the same
+                sequence of samples is produced.
+        """
+        if seed is not None:
+            self.seed = seed
+        self.rng = np.random.default_rng(self.seed)
+        self.x = np.zeros(self.A.shape[0])
+
+    def step(self) -> np.ndarray:
+        """
+        Generate the wind sample of the next time step.
+
+        Returns:
+            np.ndarray: Wind speed in m/s for each axis, shape (n_axes,).
+        """
+        n = self.rng.standard_normal(len(self.axis)) * self.noise_scale
+        y = self.C @ self.x + self.D @ n
+        self.x = self.A @ self.x + self.B @ n
+        return y
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> np.ndarray:
+        return self.step()
+
+
+class DrydenCoefficientTable:
+    def __init__(self, dt, heights=(1, 2, 5, 10, 20, 35, 50, 75, 100, 150, 200),
+                 airspeeds=(1, 2, 4, 6, 8, 10, 15, 20, 30), turbulence_levels=(10, 30, 50),
+                 axis=('u', 'v', 'w'), method='zoh'):
+        """
+        Table of the discrete-time Dryden filter coefficients over a grid of heights, airspeeds and turbulence
+        levels, so that a wind generator can follow the flight conditions without rebuilding scipy LTI objects.
+        Use get_dryden_table to share one table between generators.
+
+        Parameters:
+            dt (float): Time step of the samples in seconds.
+            heights (sequence): Grid of heights above ground level in meters.
+            airspeeds (sequence): Grid of airspeeds in m/s.
+            turbulence_levels (sequence): Grid of turbulence levels.
+            axis (str or sequence): Axes of the filters ('u', 'v', 'w').
+            method (str): Discretization method of scipy.signal.cont2discrete, e.g. 'zoh' or 'bilinear'.
+
+        Coefficients are stored as (b, a) pairs padded to second order, with a[0] = 1. Between grid points they
+        are interpolated linearly, which keeps the filters stable (the stable coefficients of first- and
+        second-order denominators form a convex set); outside the grid the closest point is used.
+        """
+        self.dt = dt
+        self.axis = [axis] if isinstance(axis, str) else list(axis)
+        self.grid = tuple(sorted(float(v) for v in values) for values in (heights, airspeeds, turbulence_levels))
+        shape = tuple(len(g) for g in self.grid)
+        self.coefficients = np.zeros(shape + (len(self.axis), 2, 3))
+        for idx in np.ndindex(shape):
+            h, V, level = (g[i] for g, i in zip(self.grid, idx))
+            for j, ax in enumerate(self.axis):
+                b, a = dryden_filter(dt, h, V, ax, level, method)
+                # Align the numerator with the denominator, then pad both to second order
+                self.coefficients[idx][j, 0, len(a) - len(b):len(a)] = b / a[0]
+                self.coefficients[idx][j, 1, :len(a)] = a / a[0]
+        self.coefficients.flags.writeable = False
+
+    @staticmethod
+    def _bracket(grid, x) -> tuple:
+        """
+        Indices of the grid points around x and the interpolation weight of the upper one.
+        """
+        if len(grid) == 1 or x <= grid[0]:
+            return 0, 0, 0.0
+        if x >= grid[-1]:
+            return len(grid) - 1, len(grid) - 1, 0.0
+        i = bisect_right(grid, x) - 1
+        return i, i + 1, (x - grid[i]) / (grid[i + 1] - grid[i])
+
+    def lookup(self, height, airspeed, turbulence_level) -> np.ndarray:
+        """
+        Interpolate the filter coefficients for the given flight conditions.
+
+        Parameters:
+            height (float): Height above ground level in meters.
+            airspeed (float): Airspeed in m/s.
+            turbulence_level (float): Turbulence level.
+
+        Returns:
+            np.ndarray: Coefficients of shape (n_axes, 2, 3): [:, 0] are the numerators b and [:, 1]
+                the denominators a of each axis.
+        """
+        c = self.coefficients
+        for dim, x in enumerate((height, airspeed, turbulence_level)):
+            lo, hi, w = self._bracket(self.grid[dim], float(x))
+            # The interpolated dimension is always the first one left
+            c = c[lo] if w == 0.0 else (1.0 - w) * c[lo] + w * c[hi]
+        return c
+
+
+@lru_cache(maxsize=8)
+def get_dryden_table(dt, heights=(1, 2, 5, 10, 20, 35, 50, 75, 100, 150, 200),
+                     airspeeds=(1, 2, 4, 6, 8, 10, 15, 20, 30), turbulence_levels=(10, 30, 50),
+                     axis=('u', 'v', 'w'), method='zoh') -> DrydenCoefficientTable:
+    """
+    Shared (memoized) DrydenCoefficientTable. The grids and axes must be given as tuples.
+    """
+    return DrydenCoefficientTable(dt, heights, airspeeds, turbulence_levels, axis, method)
+
+
+class ScheduledDrydenGenerator:
+    def __init__(self, table: DrydenCoefficientTable, turbulence_level=30, seed=None):
+        """
+        Streaming Dryden turbulence generator whose filters follow the flight conditions: at every step the
+        coefficients are interpolated from a DrydenCoefficientTable for the current height and airspeed,
+        while the filter states carry over (transposed direct form II).
+
+        Parameters:
+            table (DrydenCoefficientTable): Table of the filter coefficients (see get_dryden_table).
+            turbulence_level (int): Level of turbulence to simulate.
+            seed (int): Seed of the private random generator (the global NumPy random state is not used).
+
+        With constant conditions the samples are the ones of a DrydenGenerator with the same seed and parameters.
+        """
+        self.table = table
+        self.axis = table.axis
+        self.dt = table.dt
+        self.turbulence_level = turbulence_level
+        self.seed = seed
+        self.noise_scale = np.sqrt(np.pi / table.dt)
+        self.reset()
+
+    def reset(self, seed=None) -> None:
+        """
+        Restart the generator from zero filter states.
+
+        Parameters:
+            seed (int): New seed. If None, the seed given at construction is used again.
+        """
+        if seed is not None:
+            self.seed = seed
+        self.rng = np.random.default_rng(self.seed)
+        self.z = np.zeros((len(self.axis), 2))
+
+    def step(self, height, airspeed) -> np.ndarray:
+        """
+        Generate the wind sample of the next time step.
+
+        Parameters:
+            height (float): Current height above ground level in meters.
+            airspeed (float): Current airspeed in m/s.
 
+        Returns:
+            np.ndarray: Wind speed in m/s for each axis, shape (n_axes,).
+        """
+        coefficients = self.table.lookup(height, airspeed, self.turbulence_level)
+        b, a = coefficients[:, 0], coefficients[:, 1]
+        n = self.rng.standard_normal(len(self.axis)) * self.noise_scale
+        z = self.z
+        y = b[:, 0] * n + z[:, 0]
+        z[:, 0] = b[:, 1] * n - a[:, 1] * y + z[:, 1]
+        z[:, 1] = b[:, 2] * n - a[:, 2] * y
+        return y
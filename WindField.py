@@ -0,0 +1,163 @@
+# Author: Andrea Vaiuso
+# Version: 1.0
+# Date: 18.10.2026
+# Description: This module defines the WindField class, a spatially correlated 3D turbulent wind field over the
+# World domain. The field is white noise convolved with a kernel derived from the von Karman spectrum (built by
+# inverse FFT on a periodic grid). It is computed lazily in cubic tiles aligned with the world grid, which are kept
+# in a bounded LRU cache, and sampled at any position with trilinear interpolation.
+
+import math
+from collections import OrderedDict
+import numpy as np
+from scipy.signal import fftconvolve
+from Wind import dryden_scales
+
+
+class WindField:
+    def __init__(self, grid_size: float, sigma: float = 1.0, length_scale: float = 100.0, tile_cells: int = 16,
+                 kernel_radius: int = None, max_tiles: int = 64, mean_wind=(0.0, 0.0, 0.0), seed: int = 0):
+        """
+        Initialize the wind field. No tile is computed until the field is sampled.
+
+        Parameters:
+            grid_size (float): Spacing in meters of the field grid points (usually World.grid_size).
+            sigma (float): Standard deviation of each wind component in m/s.
+            length_scale (float): Length scale of the von Karman spectrum in meters.
+            tile_cells (int): Number of grid cells along each side of a tile.
+            kernel_radius (int): Radius in cells of the correlation kernel. Default covers two length scales.
+            max_tiles (int): Maximum number of tiles kept in memory; the least recently used ones are dropped.
+            mean_wind (sequence): Mean wind [u, v, w] in m/s. The turbulence is frozen and advected by it.
+            seed (int): Seed of the field. The same seed always gives the same field, whatever the order in
+                which tiles are computed.
+        """
+        self.grid_size = float(grid_size)
+        self.sigma = float(sigma)
+        self.length_scale = float(length_scale)
+        self.tile_cells = int(tile_cells)
+        self.kernel_radius = int(kernel_radius) if kernel_radius is not None else \
+            max(1, int(np.ceil(2 * length_scale / grid_size)))
+        self.max_tiles = int(max_tiles)
+        self.mean_wind = np.asarray(mean_wind, dtype=float)
+        self.seed = int(seed)
+        self.kernel = self._von_karman_kernel()
+        self._tiles = OrderedDict()
+
+    @classmethod
+    def from_dryden(cls, world, height: float = 100, turbulence_level: int = 30, **kwargs) -> 'WindField':
+        """
+        Wind field with the length scale and standard deviation of the Dryden model at the given height,
+        on the grid of a World.
+
+        Parameters:
+            world (World): World whose grid_size is used.
+            height (float): Height above ground level for the turbulence scales.
+            turbulence_level (int): Level of turbulence to simulate.
+            **kwargs: Other WindField parameters (tile_cells, max_tiles, mean_wind, seed, ...).
+        """
+        length_scale, sigma = dryden_scales(height, turbulence_level)
+        return cls(world.grid_size, sigma=sigma, length_scale=length_scale, **kwargs)
+
+    def _von_karman_kernel(self) -> np.ndarray:
+        """
+        Convolution kernel whose power spectrum is the von Karman spectrum, computed by inverse FFT on a
+        periodic grid of 2 * kernel_radius + 1 points per side, normalized so that the filtered unit white
+        noise has standard deviation sigma.
+        """
+        n = 2 * self.kernel_radius + 1
+        k = 2 * np.pi * np.fft.fftfreq(n, d=self.grid_size)
+        kx, ky, kz = np.meshgrid(k, k, k, indexing='ij')
+        k2 = kx ** 2 + ky ** 2 + kz ** 2
+        # Three-dimensional von Karman spectrum of a scalar component
+        spectrum = (1.0 + k2 * self.length_scale ** 2) ** (-11.0 / 6.0)
+        kernel = np.fft.fftshift(np.real(np.fft.ifftn(np.sqrt(spectrum))))
+        kernel *= self.sigma / np.sqrt(np.sum(kernel ** 2))
+        kernel.flags.writeable = False
+        return kernel
+
+    def _noise_chunk(self, index: tuple) -> np.ndarray:
+        """
+        Unit white noise of one chunk of tile_cells**3 grid points, shape (3, c, c, c). The noise of the whole
+        grid is a deterministic function of the seed and of the chunk indices.
+        """
+        entropy = [self.seed] + [int(i) + 2 ** 31 for i in index]
+        c = self.tile_cells
+        return np.random.default_rng(np.random.SeedSequence(entropy)).standard_normal((3, c, c, c))
+
+    def _compute_tile(self, index: tuple) -> np.ndarray:
+        """
+        Wind of the tile with the given (ix, iy, iz) index, shape (3, c + 1, c + 1, c + 1) where c = tile_cells.
+        The tile includes the first points of the next tiles, so that any position inside it can be
+        interpolated from the tile alone.
+        """
+        c = self.tile_cells
+        r = self.kernel_radius
+        # Grid points needed by the valid convolution: the tile points plus the kernel radius on each side
+        lo = [i * c - r for i in index]
+        size = c + 1 + 2 * r
+        first = [l // c for l in lo]
+        last = [(l + size - 1) // c for l in lo]
+        noise = np.empty((3,) + ((last[0] - first[0] + 1) * c, (last[1] - first[1] + 1) * c,
+                                 (last[2] - first[2] + 1) * c))
+        for cx in range(first[0], last[0] + 1):
+            for cy in range(first[1], last[1] + 1):
+                for cz in range(first[2], last[2] + 1):
+                    ox, oy, oz = (cx - first[0]) * c, (cy - first[1]) * c, (cz - first[2]) * c
+                    noise[:, ox:ox + c, oy:oy + c, oz:oz + c] = self._noise_chunk((cx, cy, cz))
+        sx, sy, sz = (l - f * c for l, f in zip(lo, first))
+        block = noise[:, sx:sx + size, sy:sy + size, sz:sz + size]
+        tile = np.stack([fftconvolve(block[i], self.kernel, mode='valid') for i in range(3)])
+        tile.flags.writeable = False
+        return tile
+
+    def tile(self, index: tuple) -> np.ndarray:
+        """
+        Return a tile from the cache, computing it if needed.
+
+        Parameters:
+            index (tuple): Tile index (ix, iy, iz). Tile (ix, iy, iz) covers the positions from
+                (ix, iy, iz) * tile_cells * grid_size to (ix + 1, iy + 1, iz + 1) * tile_cells * grid_size.
+
+        Returns:
+            np.ndarray: Read-only turbulent wind of the tile, shape (3, tile_cells + 1, tile_cells + 1, tile_cells + 1).
+        """
+        tile = self._tiles.get(index)
+        if tile is not None:
+            self._tiles.move_to_end(index)
+            return tile
+        tile = self._compute_tile(index)
+        self._tiles[index] = tile
+        while len(self._tiles) > self.max_tiles:
+            self._tiles.popitem(last=False)
+        return tile
+
+    def sample(self, position, t: float = 0.0) -> np.ndarray:
+        """
+        Wind at a position, trilinearly interpolated from the grid points around it.
+
+        Parameters:
+            position (np.ndarray): Position [x, y, z] in meters.
+            t (float): Time in seconds. The turbulence is frozen and advected by the mean wind.
+
+        Returns:
+            np.ndarray: Wind [u, v, w] in m/s.
+        """
+        c = self.tile_cells
+        # Grid coordinates of the position in the frame moving with the mean wind
+        u = [(float(p) - m * t) / self.grid_size for p, m in zip(position, self.mean_wind)]
+        cell = [math.floor(v) for v in u]
+        fx, fy, fz = (v - n for v, n in zip(u, cell))
+        index = tuple(n // c for n in cell)
+        i, j, k = (n - ix * c for n, ix in zip(cell, index))
+        corners = self.tile(index)[:, i:i + 2, j:j + 2, k:k + 2]
+        corners = corners[:, 0] * (1 - fx) + corners[:, 1] * fx
+        corners = corners[:, 0] * (1 - fy) + corners[:, 1] * fy
+        return self.mean_wind + corners[:, 0] * (1 - fz) + corners[:, 1] * fz
+
+    def clear(self) -> None:
+        """
+        Drop all the cached tiles.
+        """
+        self._tiles.clear()
+
+    def __len__(self) -> int:
+        return len(self._tiles)
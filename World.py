@@ -2,12 +2,32 @@
 # Version: 2.0
 # Date: 15.07.2025
 # Description: This module defines the World class, which represents a simulated environment for a drone.
+# Area ids are stored in a dense uint8 raster over the (x, y) cells; every z layer of a column shares the same area.
 
 import json
 import pickle
+from functools import lru_cache
 import numpy as np
 from PIL import Image
 
+
+@lru_cache(maxsize=32)
+def _disk_stencil(radius, grid_size):
+    """
+    Offsets (dx, dy) of the sample points, spaced by grid_size, that lie inside a disk of the given radius.
+    Computed once per (radius, grid_size) and shared by all the queries.
+
+    Returns:
+        tuple: Two read-only 1D arrays (dx, dy).
+    """
+    offsets = np.arange(-radius, radius + 1, grid_size)
+    dx, dy = np.meshgrid(offsets, offsets, indexing='ij')
+    inside = dx ** 2 + dy ** 2 <= radius ** 2
+    dx, dy = dx[inside], dy[inside]
+    dx.flags.writeable = False
+    dy.flags.writeable = False
+    return dx, dy
+
 # ---------------- World Class ----------------
 class World:
     # Dizionario statico per mappare l'ID ai parametri dell'area
@@ -51,11 +71,15 @@ class World:
     }
     
     DEFAULT_AREA_ID = 3
+    AREA_PARAM_KEYS = ("min_altitude", "max_altitude", "noise_penalty")
 
     def __init__(self, grid_size, max_world_size, world_name="World", background_image_path=None):
         self.grid_size = grid_size
         self.max_world_size = max_world_size
-        self.grid = {}  # mapping: area coordinate tuple -> area_id
+        # Area raster indexed by (ix, iy) cell, covering the coordinates [0, max_world_size] on both axes.
+        # Z layers 0 .. max_world_size - 1 share the area of their column.
+        self.n_cells = max_world_size // grid_size + 1
+        self.area_ids = np.full((self.n_cells, self.n_cells), World.DEFAULT_AREA_ID, dtype=np.uint8)
         self.world_name = world_name
         self.background_image = None
         if background_image_path:
@@ -69,22 +93,81 @@ class World:
     def get_area(self, x, y, z):
         return (x // self.grid_size, y // self.grid_size, z // self.grid_size)
 
+    def _cell_range(self, c_1, c_2):
+        """
+        Raster slice of the cells visited by range(c_1, c_2 + 1, grid_size), clipped to the world.
+        """
+        if c_2 < c_1:
+            return slice(0, 0)
+        first = c_1 // self.grid_size
+        last = first + (c_2 - c_1) // self.grid_size
+        return slice(min(max(first, 0), self.n_cells), min(max(last + 1, 0), self.n_cells))
+
     def set_area_parameters(self, x_1, x_2, y_1, y_2, parameters):
         """
         Imposta l'ID dell'area nelle coordinate specificate.
         I parametri vengono presi dal dizionario 'parameters', che deve contenere almeno la chiave "id".
+        Le celle fuori dal mondo vengono ignorate.
         """
-        area_id = parameters["id"]
-        for x in range(x_1, x_2 + 1, self.grid_size):
-            for y in range(y_1, y_2 + 1, self.grid_size):
-                for z in range(0, self.max_world_size * self.grid_size, self.grid_size):
-                    area = self.get_area(x, y, z)
-                    self.grid[area] = area_id
+        self.area_ids[self._cell_range(x_1, x_2), self._cell_range(y_1, y_2)] = parameters["id"]
+
+    def get_area_id(self, x, y, z):
+        ix, iy, iz = self.get_area(x, y, z)
+        if 0 <= ix < self.n_cells and 0 <= iy < self.n_cells and 0 <= iz < self.max_world_size:
+            return int(self.area_ids[int(ix), int(iy)])
+        return World.DEFAULT_AREA_ID
 
     def get_area_parameters(self, x, y, z):
-        area = self.get_area(x, y, z)
-        area_id = self.grid.get(area, World.DEFAULT_AREA_ID)
-        return World.AREA_PARAMS.get(area_id, {})
+        return World.AREA_PARAMS.get(self.get_area_id(x, y, z), {})
+
+    def get_area_ids_batch(self, xs, ys, zs):
+        """
+        Vectorized area id lookup.
+
+        Parameters:
+            xs, ys, zs (array-like): Coordinates of the query points (broadcastable to a common shape).
+
+        Returns:
+            np.ndarray: uint8 array of area ids, DEFAULT_AREA_ID outside the world.
+        """
+        ix, iy, iz = (np.floor_divide(np.asarray(c), self.grid_size).astype(np.intp) for c in np.broadcast_arrays(xs, ys, zs))
+        inside = (ix >= 0) & (ix < self.n_cells) & (iy >= 0) & (iy < self.n_cells) & (iz >= 0) & (iz < self.max_world_size)
+        ids = np.full(ix.shape, World.DEFAULT_AREA_ID, dtype=np.uint8)
+        ids[inside] = self.area_ids[ix[inside], iy[inside]]
+        return ids
+
+    def get_area_parameters_batch(self, xs, ys, zs):
+        """
+        Vectorized area parameter lookup.
+
+        Parameters:
+            xs, ys, zs (array-like): Coordinates of the query points (broadcastable to a common shape).
+
+        Returns:
+            dict: Arrays with the area 'id' and the numeric parameters (min_altitude, max_altitude, noise_penalty)
+                of every query point.
+        """
+        ids = self.get_area_ids_batch(xs, ys, zs)
+        tables = World._area_param_tables()
+        params = {"id": ids}
+        for key in World.AREA_PARAM_KEYS:
+            params[key] = tables[key][ids]
+        return params
+
+    @classmethod
+    def _area_param_tables(cls):
+        """
+        Lookup arrays indexed by area id for the numeric area parameters (built once).
+        """
+        if getattr(cls, "_param_tables", None) is None:
+            size = max(cls.AREA_PARAMS) + 1
+            cls._param_tables = {}
+            for key in cls.AREA_PARAM_KEYS:
+                table = np.zeros(size)
+                for area_id, params in cls.AREA_PARAMS.items():
+                    table[area_id] = params[key]
+                cls._param_tables[key] = table
+        return cls._param_tables
 
     def get_area_center_point(self, x, y, z):
         area = self.get_area(x, y, z)
@@ -92,11 +175,73 @@ class World:
                 (area[1] + 0.5) * self.grid_size, 
                 (area[2] + 0.5) * self.grid_size)
 
+    def _circle_samples(self, x: float, y: float, radius: float, include_areas_out_of_bounds: bool) -> tuple:
+        """
+        Sample points within a circle on a grid of spacing grid_size starting at the circle bounds, clipped
+        to the world bounds unless include_areas_out_of_bounds is True. Near the borders the clipped grid is
+        aligned to 0 rather than to x - radius.
+
+        Returns:
+            tuple: Two 1D arrays (xs, ys).
+        """
+        if include_areas_out_of_bounds:
+            min_x, max_x, min_y, max_y = x - radius, x + radius, y - radius, y + radius
+        else:
+            max_coordinate = self.max_world_size * self.grid_size
+            min_x, max_x = max(0, x - radius), min(max_coordinate, x + radius)
+            min_y, max_y = max(0, y - radius), min(max_coordinate, y + radius)
+        xs, ys = np.meshgrid(np.arange(min_x, max_x + 1, self.grid_size),
+                             np.arange(min_y, max_y + 1, self.grid_size), indexing='ij')
+        xs, ys = xs.ravel(), ys.ravel()
+        inside = (xs - x) ** 2 + (ys - y) ** 2 <= radius ** 2
+        return xs[inside], ys[inside]
+
+    def get_areas_in_circle_array(self, x: float, y: float, height: float, radius: float,
+                                  include_areas_out_of_bounds: bool = False) -> tuple:
+        """
+        Array version of get_areas_in_circle: returns the area center points and area ids within a circle
+        of given radius, computed by translating a cached disk stencil (see _disk_stencil) to (x, y) and one
+        lookup into the area raster. Sample points are taken every grid_size; each one contributes the area (cell)
+        it falls in. Queries the stencil cannot reproduce exactly (fractional centers, or circles clipped to the
+        world bounds) use the sample grid of _circle_samples, so get_areas_in_circle returns the same cells as before.
+
+        Parameters:
+            x (float): X coordinate of the circle center.
+            y (float): Y coordinate of the circle center.
+            height (float): Height at which to check the areas.
+            radius (float): Radius of the circle.
+            include_areas_out_of_bounds (bool): If True, includes areas outside the world bounds.
+
+        Returns:
+            tuple: (centers, area_ids) where centers is an (M, 3) array of area center points (x, y, z)
+                and area_ids is an (M,) uint8 array.
+        """
+        if include_areas_out_of_bounds and float(x).is_integer() and float(y).is_integer():
+            # For integer centers (as used by Simulation) the cached stencil gives exactly the same points
+            dx, dy = _disk_stencil(radius, self.grid_size)
+            xs = x + dx
+            ys = y + dy
+        else:
+            xs, ys = self._circle_samples(x, y, radius, include_areas_out_of_bounds)
+
+        # Every sample point is repeated for each z layer below the requested height
+        zs = np.arange(0, height * self.grid_size, self.grid_size)
+        xs = np.repeat(xs, len(zs))
+        ys = np.repeat(ys, len(zs))
+        zs = np.tile(zs, len(xs) // max(len(zs), 1))
+
+        centers = np.empty((len(xs), 3))
+        centers[:, 0] = (np.floor_divide(xs, self.grid_size) + 0.5) * self.grid_size
+        centers[:, 1] = (np.floor_divide(ys, self.grid_size) + 0.5) * self.grid_size
+        centers[:, 2] = (np.floor_divide(zs, self.grid_size) + 0.5) * self.grid_size
+        return centers, self.get_area_ids_batch(xs, ys, zs)
+
     def get_areas_in_circle(self, x: float, y: float, height: float, radius: float, include_areas_out_of_bounds: bool = False) -> tuple:
         """
         Returns a list of area center points and their parameters within a circle of given radius.
         The circle is defined by its center (x, y) and height, and the radius is in grid units.
         If include_areas_out_of_bounds is True, areas outside the world bounds are also included.
+        See get_areas_in_circle_array for the vectorized version.
 
         Parameters:
             x (float): X coordinate of the circle center.
@@ -110,48 +255,16 @@ class World:
                 - areas_in_circle: List of area center points (x, y, z).
                 - parameters_in_circle: List of dictionaries with area parameters.
         """
-        areas_in_circle = []
-        parameters_in_circle = []
-        radius_squared = radius ** 2
-
-        # Calculate the bounds of the circle
-        if include_areas_out_of_bounds:
-            min_x = x - radius
-            max_x = x + radius
-            min_y = y - radius
-            max_y = y + radius
-        else:
-            min_x = max(0, x - radius)
-            max_x = min(self.max_world_size * self.grid_size, x + radius)
-            min_y = max(0, y - radius)
-            max_y = min(self.max_world_size * self.grid_size, y + radius)
-
-        # Create ranges for x, y, and z coordinates based on the grid size
-        x_range = np.arange(min_x, max_x + 1, self.grid_size)
-        y_range = np.arange(min_y, max_y + 1, self.grid_size)
-        z_range = np.arange(0, height * self.grid_size, self.grid_size)
-
-        # Create a meshgrid for x and y coordinates
-        x_mesh, y_mesh = np.meshgrid(x_range, y_range, indexing='ij')
-        x_flat, y_flat = x_mesh.ravel(), y_mesh.ravel()
-        distances_sq = (x_flat - x) ** 2 + (y_flat - y) ** 2
-        valid_indices = np.where(distances_sq <= radius_squared)[0]
-
-        for idx in valid_indices:
-            i, j = x_flat[idx], y_flat[idx]
-            for z in z_range:
-                area_center = self.get_area_center_point(i, j, z)
-                # Get the area parameters for the center point
-                area_params = self.get_area_parameters(i, j, z)
-                areas_in_circle.append(area_center)
-                parameters_in_circle.append(area_params)
+        centers, area_ids = self.get_areas_in_circle_array(x, y, height, radius, include_areas_out_of_bounds)
+        areas_in_circle = [tuple(center) for center in centers.tolist()]
+        parameters_in_circle = [World.AREA_PARAMS.get(area_id, {}) for area_id in area_ids.tolist()]
         return areas_in_circle, parameters_in_circle
 
     def save_world(self, filename):
         data = {
             'grid_size': self.grid_size,
             'max_world_size': self.max_world_size,
-            'grid': self.grid,
+            'area_ids': self.area_ids,
             'world_name': self.world_name,
             'background_image': self.background_image
         }
@@ -163,7 +276,22 @@ class World:
         with open(filename, 'rb') as file:
             data = pickle.load(file)
         world = cls(data['grid_size'], data['max_world_size'], data['world_name'])
-        world.grid = data['grid']
+        if 'area_ids' in data:
+            world.area_ids = np.asarray(data['area_ids'], dtype=np.uint8)
+        else:
+            world._load_legacy_grid(data['grid'])
         if data['background_image'] is not None:
             world.background_image = data['background_image']
-        return world
\ No newline at end of file
+        return world
+
+    def _load_legacy_grid(self, grid):
+        """
+        Convert the legacy dict grid {(ix, iy, iz): area_id} of old world pickles into the area raster.
+        Every z layer of a column carries the same area, so only the ground layer is read.
+        """
+        cells = [(ix, iy, area_id) for (ix, iy, iz), area_id in grid.items() if iz == 0]
+        if not cells:
+            return
+        ix, iy, area_id = np.array(cells, dtype=np.int64).T
+        inside = (ix >= 0) & (ix < self.n_cells) & (iy >= 0) & (iy < self.n_cells)
+        self.area_ids[ix[inside], iy[inside]] = area_id[inside]
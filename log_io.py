@@ -0,0 +1,76 @@
+# Author: Andrea Vaiuso
+# Version: 1.0
+# Date: 18.10.2026
+# Description: This module provides functions to save simulation logs in a columnar binary format and to load them
+# back without parsing text. A log is either a directory with one little-endian .npy file per column and a
+# metadata.json file (memory-mappable), or a single .npz archive (optionally compressed).
+
+import json
+import os
+import numpy as np
+
+LOG_FORMAT = 'drone-log'
+LOG_VERSION = 1
+METADATA_FILENAME = 'metadata.json'
+
+
+def save_log(path: str, columns: dict, metadata: dict = None, compress: bool = False) -> None:
+    """
+    Save a simulation log.
+
+    Parameters:
+        path (str): Destination. If it ends with '.npz' a single archive is written, otherwise a directory
+            with one .npy file per column and a metadata.json file.
+        columns (dict): Column names mapped to arrays with one row per logged frame (e.g. FlightRecorder.as_dict()).
+        metadata (dict): Optional JSON-serializable information (e.g. waypoints, dt, frame_skip).
+        compress (bool): If True, compress the .npz archive. Ignored for directories.
+    """
+    arrays = {name: np.ascontiguousarray(values, dtype=np.asarray(values).dtype.newbyteorder('<'))
+              for name, values in columns.items()}
+    header = {
+        'format': LOG_FORMAT,
+        'version': LOG_VERSION,
+        'columns': {name: {'shape': list(a.shape[1:]), 'dtype': a.dtype.str} for name, a in arrays.items()},
+        'n_frames': max((len(a) for a in arrays.values()), default=0),
+        'metadata': metadata or {},
+    }
+    header_json = json.dumps(header, default=float)
+
+    if path.endswith('.npz'):
+        save = np.savez_compressed if compress else np.savez
+        save(path, **arrays, **{'__metadata__': np.array(header_json)})
+        return
+
+    os.makedirs(path, exist_ok=True)
+    for name, a in arrays.items():
+        np.save(os.path.join(path, f"{name}.npy"), a)
+    with open(os.path.join(path, METADATA_FILENAME), 'w') as file:
+        file.write(header_json)
+
+
+def load_log(path: str, columns: list = None, mmap: bool = True) -> tuple:
+    """
+    Load a simulation log written by save_log.
+
+    Parameters:
+        path (str): Log directory or .npz archive.
+        columns (list): Names of the columns to load. If None, all the columns are loaded.
+        mmap (bool): If True, the columns of a log directory are returned as read-only memory maps,
+            so only the data actually accessed is read from disk. Ignored for .npz archives.
+
+    Returns:
+        tuple: (data, metadata) where data maps the column names to arrays and metadata is the
+            dictionary given to save_log.
+    """
+    if path.endswith('.npz'):
+        with np.load(path) as archive:
+            header = json.loads(str(archive['__metadata__']))
+            names = list(header['columns']) if columns is None else columns
+            data = {name: archive[name] for name in names}
+        return data, header['metadata']
+
+    with open(os.path.join(path, METADATA_FILENAME)) as file:
+        header = json.load(file)
+    names = list(header['columns']) if columns is None else columns
+    data = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r' if mmap else None) for name in names}
+    return data, header['metadata']
@@ -1,12 +1,13 @@
 import numpy as np
-from Drone import QuadcopterModel
+from Drone import QuadcopterModel, BatchQuadcopterModel
 from Controller import QuadCopterController
 from Simulation import Simulation
+from BatchSimulation import BatchSimulation
 from plotting_functions import plot3DAnimation, plotLogData
 from World import World
 from Noise.DNNModel import RotorSoundModel as DNNModel
 from Noise.EmpaModel import NoiseModel as EmpaModel
-from Rotor.TorchRotorModel import RotorModel
+from Rotor.NumpyRotorModel import get_shared_rotor_model
 import yaml
 
 
@@ -53,13 +54,13 @@ def main():
     sim.startSimulation(stop_at_target=True)
 
     # Plot 3D animation of the drone's trajectory
-    plot3DAnimation(np.array(sim.positions), 
-                    np.array(sim.angles_history), 
-                    np.array(sim.rpms_history), 
-                    np.array(sim.time_history), 
-                    np.array(sim.horiz_speed_history), 
-                    np.array(sim.vertical_speed_history), 
-                    np.array(sim.targets), 
+    plot3DAnimation(sim.positions, 
+                    sim.angles_history, 
+                    sim.rpms_history, 
+                    sim.time_history, 
+                    sim.horiz_speed_history, 
+                    sim.vertical_speed_history, 
+                    sim.targets, 
                     waypoints, 
                     start_position, 
                     float(parameters['dt']), 
@@ -67,7 +68,7 @@ def main():
     
     plotLogData(
         generate_log_dict(sim),
-        time = np.array(sim.time_history),
+        time = sim.time_history,
         waypoints = waypoints,
         ncols = 3,
     )
@@ -86,6 +87,22 @@ def load_parameters(parameters_file) -> dict:
         config = yaml.safe_load(file)
     return config
 
+def load_optimization_parameters(parameters_file) -> dict:
+    """
+    Load the configuration used by the optimization scripts: parameters_file with rotor_model_path
+    replaced by optimization_rotor_model_path when it is set.
+
+    Parameters:
+        parameters_file (str): Path to the YAML configuration file.
+
+    Returns:
+        dict: Configuration parameters.
+    """
+    parameters = load_parameters(parameters_file)
+    if parameters.get('optimization_rotor_model_path'):
+        parameters['rotor_model_path'] = parameters['optimization_rotor_model_path']
+    return parameters
+
 def create_training_waypoints() -> list:
     """
     Create a set of waypoints for training the drone.
@@ -122,7 +139,7 @@ def create_initial_state() -> dict:
         'power': 0.0,
     }
 
-def get_max_thrust_from_rotor_model(parameters) -> RotorModel:
+def get_max_thrust_from_rotor_model(parameters) -> float:
     """
     Get the maximum thrust from the rotor model based on the max RPM value and number of rotors.
 
@@ -131,8 +148,7 @@ def get_max_thrust_from_rotor_model(parameters) -> RotorModel:
     Returns:
         float: Maximum thrust value.
     """
-    rotor_model = RotorModel(norm_params_path=parameters['norm_params_path'])
-    rotor_model.load_model(parameters['rotor_model_path'])
+    rotor_model = get_shared_rotor_model(parameters['rotor_model_path'], parameters['norm_params_path'])
     thrust_max, _, _, _, _, _ = rotor_model.predict_aerodynamic(float(parameters['max_rpm']))
     return thrust_max * int(parameters['n_rotors'])
 
@@ -224,7 +240,14 @@ def create_quadcopter_model(init_state, quad_controller, parameters) -> Quadcopt
         controller=quad_controller,
         n_rotors=int(parameters['n_rotors']),  # Number of rotors
         rotor_model_path=parameters['rotor_model_path'],  # Path to the pre-trained rotor model
+        norm_params_path=parameters['norm_params_path'],  # Normalization parameters of the rotor model
         max_rpm=float(parameters['max_rpm']),  # Maximum RPM for the motors
+        aero_backend=parameters['rotor_backend'],  # 'mlp', 'mlp_batch' or 'lut'
+        lut_options={
+            'method': parameters['rotor_lut_method'],
+            'n_samples': int(parameters['rotor_lut_samples']),
+            'tolerance': parameters['rotor_lut_tolerance'],
+        },
     )
 
 def load_dnn_noise_model(parameters) -> DNNModel:
@@ -258,7 +281,7 @@ def load_empa_noise_model(parameters) -> EmpaModel:
     noise_model.load_model(parameters['empa_model_filename'])
     return noise_model
 
-def create_simulation(drone, world, waypoints, parameters, noise_model=None) -> Simulation:
+def create_simulation(drone, world, waypoints, parameters, noise_model=None, pruner=None) -> Simulation:
     """
     Create a simulation instance with the given drone, world, and waypoints.
 
@@ -267,6 +290,8 @@ def create_simulation(drone, world, waypoints, parameters, noise_model=None) ->
         world (World): The simulation world.
         waypoints (list): List of waypoints for the drone to follow.
         parameters (dict): Configuration parameters for the simulation.
+        noise_model: Optional noise model.
+        pruner (FlightPruner): Optional detector aborting the flights not worth completing.
 
     Returns:
         Simulation: Initialized simulation instance.
@@ -280,15 +305,40 @@ def create_simulation(drone, world, waypoints, parameters, noise_model=None) ->
         frame_skip=int(parameters['frame_skip']),
         target_reached_threshold=float(parameters['threshold']),
         dynamic_target_shift_threshold_distance=float(parameters['dynamic_target_shift_threshold_distance']),
-        noise_model=noise_model  # Use DNN model
-        
+        noise_model=noise_model,  # Use DNN model
+        pruner=pruner
+    )
+
+
+def create_batch_simulation(drones, world, waypoints, parameters) -> BatchSimulation:
+    """
+    Create a batched simulation flying several drones along the same waypoints in one time loop.
+
+    Parameters:
+        drones (list): QuadcopterModel instances (e.g. one per PID gain candidate).
+        world (World): The simulation world.
+        waypoints (list or CompiledPath): Waypoints shared by all the drones.
+        parameters (dict): Configuration parameters for the simulation.
+
+    Returns:
+        BatchSimulation: Initialized batched simulation instance.
+    """
+    return BatchSimulation(
+        BatchQuadcopterModel.from_models(drones),
+        world,
+        waypoints,
+        dt=float(parameters['dt']),
+        max_simulation_time=float(parameters['simulation_time']),
+        frame_skip=int(parameters['frame_skip']),
+        target_reached_threshold=float(parameters['threshold']),
+        dynamic_target_shift_threshold_distance=float(parameters['dynamic_target_shift_threshold_distance']),
     )
 
 
 def generate_log_dict(sim: Simulation) -> dict:
     return {
         'X Position': {
-            'data': np.array(sim.positions)[:, 0],
+            'data': sim.positions[:, 0],
             'ylabel': 'X (m)',
             'color': 'tab:blue',
             'linestyle': '-',
@@ -296,7 +346,7 @@ def generate_log_dict(sim: Simulation) -> dict:
             'showgrid': True
         },
         'Y Position': {
-            'data': np.array(sim.positions)[:, 1],
+            'data': sim.positions[:, 1],
             'ylabel': 'Y (m)',
             'color': 'tab:orange',
             'linestyle': '-',
@@ -304,7 +354,7 @@ def generate_log_dict(sim: Simulation) -> dict:
             'showgrid': True
         },
         'Z Position': {
-            'data': np.array(sim.positions)[:, 2],
+            'data': sim.positions[:, 2],
             'ylabel': 'Z (m)',
             'color': 'tab:green',
             'linestyle': '-',
@@ -313,9 +363,9 @@ def generate_log_dict(sim: Simulation) -> dict:
         },
         'Attitude (Pitch, Roll, Yaw)': {
             'data': {
-                'Pitch': np.array(sim.angles_history)[:, 0],
-                'Roll':  np.array(sim.angles_history)[:, 1],
-                'Yaw':   np.array(sim.angles_history)[:, 2]
+                'Pitch': sim.angles_history[:, 0],
+                'Roll':  sim.angles_history[:, 1],
+                'Yaw':   sim.angles_history[:, 2]
             },
             'ylabel': 'Angle (rad)',
             'styles': {
@@ -325,7 +375,7 @@ def generate_log_dict(sim: Simulation) -> dict:
             }
         },
         'Motor RPMs': {
-            'data': np.array(sim.rpms_history),
+            'data': sim.rpms_history,
             'ylabel': 'RPM',
             'colors': ['tab:blue', 'tab:orange', 'tab:green', 'tab:red'],
             'linestyles': ['-', '--', '-.', ':'],
@@ -333,8 +383,8 @@ def generate_log_dict(sim: Simulation) -> dict:
         },
         'Speeds': {
             'data': {
-                'Horizontal Speed': np.array(sim.horiz_speed_history),
-                'Vertical Speed':   np.array(sim.vertical_speed_history)
+                'Horizontal Speed': sim.horiz_speed_history,
+                'Vertical Speed':   sim.vertical_speed_history
             },
             'ylabel': 'Speed (m/s)',
             'styles': {
@@ -343,7 +393,7 @@ def generate_log_dict(sim: Simulation) -> dict:
             }
         },
         'Sound Pressure Level (SPL)': {
-            'data': np.array(sim.spl_history),
+            'data': sim.spl_history,
             'ylabel': 'Level (dB)',
             'color': 'orange',
             'linestyle': '-',
@@ -351,7 +401,7 @@ def generate_log_dict(sim: Simulation) -> dict:
             'showgrid': True
         },
         'Sound Power Level (SWL)': {
-            'data': np.array(sim.swl_history),
+            'data': sim.swl_history,
             'ylabel': 'Level (dB)',
             'color': 'purple',
             'linestyle': '-',
@@ -1,6 +1,15 @@
+import argparse
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 import numpy as np
-from bayes_opt import BayesianOptimization
+from bayes_opt import BayesianOptimization, acquisition
+from bayes_opt.exception import NotUniqueError
 from World import World
+from Monitors import FlightPruner
+from CompiledPath import CompiledPath
+from SimulationCache import SimulationCache, simulation_context
 import main as mainfunc
 from datetime import datetime
 from time import time
@@ -12,16 +21,72 @@ costs = []
 best_target = -float('inf')
 best_params = None
 simulation_time = 150.0 
-opt_output_path = f"Optimizations/optimization_output_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+random_state = 42
+run_timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+opt_output_path = f"Optimizations/optimization_output_{run_timestamp}.txt"
+journal_path = None  # Evaluation journal (JSON lines), set by main
 
-parameters = mainfunc.load_parameters("parameters.yaml")
+parameters = mainfunc.load_optimization_parameters("parameters.yaml")
 thrust_max = mainfunc.get_max_thrust_from_rotor_model(parameters)
 waypoints = mainfunc.create_training_waypoints()
+# Path geometry compiled once and shared by all the simulations
+compiled_path = CompiledPath(waypoints, start_position=mainfunc.create_initial_state()['pos'])
 
 world = World.load_world(parameters['world_data_path'])
 
-
-def simulate_pid(pid_gains):
+# Persistent cache of the simulation results (disabled if simulation_cache_dir is null)
+simulation_cache = None
+if parameters.get('simulation_cache_dir'):
+    simulation_cache = SimulationCache(
+        parameters['simulation_cache_dir'],
+        simulation_context(parameters, compiled_path, objective='pid_optimization', simulation_time=simulation_time),
+        max_entries=parameters.get('simulation_cache_max_entries'),
+        max_mb=parameters.get('simulation_cache_max_mb'),
+        gain_digits=int(parameters.get('simulation_cache_gain_digits', 10)))
+
+
+def simulate_pid(pid_gains, cost_bound=None):
+    """
+    Return the cost breakdown of a simulation with the given PID gains, from the simulation cache if
+    the same simulation has already been run, otherwise by running it (see run_pid_simulation).
+    Results of flights aborted by the cost bound depend on the bound, so they are not cached.
+    """
+    if simulation_cache is None:
+        return run_pid_simulation(pid_gains, cost_bound)[0]
+    key = simulation_cache.make_key(pid_gains)
+    cached = simulation_cache.get(key)
+    if cached is not None:
+        return tuple(cached['result'])
+    result, sim = run_pid_simulation(pid_gains, cost_bound)
+    if sim.prune_reason == FlightPruner.COST_BOUND:
+        return result
+    telemetry = {'positions': sim.positions} if parameters.get('simulation_cache_telemetry') else None
+    simulation_cache.put(key, {'result': result, 'pid_gains': pid_gains}, telemetry=telemetry)
+    return result
+
+
+def create_pruner(cost_bound=None):
+    """
+    Create the FlightPruner of an evaluation from the prune_* parameters, or None if pruning is disabled.
+    cost_bound is the cost above which the flight is aborted (see current_cost_bound).
+    """
+    if not parameters.get('prune_enabled', False):
+        return None
+    return FlightPruner(max_attitude=np.deg2rad(float(parameters['prune_max_attitude_deg'])),
+                        max_target_distance=float(parameters['prune_max_target_distance']),
+                        cost_bound=cost_bound)
+
+def current_cost_bound():
+    """
+    Cost above which a new evaluation is aborted: the best cost so far increased by prune_cost_margin.
+    Returns None before the first evaluation or if the cost bound pruning is disabled.
+    """
+    margin = parameters.get('prune_cost_margin')
+    if margin is None or not np.isfinite(best_target):
+        return None
+    return -best_target * (1 + float(margin))
+
+def run_pid_simulation(pid_gains, cost_bound=None):
 
     # Initial drone state
     init_state = mainfunc.create_initial_state()
@@ -32,19 +97,20 @@ def simulate_pid(pid_gains):
     drone = mainfunc.create_quadcopter_model(init_state=init_state, quad_controller=quad_controller, parameters=parameters)
 
     # Initialize the simulation
-    sim = mainfunc.create_simulation(drone=drone, world=world, waypoints=waypoints, parameters=parameters, noise_model=None)
+    sim = mainfunc.create_simulation(drone=drone, world=world, waypoints=compiled_path, parameters=parameters, noise_model=None,
+                                     pruner=create_pruner(cost_bound))
 
     # sim.setWind(max_simulation_time=simulation_time, dt=dt, height=100, airspeed=10, turbulence_level=10, plot_wind_signal=False, seed = None)
     sim.startSimulation(stop_at_target=True, verbose=False, stop_sim_if_not_moving=True)
 
+    if sim.prune_reason is not None:
+        return pruned_result(sim), sim
+
     # Collect results
-    angles = np.array(sim.angles_history)
+    angles = sim.angles_history
     final_time = sim.navigation_time if sim.navigation_time is not None else simulation_time
     
-    final_target = {'x': waypoints[-1]['x'], 'y': waypoints[-1]['y'], 'z': waypoints[-1]['z']}
-    final_distance = np.linalg.norm(sim.drone.state['pos'] - np.array([final_target['x'],
-                                                              final_target['y'],
-                                                              final_target['z']]))
+    final_distance = np.linalg.norm(sim.drone.state['pos'] - compiled_path.final_target)
 
     pitch_osc = np.sum(np.abs(np.diff(angles[:, 0]))) # Pitch oscillation calculated as the sum of absolute differences in pitch angles
     roll_osc  = np.sum(np.abs(np.diff(angles[:, 1]))) # Roll oscillation calculated as the sum of absolute differences in roll angles
@@ -55,41 +121,170 @@ def simulate_pid(pid_gains):
     if not sim.has_moved: cost += 1000
     elif not sim.has_reached_target: cost += 1000
 
-    return cost, final_time, final_distance, pitch_osc, roll_osc, thrust_osc, sim.has_reached_target
+    result = (float(cost), float(final_time), float(final_distance), float(pitch_osc), float(roll_osc),
+              float(thrust_osc), bool(sim.has_reached_target), None)
+    return result, sim
+
+def pruned_result(sim):
+    """
+    Cost breakdown of a flight aborted by its pruner, from the oscillations accumulated until the abort.
+    A flight aborted by the cost bound is registered with its partial cost, the elapsed time plus the weighted
+    oscillations so far: the cost of the complete flight cannot be lower, and no distance or not-reached term
+    is guessed for it. An unstable flight (NaN state, attitude blow-up, divergence) would not reach the target,
+    so it gets the cost of a flight that does not reach it: the whole simulation time, the distance from where
+    it was aborted, the oscillations so far and the not-reached term, with no extra penalty.
+    """
+    pruner = sim.pruner
+    pos = sim.drone.state['pos']
+    if not np.all(np.isfinite(pos)):
+        pos = compiled_path.start_position
+    final_distance = np.linalg.norm(pos - compiled_path.final_target)
+    osc_cost = pruner.osc_weight * (pruner.pitch_osc + pruner.roll_osc + pruner.thrust_osc)
+
+    if sim.prune_reason == FlightPruner.COST_BOUND:
+        final_time = sim.navigation_time
+        cost = pruner.partial_cost
+    else:
+        final_time = simulation_time
+        cost = final_time + (final_distance ** 0.9) + osc_cost + 1000
+    return (float(cost), float(final_time), float(final_distance), float(pruner.pitch_osc), float(pruner.roll_osc),
+            float(pruner.thrust_osc), False, sim.prune_reason)
+
+def make_pid_gains(params: dict) -> dict:
+    """
+    Build the full PID gains dictionary from the optimized gains, adding the fixed yaw gains.
+    """
+    return {
+        'kp_pos': params['kp_pos'], 'ki_pos': params['ki_pos'], 'kd_pos': params['kd_pos'],
+        'kp_alt': params['kp_alt'], 'ki_alt': params['ki_alt'], 'kd_alt': params['kd_alt'],
+        'kp_att': params['kp_att'], 'ki_att': params['ki_att'], 'kd_att': params['kd_att'],
+        'kp_yaw': 0.5, 'ki_yaw': 1e-6, 'kd_yaw': 0.1,  # Fixed yaw PID gains
+        'kp_hsp': params['kp_hsp'], 'ki_hsp': params['ki_hsp'], 'kd_hsp': params['kd_hsp'],
+        'kp_vsp': params['kp_vsp'], 'ki_vsp': params['ki_vsp'], 'kd_vsp': params['kd_vsp']
+    }
 
-def objective(kp_pos, ki_pos, kd_pos,
-              kp_alt, ki_alt, kd_alt,
-              kp_att, ki_att, kd_att,
-              kp_hsp, ki_hsp, kd_hsp,
-              kp_vsp, ki_vsp, kd_vsp):
+def evaluate_gains(params: dict, cost_bound=None) -> tuple:
+    """
+    Run the simulation for a candidate (optimized gains only). This is the function executed by the workers.
+    Returns (result, wall_time) where result is the tuple returned by simulate_pid and wall_time the
+    duration of the evaluation in seconds. The flight is aborted early if its partial cost exceeds cost_bound.
+    """
+    t_0 = time()
+    result = simulate_pid(pid_gains=make_pid_gains(params), cost_bound=cost_bound)
+    return result, time() - t_0
+
+def append_to_journal(params: dict, result: tuple, wall_time: float) -> None:
+    """
+    Append an evaluation to the journal as soon as it is available. Each line is a JSON object with the
+    candidate gains, the cost breakdown, the wall time and the seed of the optimizer.
+    """
+    if journal_path is None:
+        return
+    cost, final_time, final_distance, pitch_osc, roll_osc, thrust_osc, targ_reached, prune_reason = result
+    record = {
+        'iteration': iteration,
+        'params': {k: float(v) for k, v in params.items()},
+        'target': -float(cost),
+        'cost': float(cost),
+        'final_time': float(final_time),
+        'final_distance': float(final_distance),
+        'pitch_osc': float(pitch_osc),
+        'roll_osc': float(roll_osc),
+        'thrust_osc': float(thrust_osc),
+        'target_reached': bool(targ_reached),
+        'prune_reason': prune_reason,
+        'wall_time': float(wall_time),
+        'seed': random_state,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+    }
+    with open(journal_path, 'a') as f:
+        f.write(json.dumps(record) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+def read_journal(path: str) -> list:
+    """
+    Read the evaluations stored in a journal. A truncated last line (e.g. left by a crash while writing) is ignored.
+    """
+    records = []
+    with open(path) as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                print(f"Skipping incomplete journal line: {line.strip()[:80]}")
+    return records
+
+def replay_journal(optimizer: BayesianOptimization, path: str) -> int:
+    """
+    Register the evaluations of a journal into the optimizer and restore the best-so-far bookkeeping.
+    Returns the replayed journal records.
+    """
+    global iteration, best_target, best_params
+
+    records = read_journal(path)
+    # Terminate a truncated last line, so that the next evaluations are appended on lines of their own
+    with open(path, 'rb+') as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+    for record in records:
+        try:
+            optimizer.register(params=record['params'], target=record['target'])
+        except NotUniqueError:
+            pass
+        iteration += 1
+        if record['target'] > best_target:
+            best_target = record['target']
+            best_params = make_pid_gains(record['params'])
+            best_params.update({'final_time': record['final_time'], 'cost': record['cost']})
+    print(f"Resumed {len(records)} evaluations from {path}, best target={best_target:.4f}")
+    return records
+
+def match_initial_points(init_points, records, rel_tol: float = 1e-9):
+    """
+    Split the records of a resumed journal into evaluations of the initial points and optimizer suggestions.
+    With several workers the journal is written in completion order and mixes both kinds, so every record is
+    matched to an initial point by its gains (within rel_tol), not by its position in the journal.
+
+    Parameters:
+        init_points (list): Initial candidates of the campaign (dicts of gains).
+        records (list): Journal records (see read_journal).
+        rel_tol (float): Relative tolerance of the comparison of the gains.
+
+    Returns:
+        tuple: The initial candidates not evaluated yet, and the number of records that are optimizer suggestions.
+    """
+    pending = list(init_points)
+    n_suggested = 0
+    for record in records:
+        for i, params in enumerate(pending):
+            if all(math.isclose(record['params'].get(k, math.nan), v, rel_tol=rel_tol) for k, v in params.items()):
+                del pending[i]
+                break
+        else:
+            n_suggested += 1
+    return pending, n_suggested
+
+def record_evaluation(params: dict, result: tuple, wall_time: float = 0.0) -> float:
+    """
+    Update the best-so-far bookkeeping with the result of an evaluation, append it to the journal,
+    print the progress and return the target for the optimizer.
+    """
     global iteration, best_target, best_params
 
     iteration += 1
-    cost, final_time, final_distance, pitch_osc, roll_osc, thrust_osc, targ_reached = simulate_pid(
-        pid_gains={
-        'kp_pos': kp_pos, 'ki_pos': ki_pos, 'kd_pos': kd_pos,
-        'kp_alt': kp_alt, 'ki_alt': ki_alt, 'kd_alt': kd_alt,
-        'kp_att': kp_att, 'ki_att': ki_att, 'kd_att': kd_att,
-        'kp_yaw': 0.5, 'ki_yaw': 1e-6, 'kd_yaw': 0.1,  # Fixed yaw PID gains
-        'kp_hsp': kp_hsp, 'ki_hsp': ki_hsp, 'kd_hsp': kd_hsp,
-        'kp_vsp': kp_vsp, 'ki_vsp': ki_vsp, 'kd_vsp': kd_vsp
-    }
-    )
+    append_to_journal(params, result, wall_time)
+    cost, final_time, final_distance, pitch_osc, roll_osc, thrust_osc, targ_reached, prune_reason = result
     target = -cost  # bayes_opt massimizza
 
     # se questo target è migliore del best-so-far, aggiorna file
     if target > best_target:
         best_target = target
-        best_params = {
-            'kp_pos': kp_pos, 'ki_pos': ki_pos, 'kd_pos': kd_pos,
-            'kp_alt': kp_alt, 'ki_alt': ki_alt, 'kd_alt': kd_alt,
-            'kp_att': kp_att, 'ki_att': ki_att, 'kd_att': kd_att,
-            'kp_yaw': 0.5, 'ki_yaw': 1e-6, 'kd_yaw': 0.1,  # Fixed yaw PID gains
-            'kp_hsp': kp_hsp, 'ki_hsp': ki_hsp, 'kd_hsp': kd_hsp,
-            'kp_vsp': kp_vsp, 'ki_vsp': ki_vsp, 'kd_vsp': kd_vsp,
-            'final_time': final_time,
-            'cost': cost
-        }
+        best_params = make_pid_gains(params)
+        best_params.update({'final_time': final_time, 'cost': cost})
         # scrivi su file
         with open("opt_temp.txt", 'w') as f:
             f.write(f"Iteration: {iteration}\n")
@@ -97,16 +292,100 @@ def objective(kp_pos, ki_pos, kd_pos,
                 f.write(f"{k}: {v}\n")
             f.write(f"target = {best_target}\n")
 
-    print(f"{iteration}/{n_iter}: cost={cost:.4f}, best target={best_target:.4f}, final_time={final_time:.2f}s, final_distance={final_distance:.2f}m, pitch_osc={pitch_osc:.2f}, roll_osc={roll_osc:.2f}, thrust_osc={thrust_osc:.2f}, target_reached={targ_reached}")
+    print(f"{iteration}/{n_iter}: cost={cost:.4f}, best target={best_target:.4f}, final_time={final_time:.2f}s, final_distance={final_distance:.2f}m, pitch_osc={pitch_osc:.2f}, roll_osc={roll_osc:.2f}, thrust_osc={thrust_osc:.2f}, target_reached={targ_reached}"
+          + (f", pruned={prune_reason}" if prune_reason else ""))
     return target
 
+def objective(kp_pos, ki_pos, kd_pos,
+              kp_alt, ki_alt, kd_alt,
+              kp_att, ki_att, kd_att,
+              kp_hsp, ki_hsp, kd_hsp,
+              kp_vsp, ki_vsp, kd_vsp):
+    params = {
+        'kp_pos': kp_pos, 'ki_pos': ki_pos, 'kd_pos': kd_pos,
+        'kp_alt': kp_alt, 'ki_alt': ki_alt, 'kd_alt': kd_alt,
+        'kp_att': kp_att, 'ki_att': ki_att, 'kd_att': kd_att,
+        'kp_hsp': kp_hsp, 'ki_hsp': ki_hsp, 'kd_hsp': kd_hsp,
+        'kp_vsp': kp_vsp, 'ki_vsp': ki_vsp, 'kd_vsp': kd_vsp
+    }
+    return record_evaluation(params, *evaluate_gains(params, current_cost_bound()))
+
+def _init_worker():
+    """
+    Initializer of the worker processes. Parameters, world and waypoints are loaded when this module is
+    imported; building a drone once here also loads the shared rotor model (and lookup table) caches,
+    so that every evaluation of the worker reuses them.
+    """
+    init_state = mainfunc.create_initial_state()
+    quad_controller = mainfunc.create_quadcopter_controller(init_state=init_state, pid_gains=mainfunc.load_pid_gains(parameters), t_max=thrust_max, parameters=parameters)
+    mainfunc.create_quadcopter_model(init_state=init_state, quad_controller=quad_controller, parameters=parameters)
+
+def maximize_parallel(optimizer: BayesianOptimization, init_points, n_iter: int,
+                      workers: int, batch_size: int):
+    """
+    Run the optimization evaluating up to batch_size candidates concurrently on a pool of worker processes.
+    The initial candidates are evaluated first; the following ones are suggested by the optimizer, whose
+    ConstantLiar acquisition accounts for the candidates still being evaluated.
+    As soon as an evaluation finishes its result is registered and a new candidate is submitted.
+
+    Parameters:
+        optimizer (BayesianOptimization): Optimizer created with f=None and a ConstantLiar acquisition function.
+        init_points (list): Initial candidates (e.g. random samples from optimizer.random_sample).
+        n_iter (int): Number of candidates suggested by the optimizer.
+        workers (int): Number of worker processes.
+        batch_size (int): Maximum number of candidates evaluated at the same time.
+    """
+    init_points = list(init_points)
+    total = len(init_points) + n_iter
+    submitted = 0
+    pending = {}
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        while submitted < total or pending:
+            # Fill the batch with new candidates
+            while submitted < total and len(pending) < batch_size:
+                if submitted < len(init_points):
+                    params = init_points[submitted]
+                else:
+                    params = optimizer.suggest()
+                pending[pool.submit(evaluate_gains, params, current_cost_bound())] = params
+                submitted += 1
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                params = pending.pop(future)
+                optimizer.register(params=params, target=record_evaluation(params, *future.result()))
+
 def seconds_to_hhmmss(seconds):
     hours = int(seconds // 3600)
     minutes = int((seconds % 3600) // 60)
     secs = int(seconds % 60)
     return f"{hours:02}:{minutes:02}:{secs:02}"
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Bayesian optimization of the drone PID gains.")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Number of worker processes evaluating candidates in parallel (default: 1, sequential).")
+    parser.add_argument('--batch-size', type=int, default=None,
+                        help="Number of candidates evaluated concurrently (default: number of workers).")
+    parser.add_argument('--n-iter', type=int, default=n_iter, help=f"Number of optimizer iterations (default: {n_iter}).")
+    parser.add_argument('--init-points', type=int, default=50, help="Number of initial random points (default: 50).")
+    parser.add_argument('--liar-strategy', default='max',
+                        help="Constant liar value for pending candidates: 'min', 'mean', 'max' or a number (default: 'max').")
+    parser.add_argument('--journal', default=None,
+                        help="Path of the evaluation journal (default: Optimizations/journal_<timestamp>.jsonl).")
+    parser.add_argument('--resume', default=None, metavar='JOURNAL',
+                        help="Resume a campaign: replay the evaluations of this journal into the optimizer "
+                             "and keep appending to it.")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    global n_iter, journal_path
+    args = parse_args(argv)
+    n_iter = args.n_iter
+    batch_size = args.batch_size if args.batch_size is not None else args.workers
+    journal_path = args.resume or args.journal or f"Optimizations/journal_{run_timestamp}.jsonl"
+
     # Define the bounds for the optimization variables
     pbounds = {
         'kp_pos': (1e-6, 1e3), 
@@ -154,21 +433,50 @@ def main():
     start_time = time()
     print("Starting optimization...")
 
-    optimizer = BayesianOptimization(
-        f=objective,
-        pbounds=pbounds,
-        random_state=42,
-    )
+    if args.workers > 1 or batch_size > 1:
+        try:
+            liar_strategy = float(args.liar_strategy)
+        except ValueError:
+            liar_strategy = args.liar_strategy
+        optimizer = BayesianOptimization(
+            f=None,
+            pbounds=pbounds,
+            acquisition_function=acquisition.ConstantLiar(
+                base_acquisition=acquisition.UpperConfidenceBound(kappa=2.576), strategy=liar_strategy),
+            random_state=random_state,
+            allow_duplicate_points=True,
+        )
+    else:
+        optimizer = BayesianOptimization(
+            f=objective,
+            pbounds=pbounds,
+            random_state=random_state,
+        )
 
     # optimizer.probe(
     #     params=init_guess,
     #     lazy=True,
     # )
 
-    optimizer.maximize(
-        init_points=50,
-        n_iter=n_iter,
-    )
+    # The initial random points are drawn first from the freshly seeded optimizer, so a resumed campaign
+    # gets the same sequence and only evaluates the ones that are not in the journal yet
+    init_points = optimizer.random_sample(args.init_points)
+    records = replay_journal(optimizer, args.resume) if args.resume else []
+    init_points, n_suggested = match_initial_points(init_points, records)
+    remaining_iter = max(0, n_iter - n_suggested)
+    print(f"Writing evaluation journal to {journal_path}")
+
+    if args.workers > 1 or batch_size > 1:
+        print(f"Evaluating batches of {batch_size} candidates on {args.workers} worker processes.")
+        maximize_parallel(optimizer, init_points=init_points, n_iter=remaining_iter,
+                          workers=args.workers, batch_size=batch_size)
+    else:
+        for params in init_points:
+            optimizer.probe(params=params, lazy=True)
+        optimizer.maximize(
+            init_points=0,
+            n_iter=remaining_iter,
+        )
     tot_time = time() - start_time
     print(f"Optimization completed in {tot_time:.2f} seconds.")
     print("Best parameters found:")
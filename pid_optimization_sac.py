@@ -5,29 +5,123 @@ environment in which the action space corresponds to the PID gains of the drone
 controller. Each episode runs a full drone simulation with the chosen gains and
 returns a reward based on the final cost. The reward is the negative of the cost
 used in the Bayesian optimization script.
+
+Training can use several environments at once (--n-envs). By default (--vec-env dummy)
+every environment flies its gains with Simulation, one after the other; with
+--vec-env subproc every environment runs its simulations in its own process. With
+--vec-env batch the gains proposed by all the environments are flown together in one
+BatchSimulation: faster, but its dynamics are not bit-identical to Simulation, so its
+costs differ from those of the other modes (see BatchQuadcopterModel).
 """
 
 from __future__ import annotations
 
+import argparse
+
 import numpy as np
 import gymnasium as gym
 from gymnasium import spaces
 from stable_baselines3 import SAC
+from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv
 
 import main as mainfunc
 from World import World
+from CompiledPath import CompiledPath
+from SimulationCache import SimulationCache, simulation_context
 
 # Load parameters and world data only once
-parameters = mainfunc.load_parameters("parameters.yaml")
+parameters = mainfunc.load_optimization_parameters("parameters.yaml")
 thrust_max = mainfunc.get_max_thrust_from_rotor_model(parameters)
 waypoints = mainfunc.create_training_waypoints()
+# Path geometry compiled once and shared by all the simulations
+compiled_path = CompiledPath(waypoints, start_position=mainfunc.create_initial_state()['pos'])
 world = World.load_world(parameters['world_data_path'])
 
 SIMULATION_TIME = float(parameters.get('simulation_time', 150.0))
 
 
+def open_simulation_cache(backend: str):
+    """
+    Open the persistent cache of the simulation results of one backend, or return None if simulation_cache_dir
+    is null. The batched dynamics are not bit-identical to Simulation and the flights are chaotic, so the same
+    gains can give a navigation time differing by seconds: 'serial' (Simulation) and 'batch' (BatchSimulation)
+    results are kept under different keys.
+    """
+    if not parameters.get('simulation_cache_dir'):
+        return None
+    return SimulationCache(
+        parameters['simulation_cache_dir'],
+        simulation_context(parameters, compiled_path, objective='pid_optimization_sac', simulation_time=SIMULATION_TIME,
+                           backend=backend),
+        max_entries=parameters.get('simulation_cache_max_entries'),
+        max_mb=parameters.get('simulation_cache_max_mb'),
+        gain_digits=int(parameters.get('simulation_cache_gain_digits', 10)),
+    )
+
+
+simulation_cache = open_simulation_cache('serial')
+batch_simulation_cache = open_simulation_cache('batch')
+
+
 def simulate_pid(pid_gains: dict) -> tuple[float, float, float, float, float, float, bool]:
-    """Run the simulation using the provided PID gains and return cost metrics."""
+    """Return the cost metrics for the provided PID gains, from the simulation cache when available."""
+    if simulation_cache is None:
+        return run_pid_simulation(pid_gains)[0]
+    key = simulation_cache.make_key(pid_gains)
+    cached = simulation_cache.get(key)
+    if cached is not None:
+        return tuple(cached['result'])
+    result, sim = run_pid_simulation(pid_gains)
+    telemetry = {'positions': sim.positions} if parameters.get('simulation_cache_telemetry') else None
+    simulation_cache.put(key, {'result': result, 'pid_gains': pid_gains}, telemetry=telemetry)
+    return result
+
+
+def simulate_pid_batch(gains_list: list[dict]) -> list[tuple]:
+    """Return the cost metrics for several PID gain sets, flying all the uncached ones in one batched simulation."""
+    results = [None] * len(gains_list)
+    keys = [None] * len(gains_list)
+    if batch_simulation_cache is not None:
+        for i, pid_gains in enumerate(gains_list):
+            keys[i] = batch_simulation_cache.make_key(pid_gains)
+            cached = batch_simulation_cache.get(keys[i])
+            if cached is not None:
+                results[i] = tuple(cached['result'])
+    missing = [i for i, result in enumerate(results) if result is None]
+    if not missing:
+        return results
+
+    batch_results, sim = run_pid_batch_simulation([gains_list[i] for i in missing])
+    for lane, i in enumerate(missing):
+        results[i] = batch_results[lane]
+        if batch_simulation_cache is not None:
+            telemetry = None
+            if parameters.get('simulation_cache_telemetry'):
+                telemetry = {'positions': sim.get_drone_history(lane)['positions']}
+            batch_simulation_cache.put(keys[i], {'result': results[i], 'pid_gains': gains_list[i]}, telemetry=telemetry)
+    return results
+
+
+def pid_cost(final_time: float, final_distance: float, angles: np.ndarray, thrust_history: np.ndarray,
+             has_moved: bool, has_reached_target: bool) -> tuple:
+    """Compute the cost metrics of a flight from its logged angles and thrust."""
+    pitch_osc = np.sum(np.abs(np.diff(angles[:, 0])))
+    roll_osc = np.sum(np.abs(np.diff(angles[:, 1])))
+    thrust_osc = np.sum(np.abs(np.diff(thrust_history))) * 1e-5
+    osc_weight = 3.0
+
+    cost = final_time + (final_distance ** 0.9) + osc_weight * (pitch_osc + roll_osc + thrust_osc)
+    if not has_moved:
+        cost += 1000
+    elif not has_reached_target:
+        cost += 1000
+
+    return (float(cost), float(final_time), float(final_distance), float(pitch_osc), float(roll_osc),
+            float(thrust_osc), bool(has_reached_target))
+
+
+def create_drone(pid_gains: dict):
+    """Create a drone (model and controller) flying with the provided PID gains."""
     init_state = mainfunc.create_initial_state()
     quad_controller = mainfunc.create_quadcopter_controller(
         init_state=init_state,
@@ -35,39 +129,78 @@ def simulate_pid(pid_gains: dict) -> tuple[float, float, float, float, float, fl
         t_max=thrust_max,
         parameters=parameters,
     )
-    drone = mainfunc.create_quadcopter_model(
+    return mainfunc.create_quadcopter_model(
         init_state=init_state,
         quad_controller=quad_controller,
         parameters=parameters,
     )
+
+
+def run_pid_batch_simulation(gains_list: list[dict]) -> tuple:
+    """Fly all the provided PID gain sets in one BatchSimulation and return (list of cost metrics, simulation)."""
+    sim = mainfunc.create_batch_simulation(
+        drones=[create_drone(pid_gains) for pid_gains in gains_list],
+        world=world,
+        waypoints=compiled_path,
+        parameters=parameters,
+    )
+    sim.startSimulation(stop_at_target=True, verbose=False, stop_sim_if_not_moving=True)
+
+    results = []
+    for i in range(len(gains_list)):
+        history = sim.get_drone_history(i)
+        final_time = sim.navigation_time[i] if not np.isnan(sim.navigation_time[i]) else SIMULATION_TIME
+        final_distance = np.linalg.norm(sim.drone.pos[i] - compiled_path.final_target)
+        results.append(pid_cost(final_time, final_distance, history['angles_history'], history['thrust_history'],
+                                sim.has_moved[i], sim.has_reached_target[i]))
+    return results, sim
+
+
+def run_pid_simulation(pid_gains: dict) -> tuple:
+    """Run the simulation using the provided PID gains and return (cost metrics, simulation)."""
     sim = mainfunc.create_simulation(
-        drone=drone,
+        drone=create_drone(pid_gains),
         world=world,
-        waypoints=waypoints,
+        waypoints=compiled_path,
         parameters=parameters,
         noise_model=None,
     )
 
     sim.startSimulation(stop_at_target=True, verbose=False, stop_sim_if_not_moving=True)
 
-    angles = np.array(sim.angles_history)
     final_time = sim.navigation_time if sim.navigation_time is not None else SIMULATION_TIME
-    final_target = waypoints[-1]
     final_distance = np.linalg.norm(
-        sim.drone.state['pos'] - np.array([final_target['x'], final_target['y'], final_target['z']])
+        sim.drone.state['pos'] - compiled_path.final_target
     )
-    pitch_osc = np.sum(np.abs(np.diff(angles[:, 0])))
-    roll_osc = np.sum(np.abs(np.diff(angles[:, 1])))
-    thrust_osc = np.sum(np.abs(np.diff(sim.thrust_history))) * 1e-5
-    osc_weight = 3.0
+    result = pid_cost(final_time, final_distance, sim.angles_history, sim.thrust_history,
+                      sim.has_moved, sim.has_reached_target)
+    return result, sim
 
-    cost = final_time + (final_distance ** 0.9) + osc_weight * (pitch_osc + roll_osc + thrust_osc)
-    if not sim.has_moved:
-        cost += 1000
-    elif not sim.has_reached_target:
-        cost += 1000
 
-    return cost, final_time, final_distance, pitch_osc, roll_osc, thrust_osc, sim.has_reached_target
+def gains_from_action(action: np.ndarray) -> dict:
+    """Map an action of the environment to the PID gains of the controller."""
+    return {
+        'kp_pos': float(action[0]), 'ki_pos': float(action[1]), 'kd_pos': float(action[2]),
+        'kp_alt': float(action[3]), 'ki_alt': float(action[4]), 'kd_alt': float(action[5]),
+        'kp_att': float(action[6]), 'ki_att': float(action[7]), 'kd_att': float(action[8]),
+        'kp_yaw': 0.5, 'ki_yaw': 1e-6, 'kd_yaw': 0.1,
+        'kp_hsp': float(action[9]), 'ki_hsp': float(action[10]), 'kd_hsp': float(action[11]),
+        'kp_vsp': float(action[9]), 'ki_vsp': float(action[10]), 'kd_vsp': float(action[11]),
+    }
+
+
+def step_result(result: tuple) -> tuple:
+    """Convert the cost metrics of a simulation to the (reward, info) of an environment step."""
+    cost, final_time, final_distance, pitch_osc, roll_osc, thrust_osc, reached = result
+    info = {
+        'final_time': final_time,
+        'final_distance': final_distance,
+        'pitch_osc': pitch_osc,
+        'roll_osc': roll_osc,
+        'thrust_osc': thrust_osc,
+        'target_reached': reached,
+    }
+    return -cost, info
 
 
 class PIDGainEnv(gym.Env):
@@ -87,35 +220,74 @@ class PIDGainEnv(gym.Env):
         return np.zeros(1, dtype=np.float32), {}
 
     def step(self, action: np.ndarray):  # type: ignore[override]
-        gains = {
-            'kp_pos': float(action[0]), 'ki_pos': float(action[1]), 'kd_pos': float(action[2]),
-            'kp_alt': float(action[3]), 'ki_alt': float(action[4]), 'kd_alt': float(action[5]),
-            'kp_att': float(action[6]), 'ki_att': float(action[7]), 'kd_att': float(action[8]),
-            'kp_yaw': 0.5, 'ki_yaw': 1e-6, 'kd_yaw': 0.1,
-            'kp_hsp': float(action[9]), 'ki_hsp': float(action[10]), 'kd_hsp': float(action[11]),
-            'kp_vsp': float(action[9]), 'ki_vsp': float(action[10]), 'kd_vsp': float(action[11]),
-        }
-        cost, final_time, final_distance, pitch_osc, roll_osc, thrust_osc, reached = simulate_pid(gains)
-        reward = -cost
-        info = {
-            'final_time': final_time,
-            'final_distance': final_distance,
-            'pitch_osc': pitch_osc,
-            'roll_osc': roll_osc,
-            'thrust_osc': thrust_osc,
-            'target_reached': reached,
-        }
+        reward, info = step_result(simulate_pid(gains_from_action(action)))
         observation = np.zeros(1, dtype=np.float32)
         terminated = True
         truncated = False
         return observation, reward, terminated, truncated, info
 
 
-def main():
-    env = PIDGainEnv()
+class BatchPIDGainVecEnv(DummyVecEnv):
+    """Vectorized PIDGainEnv: the actions of all the environments are flown together in one BatchSimulation."""
+
+    def __init__(self, n_envs: int):
+        super().__init__([PIDGainEnv for _ in range(n_envs)])
+
+    def step_wait(self):  # type: ignore[override]
+        results = simulate_pid_batch([gains_from_action(action) for action in self.actions])
+        for env_idx, result in enumerate(results):
+            self.buf_rews[env_idx], self.buf_infos[env_idx] = step_result(result)
+            # Every episode is a single step: save the final observation and reset the environment
+            self.buf_dones[env_idx] = True
+            self.buf_infos[env_idx]['TimeLimit.truncated'] = False
+            self.buf_infos[env_idx]['terminal_observation'] = np.zeros(1, dtype=np.float32)
+            obs, self.reset_infos[env_idx] = self.envs[env_idx].reset()
+            self._save_obs(env_idx, obs)
+        return self._obs_from_buf(), np.copy(self.buf_rews), np.copy(self.buf_dones), [dict(i) for i in self.buf_infos]
+
+
+def make_vec_env(n_envs: int, vec_env: str = 'dummy'):
+    """
+    Create the training environments.
+
+    Parameters:
+        n_envs (int): Number of environments, i.e. of gain sets evaluated at every step.
+        vec_env (str): 'dummy' to run the environments one after the other (default), 'subproc' to run every
+            environment in its own process, or 'batch' to fly all the gain sets in one BatchSimulation
+            (faster, but not bit-identical to Simulation).
+
+    Returns:
+        VecEnv: The vectorized environment.
+    """
+    if vec_env == 'batch':
+        return BatchPIDGainVecEnv(n_envs)
+    if vec_env == 'subproc':
+        return SubprocVecEnv([PIDGainEnv for _ in range(n_envs)])
+    if vec_env == 'dummy':
+        return DummyVecEnv([PIDGainEnv for _ in range(n_envs)])
+    raise ValueError(f"Unknown vectorized environment '{vec_env}'.")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="SAC optimization of the drone PID gains.")
+    parser.add_argument('--n-envs', type=int, default=1,
+                        help="Number of environments, i.e. of gain sets simulated at every step (default: 1).")
+    parser.add_argument('--vec-env', choices=['dummy', 'subproc', 'batch'], default='dummy',
+                        help="How the environments are simulated: sequentially, in one process each, or together "
+                             "in one batched simulation whose costs are not bit-identical to the others "
+                             "(default: dummy).")
+    parser.add_argument('--total-timesteps', type=int, default=10,
+                        help="Number of environment steps (simulations) to train for (default: 10).")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    env = make_vec_env(args.n_envs, args.vec_env)
     model = SAC('MlpPolicy', env, verbose=1)
     # This is just a demonstration run; adjust timesteps as needed
-    model.learn(total_timesteps=10)
+    model.learn(total_timesteps=args.total_timesteps)
+    env.close()
 
 
 if __name__ == '__main__':
@@ -1,13 +1,15 @@
 # Author: Andrea Vaiuso
 # Version: 2.0
 # Date: 15.07.2025
-# Description: This module provides functions for plotting simulation data, saving log data to CSV,
+# Description: This module provides functions for plotting simulation data, saving log data (CSV or columnar binary),
 # and creating 3D animations of a drone's trajectory and attitude over time.
 
+import os
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 import numpy as np
 from utils import euler_to_rot
+from log_io import save_log
 
 def plotLogData(log_dict, time, waypoints=None, ncols=2):
     """
@@ -58,7 +60,7 @@ def plotLogData(log_dict, time, waypoints=None, ncols=2):
                              s.get('color'),
                              s.get('linestyle'))
         else:
-            arr = np.array(data)
+            arr = np.asarray(data)
             if arr.ndim == 1:
                 _plot_series(time, arr,
                              spec.get('label', title),
@@ -101,10 +103,38 @@ def plotLogData(log_dict, time, waypoints=None, ncols=2):
 
 
 
-def saveLogData(positions, angles_history, rpms_history, time_history, horiz_speed_history, vertical_speed_history, spl_history, swl_history, waypoints, filename):
+def saveLogData(positions, angles_history, rpms_history, time_history, horiz_speed_history, vertical_speed_history, spl_history, swl_history, waypoints, filename, format=None):
     """
-    Save the drone simulation data to a CSV file.
+    Save the drone simulation data.
+    By default the data is exported as a CSV file with pandas, and the waypoints, which are not one per frame,
+    are written to a separate CSV file next to it (<filename without extension>_waypoints.csv).
+    With format='binary', or if filename ends with '.npz', the data is written with log_io.save_log instead
+    (a directory of .npy columns, or a .npz archive), which can be read back with log_io.load_log; the waypoints
+    are stored in the log metadata.
+
+    Parameters:
+        filename (str): Output file (or directory, for the binary format without the .npz extension).
+        format (str): 'csv' or 'binary'. Default: 'binary' if filename ends with '.npz', 'csv' otherwise.
     """
+    if format is None:
+        format = 'binary' if filename.endswith('.npz') else 'csv'
+    if format not in ('csv', 'binary'):
+        raise ValueError(f"Unknown log format '{format}'. Use 'csv' or 'binary'.")
+
+    if format == 'binary':
+        save_log(filename, {
+            'time': np.asarray(time_history),
+            'position': np.asarray(positions),
+            'angles': np.asarray(angles_history),
+            'rpm': np.asarray(rpms_history),
+            'horiz_speed': np.asarray(horiz_speed_history),
+            'vertical_speed': np.asarray(vertical_speed_history),
+            'spl': np.asarray(spl_history),
+            'swl': np.asarray(swl_history),
+        }, metadata={'waypoints': [{k: wp[k] for k in ('x', 'y', 'z', 'v') if k in wp} for wp in waypoints]})
+        print(f"Data saved to {filename}")
+        return
+
     import pandas as pd
 
     data = {
@@ -123,12 +153,13 @@ def saveLogData(positions, angles_history, rpms_history, time_history, horiz_spe
         'Vertical Speed': vertical_speed_history,
         'SPL': spl_history,
         'SWL': swl_history,
-        'Waypoints': [f"{wp['x']},{wp['y']},{wp['z']}" for wp in waypoints]
     }
 
     df = pd.DataFrame(data)
     df.to_csv(filename, index=False)
-    print(f"Data saved to {filename}")
+    waypoints_filename = os.path.splitext(filename)[0] + '_waypoints.csv'
+    pd.DataFrame([{k: wp[k] for k in ('x', 'y', 'z', 'v') if k in wp} for wp in waypoints]).to_csv(waypoints_filename, index=False)
+    print(f"Data saved to {filename} (waypoints in {waypoints_filename})")
 
 
 def plot3DAnimation(positions, angles_history, rpms_history, time_history, horiz_speed_history, vertical_speed_history, 
@@ -0,0 +1,52 @@
+# Author: Andrea Vaiuso
+# Version: 1.0
+# Date: 18.10.2026
+# Description: Shared fixtures of the test suite. The tests run from the repository root, so that the relative
+# paths of parameters.yaml (rotor model, noise data) resolve, and fly in a small synthetic World instead of the
+# world files, which are not part of the repository.
+
+import os
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import main as mainfunc
+from World import World
+
+
+@pytest.fixture(autouse=True)
+def repository_root(monkeypatch):
+    monkeypatch.chdir(ROOT)
+
+
+@pytest.fixture
+def parameters():
+    """
+    Configuration of parameters.yaml with a short flight, using the NumPy rotor model so that torch is not needed.
+    """
+    parameters = mainfunc.load_parameters(os.path.join(ROOT, 'parameters.yaml'))
+    parameters['simulation_time'] = 4.0
+    parameters['rotor_model_path'] = 'Rotor/rotor_model.npz'
+    return parameters
+
+
+@pytest.fixture
+def world():
+    world = World(10, 200)
+    world.set_area_parameters(0, 100, 0, 50, World.AREA_PARAMS[1])
+    world.set_area_parameters(50, 150, 60, 200, World.AREA_PARAMS[2])
+    return world
+
+
+def create_drone(parameters, pid_gains=None):
+    """
+    Quadcopter at the initial state of main.py with the given PID gains (default: the gains of parameters.yaml).
+    """
+    state = mainfunc.create_initial_state()
+    pid_gains = pid_gains if pid_gains is not None else mainfunc.load_pid_gains(parameters)
+    thrust_max = mainfunc.get_max_thrust_from_rotor_model(parameters)
+    controller = mainfunc.create_quadcopter_controller(state, pid_gains, thrust_max, parameters)
+    return mainfunc.create_quadcopter_model(state, controller, parameters)
@@ -0,0 +1,53 @@
+# Author: Andrea Vaiuso
+# Version: 1.0
+# Date: 18.10.2026
+# Description: Regression tests of the batched simulation against the single-drone Simulation.
+
+import numpy as np
+import main as mainfunc
+from Drone import BatchQuadcopterModel
+from conftest import create_drone
+
+# The batched and single-drone dynamics round a few operations differently (see
+# BatchQuadcopterModel._rotational_dynamics) and the closed loop amplifies it, so lanes only
+# match Simulation closely at the beginning of a flight.
+MATCHING_FRAMES = 20
+POSITION_TOLERANCE = 1e-6
+
+
+def _gain_sets(parameters):
+    base = mainfunc.load_pid_gains(parameters)
+    faster = dict(base, kp_pos=base['kp_pos'] * 1.5)
+    return [base, faster]
+
+
+def test_batch_lanes_match_simulation(parameters, world):
+    waypoints = mainfunc.create_training_waypoints()
+    gain_sets = _gain_sets(parameters)
+    batch = mainfunc.create_batch_simulation([create_drone(parameters, g) for g in gain_sets], world,
+                                             waypoints, parameters)
+    batch.startSimulation(verbose=False)
+
+    for lane, pid_gains in enumerate(gain_sets):
+        sim = mainfunc.create_simulation(create_drone(parameters, pid_gains), world, waypoints, parameters)
+        sim.startSimulation(verbose=False)
+        history = batch.get_drone_history(lane)
+
+        assert len(history['positions']) == len(sim.positions)
+        np.testing.assert_array_equal(history['time_history'], sim.time_history)
+        np.testing.assert_allclose(history['positions'][:MATCHING_FRAMES], sim.positions[:MATCHING_FRAMES],
+                                   rtol=0, atol=POSITION_TOLERANCE)
+        np.testing.assert_allclose(history['rpms_history'][:MATCHING_FRAMES], sim.rpms_history[:MATCHING_FRAMES],
+                                   rtol=1e-6)
+
+
+def test_single_lane_model_step_matches_quadcopter_model(parameters):
+    drone = create_drone(parameters)
+    batch = BatchQuadcopterModel.from_models([create_drone(parameters)])
+    target = np.array([10.0, 5.0, 20.0])
+    dt = float(parameters['dt'])
+    for _ in range(500):
+        drone.update_state({'x': target[0], 'y': target[1], 'z': target[2]}, dt, verbose=False)
+        batch.update_state(target[None], dt)
+    np.testing.assert_allclose(batch.state[0], drone._y, rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(batch.rpm[0], drone.state['rpm'], rtol=1e-9)
@@ -0,0 +1,57 @@
+# Author: Andrea Vaiuso
+# Version: 1.0
+# Date: 18.10.2026
+# Description: Tests of the FlightRecorder buffers: recording, reuse after reset and trimming.
+
+import numpy as np
+import pytest
+from FlightRecorder import FlightRecorder
+
+COLUMNS = {'time': (), 'position': (3,), 'rpm': (4,)}
+
+
+def test_record_and_views():
+    recorder = FlightRecorder(COLUMNS, capacity=5)
+    recorder.record(time=0.1, position=[1.0, 2.0, 3.0], rpm=np.full(4, 100.0))
+    recorder.record(time=0.2, position=[4.0, 5.0, 6.0])
+    assert len(recorder) == 2
+    np.testing.assert_array_equal(recorder['time'], [0.1, 0.2])
+    np.testing.assert_array_equal(recorder['position'][1], [4.0, 5.0, 6.0])
+    # Columns that are not given keep zeros
+    np.testing.assert_array_equal(recorder['rpm'][1], np.zeros(4))
+    assert set(recorder.as_dict()) == set(COLUMNS)
+
+
+def test_reset_zeroes_reused_rows():
+    recorder = FlightRecorder(COLUMNS, capacity=5)
+    for i in range(3):
+        recorder.record(time=i, position=[i, i, i], rpm=np.full(4, 1000.0 + i))
+    buffer = recorder._buffers['rpm']
+    recorder.reset()
+    assert recorder._buffers['rpm'] is buffer
+    recorder.record(time=10.0)
+    recorder.record(time=11.0, rpm=np.ones(4))
+    np.testing.assert_array_equal(recorder['rpm'], [np.zeros(4), np.ones(4)])
+    np.testing.assert_array_equal(recorder['position'], np.zeros((2, 3)))
+
+
+def test_reset_with_new_capacity_and_full_recorder():
+    recorder = FlightRecorder(COLUMNS, capacity=2)
+    recorder.record(time=1.0)
+    recorder.record(time=2.0)
+    with pytest.raises(IndexError):
+        recorder.record(time=3.0)
+    recorder.reset(4)
+    assert recorder.capacity == 4 and len(recorder) == 0
+    assert FlightRecorder.frames_for(1.0, 0.01, 10) == 11
+
+
+def test_trim_copies_the_recorded_frames():
+    recorder = FlightRecorder(COLUMNS, capacity=100)
+    recorder.record(time=1.0, position=[1.0, 2.0, 3.0])
+    view = recorder['position']
+    recorder.trim()
+    assert recorder.capacity == 1
+    assert recorder._buffers['position'].shape == (1, 3)
+    assert not np.shares_memory(recorder['position'], view)
+    np.testing.assert_array_equal(recorder['position'], view)
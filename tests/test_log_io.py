@@ -0,0 +1,82 @@
+# Author: Andrea Vaiuso
+# Version: 1.0
+# Date: 18.10.2026
+# Description: Round-trip tests of the columnar log formats and of the CSV export of saveLogData.
+
+import numpy as np
+import pandas as pd
+import pytest
+from log_io import save_log, load_log
+from plotting_functions import saveLogData
+
+WAYPOINTS = [{'x': 10.0, 'y': 10.0, 'z': 70.0, 'v': 5}, {'x': 90.0, 'y': 10.0, 'z': 70.0, 'v': 5},
+             {'x': 90.0, 'y': 90.0, 'z': 90.0, 'v': 5}]
+
+
+def _columns(n_frames=37):
+    rng = np.random.default_rng(0)
+    return {
+        'time': np.arange(n_frames) * 0.07,
+        'position': rng.normal(size=(n_frames, 3)),
+        'rpm': rng.uniform(0, 3000, size=(n_frames, 4)),
+    }
+
+
+def _histories(n_frames=37):
+    rng = np.random.default_rng(1)
+    return dict(positions=rng.normal(size=(n_frames, 3)), angles_history=rng.normal(size=(n_frames, 3)),
+                rpms_history=rng.uniform(0, 3000, size=(n_frames, 4)), time_history=np.arange(n_frames) * 0.07,
+                horiz_speed_history=rng.uniform(size=n_frames), vertical_speed_history=rng.uniform(size=n_frames),
+                spl_history=rng.uniform(size=n_frames), swl_history=rng.uniform(size=n_frames))
+
+
+@pytest.mark.parametrize('path, compress', [('log', False), ('log.npz', False), ('log.npz', True)])
+def test_log_round_trip(tmp_path, path, compress):
+    columns = _columns()
+    columns['flags'] = np.arange(37, dtype=np.int32)
+    metadata = {'dt': 0.007, 'waypoints': [[0.0, 0.0, 10.0]]}
+    target = str(tmp_path / path)
+    save_log(target, columns, metadata=metadata, compress=compress)
+
+    data, loaded_metadata = load_log(target)
+    assert loaded_metadata == metadata
+    assert set(data) == set(columns)
+    for name, values in columns.items():
+        assert data[name].dtype == values.dtype
+        np.testing.assert_array_equal(data[name], values)
+
+    subset, _ = load_log(target, columns=['rpm'], mmap=False)
+    assert list(subset) == ['rpm']
+    np.testing.assert_array_equal(subset['rpm'], columns['rpm'])
+
+
+@pytest.mark.parametrize('n_frames', [2, 37])
+def test_save_log_data_csv_keeps_every_frame_and_waypoint(tmp_path, n_frames):
+    histories = _histories(n_frames)
+    filename = str(tmp_path / 'flight.log')
+    saveLogData(**histories, waypoints=WAYPOINTS, filename=filename)
+
+    frames = pd.read_csv(filename)
+    assert len(frames) == n_frames
+    assert 'Waypoints' not in frames
+    np.testing.assert_allclose(frames['Time'], histories['time_history'])
+    np.testing.assert_allclose(frames[['RPM1', 'RPM2', 'RPM3', 'RPM4']], histories['rpms_history'])
+    waypoints = pd.read_csv(str(tmp_path / 'flight_waypoints.csv'))
+    assert waypoints.to_dict('records') == WAYPOINTS
+
+
+@pytest.mark.parametrize('path, fmt', [('flight.npz', None), ('flight', 'binary')])
+def test_save_log_data_binary(tmp_path, path, fmt):
+    histories = _histories()
+    filename = str(tmp_path / path)
+    saveLogData(**histories, waypoints=WAYPOINTS, filename=filename, format=fmt)
+
+    data, metadata = load_log(filename)
+    assert metadata['waypoints'] == WAYPOINTS
+    np.testing.assert_array_equal(data['position'], histories['positions'])
+    np.testing.assert_array_equal(data['rpm'], histories['rpms_history'])
+
+
+def test_save_log_data_rejects_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        saveLogData(**_histories(), waypoints=WAYPOINTS, filename=str(tmp_path / 'flight.csv'), format='parquet')
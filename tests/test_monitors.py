@@ -0,0 +1,66 @@
+# Author: Andrea Vaiuso
+# Version: 1.0
+# Date: 18.10.2026
+# Description: Tests of the FlightPruner reason codes and of its partial cost against the optimization cost.
+
+import numpy as np
+import pytest
+import main as mainfunc
+from Monitors import FlightPruner
+from conftest import create_drone
+
+TARGET = np.zeros(3)
+THRUST = np.array([10.0, 10.5, 10.0, 9.5])
+
+
+def _update(pruner, position=(0.0, 0.0, 1.0), angles=(0.0, 0.0, 0.0), thrust=THRUST, current_time=1.0):
+    return pruner.update(current_time, np.asarray(position, dtype=float), np.asarray(angles, dtype=float),
+                         TARGET, np.asarray(thrust, dtype=float))
+
+
+def test_stable_frame_is_not_pruned():
+    assert _update(FlightPruner()) is None
+
+
+@pytest.mark.parametrize('frame, reason', [
+    ({'position': (np.nan, 0.0, 1.0)}, FlightPruner.NAN_STATE),
+    ({'angles': (0.0, np.inf, 0.0)}, FlightPruner.NAN_STATE),
+    ({'thrust': (10.0, np.nan, 10.0, 10.0)}, FlightPruner.NAN_STATE),
+    ({'angles': (1.7, 0.0, 0.0)}, FlightPruner.ATTITUDE),
+    ({'angles': (0.0, -1.7, 0.0)}, FlightPruner.ATTITUDE),
+    ({'position': (60.0, 0.0, 0.0)}, FlightPruner.DIVERGENCE),
+])
+def test_unstable_frames_are_pruned(frame, reason):
+    assert _update(FlightPruner(max_attitude=np.pi / 2, max_target_distance=50.0), **frame) == reason
+
+
+def test_yaw_does_not_trigger_attitude_abort():
+    assert _update(FlightPruner(max_attitude=0.5), angles=(0.0, 0.0, 3.0)) is None
+
+
+def test_cost_bound_abort():
+    pruner = FlightPruner(cost_bound=2.0)
+    assert _update(pruner, current_time=1.0) is None
+    assert _update(pruner, angles=(0.1, 0.0, 0.0), current_time=2.0) == FlightPruner.COST_BOUND
+    expected = 2.0 + pruner.osc_weight * (0.1 + 2 * np.sum(np.abs(np.diff(THRUST))) * pruner.thrust_osc_scale)
+    assert pruner.partial_cost == pytest.approx(expected)
+    pruner.reset()
+    assert pruner.partial_cost == 0.0 and pruner.pitch_osc == 0.0
+
+
+def test_partial_cost_matches_optimization_cost_terms(parameters, world):
+    waypoints = mainfunc.create_training_waypoints()
+    pruner = FlightPruner(max_attitude=np.pi, max_target_distance=1e6)
+    sim = mainfunc.create_simulation(create_drone(parameters), world, waypoints, parameters, pruner=pruner)
+    sim.startSimulation(verbose=False)
+    assert sim.prune_reason is None
+
+    # Oscillation terms of the pid_optimization cost, computed from the histories of the complete flight
+    angles = sim.angles_history
+    pitch_osc = np.sum(np.abs(np.diff(angles[:, 0])))
+    roll_osc = np.sum(np.abs(np.diff(angles[:, 1])))
+    thrust_osc = np.sum(np.abs(np.diff(sim.thrust_history))) * 1e-5
+    assert pruner.pitch_osc == pytest.approx(pitch_osc, rel=1e-12)
+    assert pruner.roll_osc == pytest.approx(roll_osc, rel=1e-12)
+    assert pruner.thrust_osc == pytest.approx(thrust_osc, rel=1e-12)
+    assert pruner.partial_cost == pytest.approx(sim.time_history[-1] + 3.0 * (pitch_osc + roll_osc + thrust_osc))
@@ -0,0 +1,100 @@
+# Author: Andrea Vaiuso
+# Version: 1.0
+# Date: 18.10.2026
+# Description: Tests of the Bayesian PID optimization script: resuming a campaign from its evaluation journal
+# and the costs registered for pruned flights.
+
+import importlib
+import json
+import sys
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from bayes_opt import BayesianOptimization
+import main as mainfunc
+from Monitors import FlightPruner
+from World import World
+
+
+@pytest.fixture
+def pid_optimization(monkeypatch, world):
+    """
+    Fresh import of pid_optimization.py flying in the synthetic world, with the simulation cache disabled.
+    """
+    load_optimization_parameters = mainfunc.load_optimization_parameters
+    monkeypatch.setattr(World, 'load_world', classmethod(lambda cls, filename: world))
+    monkeypatch.setattr(mainfunc, 'load_optimization_parameters',
+                        lambda filename: {**load_optimization_parameters(filename), 'simulation_cache_dir': None})
+    monkeypatch.delitem(sys.modules, 'pid_optimization', raising=False)
+    return importlib.import_module('pid_optimization')
+
+
+GAINS = [f'{term}_{loop}' for loop in ('pos', 'alt', 'att', 'hsp', 'vsp') for term in ('kp', 'ki', 'kd')]
+
+
+def _make_optimizer():
+    return BayesianOptimization(f=None, pbounds={gain: (1e-6, 1e3) for gain in GAINS},
+                                random_state=42, allow_duplicate_points=True)
+
+
+def _record(params, cost):
+    return {'params': {k: float(v) for k, v in params.items()}, 'target': -cost, 'cost': cost, 'final_time': cost}
+
+
+def test_resume_matches_initial_points_by_gains(pid_optimization, tmp_path):
+    init_points = _make_optimizer().random_sample(5)
+    suggestions = [dict.fromkeys(GAINS, 1.5), dict.fromkeys(GAINS, 3.5)]
+    # Completion order of a parallel campaign: initial points and suggestions interleaved, out of order
+    records = [_record(init_points[2], 10.0), _record(suggestions[0], 12.0), _record(init_points[0], 8.0),
+               _record(suggestions[1], 11.0), _record(init_points[4], 9.0)]
+    journal = tmp_path / 'journal.jsonl'
+    journal.write_text(''.join(json.dumps(record) + '\n' for record in records) + '{"params": {"kp_')
+
+    optimizer = _make_optimizer()
+    replayed = pid_optimization.replay_journal(optimizer, str(journal))
+    assert len(replayed) == len(records)
+    assert len(optimizer.space) == len(records)
+    assert pid_optimization.best_target == -8.0
+
+    pending, n_suggested = pid_optimization.match_initial_points(_make_optimizer().random_sample(5), replayed)
+    assert n_suggested == 2
+    assert pending == [init_points[1], init_points[3]]
+    # The truncated last line has been terminated, so new evaluations are appended on lines of their own
+    assert journal.read_text().endswith('\n')
+
+
+def test_resume_tolerates_rounding_of_the_gains(pid_optimization):
+    init_points = _make_optimizer().random_sample(2)
+    rounded = {k: v * (1 + 1e-12) for k, v in init_points[1].items()}
+    pending, n_suggested = pid_optimization.match_initial_points(init_points, [_record(rounded, 1.0)])
+    assert n_suggested == 0
+    assert pending == [init_points[0]]
+
+
+def _pruned_simulation(prune_reason, position):
+    pruner = FlightPruner()
+    pruner.pitch_osc, pruner.roll_osc, pruner.thrust_osc = 0.5, 0.25, 0.125
+    pruner.partial_cost = 12.0 + pruner.osc_weight * 0.875
+    return SimpleNamespace(pruner=pruner, prune_reason=prune_reason, navigation_time=12.0,
+                           drone=SimpleNamespace(state={'pos': np.asarray(position, dtype=float)}))
+
+
+def test_cost_bound_abort_registers_partial_cost(pid_optimization):
+    sim = _pruned_simulation(FlightPruner.COST_BOUND, (50.0, 50.0, 50.0))
+    result = pid_optimization.pruned_result(sim)
+    assert result[0] == sim.pruner.partial_cost
+    assert result[1] == 12.0
+    assert result[-2:] == (False, FlightPruner.COST_BOUND)
+
+
+@pytest.mark.parametrize('reason', [FlightPruner.NAN_STATE, FlightPruner.ATTITUDE, FlightPruner.DIVERGENCE])
+def test_unstable_abort_registers_not_reached_cost(pid_optimization, reason):
+    position = (np.nan, 0.0, 0.0) if reason == FlightPruner.NAN_STATE else (20.0, 30.0, 40.0)
+    sim = _pruned_simulation(reason, position)
+    result = pid_optimization.pruned_result(sim)
+    compiled_path = pid_optimization.compiled_path
+    aborted_at = compiled_path.start_position if reason == FlightPruner.NAN_STATE else np.asarray(position)
+    distance = np.linalg.norm(aborted_at - compiled_path.final_target)
+    expected = pid_optimization.simulation_time + distance ** 0.9 + sim.pruner.osc_weight * 0.875 + 1000
+    assert result[0] == pytest.approx(expected, rel=1e-12)
+    assert result[-1] == reason
@@ -0,0 +1,89 @@
+# Author: Andrea Vaiuso
+# Version: 1.0
+# Date: 18.10.2026
+# Description: Tests of the rotor aerodynamic backends: per-rotor and fused evaluation of the neural rotor model,
+# and the rotor lookup table against the model it is sampled from.
+
+import numpy as np
+import pytest
+from conftest import create_drone
+from Rotor.NumpyRotorModel import load_rotor_model, FusedRotorModel
+from Rotor.RotorLookupTable import RotorLookupTable
+
+MAX_RPM = 3000.0
+
+
+@pytest.fixture(scope='module')
+def rotor_model():
+    return load_rotor_model('Rotor/rotor_model.npz')
+
+
+def test_torch_batch_matches_per_rotor_evaluation():
+    pytest.importorskip('torch')
+    model = load_rotor_model('Rotor/rotor_model.pth')
+    rpms = np.random.default_rng(1).uniform(0.0, MAX_RPM, (3, 4))
+    output = model.predict_aerodynamic_batch(rpms)
+    assert output.shape == (3, 4, 6)
+    expected = np.array([model.predict_aerodynamic(rpm) for rpm in rpms.ravel().tolist()]).reshape(3, 4, 6)
+    np.testing.assert_array_equal(output, expected)
+    np.testing.assert_allclose(model.predict_aerodynamic_fused(rpms), expected, rtol=1e-5, atol=1e-5)
+
+
+def test_drone_backend_selection(parameters):
+    parameters['rotor_backend'] = 'mlp_batch'
+    drone = create_drone(parameters)
+    assert isinstance(drone.aero_backend, FusedRotorModel)
+    parameters['rotor_backend'] = 'mlp'
+    assert create_drone(parameters).aero_backend is drone.rotor_model
+    parameters['rotor_backend'] = 'unknown'
+    with pytest.raises(ValueError):
+        create_drone(parameters)
+
+
+@pytest.mark.parametrize('method', ['linear', 'cubic'])
+def test_lookup_table_meets_tolerance(rotor_model, method):
+    tolerance = 1e-3
+    table = RotorLookupTable.from_rotor_model(rotor_model, MAX_RPM, method=method, n_samples=65,
+                                              tolerance=tolerance)
+    assert np.all(table.max_rel_error <= tolerance)
+
+    # Independent check on random RPMs, with the relative error defined as in error_report
+    rpms = np.random.default_rng(0).uniform(0.0, MAX_RPM, 5000)
+    reference = rotor_model.predict_aerodynamic_batch(rpms)
+    scale = np.abs(rotor_model.predict_aerodynamic_batch(np.linspace(0.0, MAX_RPM, 1001))).max(axis=0)
+    deviation = np.abs(table.predict_aerodynamic_batch(rpms) - reference).max(axis=0)
+    assert np.all(deviation <= tolerance * scale)
+
+
+def test_lookup_table_matches_model_on_grid(rotor_model):
+    table = RotorLookupTable.from_rotor_model(rotor_model, MAX_RPM, n_samples=257)
+    np.testing.assert_allclose(table.predict_aerodynamic_batch(table.rpm_grid),
+                               rotor_model.predict_aerodynamic_batch(table.rpm_grid), rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize('method', ['linear', 'cubic'])
+def test_lookup_table_non_finite_rpms(rotor_model, method):
+    table = RotorLookupTable.from_rotor_model(rotor_model, MAX_RPM, method=method, n_samples=257)
+    rpms = np.array([100.0, np.nan, 2000.0, np.inf, -np.inf])
+    output = table.predict_aerodynamic_batch(rpms)
+    assert output.shape == (5, 6)
+    assert np.all(np.isnan(output[[1, 3, 4]]))
+    np.testing.assert_array_equal(output[[0, 2]], table.predict_aerodynamic_batch(rpms[[0, 2]]))
+
+
+def test_optimization_parameters_use_numpy_export():
+    import main as mainfunc
+    parameters = mainfunc.load_optimization_parameters('parameters.yaml')
+    assert parameters['rotor_model_path'] == 'Rotor/rotor_model.npz'
+    assert mainfunc.load_parameters('parameters.yaml')['rotor_model_path'] == 'Rotor/rotor_model.pth'
+
+
+def test_numpy_export_is_up_to_date():
+    torch = pytest.importorskip('torch')
+    state = torch.load('Rotor/rotor_model.pth')
+    norm_params = torch.load('Rotor/normalization_params.pth')
+    with np.load('Rotor/rotor_model.npz') as exported:
+        for name, tensor in state.items():
+            np.testing.assert_array_equal(exported[name.replace('.', '_')], tensor.numpy())
+        for name, tensor in norm_params.items():
+            np.testing.assert_array_equal(exported[name], tensor.numpy())
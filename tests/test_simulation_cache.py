@@ -0,0 +1,88 @@
+# Author: Andrea Vaiuso
+# Version: 1.0
+# Date: 18.10.2026
+# Description: Tests of the SimulationCache: keys, least recently used eviction and directory rescans.
+
+import os
+import numpy as np
+from SimulationCache import SimulationCache
+
+CONTEXT = {'version': 0, 'objective': 'test'}
+
+
+def _gains(i):
+    return {'kp_pos': 1.0 + i, 'ki_pos': 0.5}
+
+
+def _entries_on_disk(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith('.json'))
+
+
+def _set_last_use(cache, key, timestamp):
+    os.utime(cache._path(key), (timestamp, timestamp))
+    cache._index[key][0] = timestamp
+
+
+def test_round_trip_and_keys(tmp_path):
+    cache = SimulationCache(str(tmp_path), CONTEXT)
+    key = cache.make_key(_gains(0))
+    assert cache.get(key) is None
+    cache.put(key, {'result': [1.0, 2.0]}, telemetry={'positions': np.arange(6.0).reshape(2, 3)})
+    assert cache.get(key) == {'result': [1.0, 2.0]}
+    np.testing.assert_array_equal(cache.get_telemetry(key)['positions'], np.arange(6.0).reshape(2, 3))
+    assert (cache.hits, cache.misses) == (1, 1)
+    # Gains equal up to gain_digits share the entry, other contexts do not
+    assert cache.make_key({'kp_pos': 1.0 + 1e-13, 'ki_pos': 0.5}) == key
+    assert SimulationCache(str(tmp_path), dict(CONTEXT, objective='other')).make_key(_gains(0)) != key
+
+
+def test_eviction_keeps_most_recently_used_entries(tmp_path):
+    cache = SimulationCache(str(tmp_path), CONTEXT, max_entries=10)
+    keys = [cache.make_key(_gains(i)) for i in range(15)]
+    for i, key in enumerate(keys[:10]):
+        cache.put(key, {'i': i})
+        _set_last_use(cache, key, 1000.0 + i)
+    _set_last_use(cache, keys[0], 2000.0)  # Recently used: must survive the eviction
+
+    cache.put(keys[10], {'i': 10})
+    # Over the limit: evicted down to EVICTION_TARGET of it, least recently used first
+    assert len(cache) == 9
+    assert _entries_on_disk(tmp_path) == sorted(k + '.json' for k in cache._index)
+    assert cache.get(keys[0]) == {'i': 0}
+    for key in keys[1:3]:
+        assert cache.get(key) is None
+
+    for i, key in enumerate(keys[11:], start=11):
+        cache.put(key, {'i': i})
+        assert len(_entries_on_disk(tmp_path)) <= 10
+
+
+def test_size_limit(tmp_path):
+    cache = SimulationCache(str(tmp_path), CONTEXT, max_entries=None, max_mb=0.01)
+    for i in range(20):
+        cache.put(cache.make_key(_gains(i)), {'payload': 'x' * 1000})
+    total = sum(os.path.getsize(os.path.join(tmp_path, name)) for name in _entries_on_disk(tmp_path))
+    assert total <= cache.max_bytes
+    assert total == cache._total_bytes
+
+
+def test_put_rescans_directory_only_periodically(tmp_path, monkeypatch):
+    cache = SimulationCache(str(tmp_path), CONTEXT, max_entries=1000)
+    scans = []
+    scan = cache._scan
+    monkeypatch.setattr(cache, '_scan', lambda known=None: scans.append(1) or scan(known))
+    for i in range(cache._rescan_interval - 1):
+        cache.put(cache.make_key(_gains(i)), {'i': i})
+    assert not scans
+    cache.put(cache.make_key(_gains(-1)), {'i': -1})
+    assert len(scans) == 1
+
+
+def test_limits_apply_to_entries_of_all_workers(tmp_path):
+    first = SimulationCache(str(tmp_path), CONTEXT, max_entries=20)
+    second = SimulationCache(str(tmp_path), CONTEXT, max_entries=20)
+    for i in range(40):
+        cache = first if i % 2 else second
+        cache.put(cache.make_key(_gains(i)), {'i': i})
+    # Each worker rescans every _rescan_interval puts, so the overshoot is bounded by the workers' intervals
+    assert len(_entries_on_disk(tmp_path)) <= 20 + first._rescan_interval + second._rescan_interval
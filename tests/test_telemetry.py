@@ -0,0 +1,79 @@
+# Author: Andrea Vaiuso
+# Version: 1.0
+# Date: 18.10.2026
+# Description: Round-trip tests of the telemetry stream, of files left by interrupted runs and of a streamed Simulation.
+
+import numpy as np
+import pytest
+import main as mainfunc
+from Telemetry import TelemetrySink, load_telemetry
+from conftest import create_drone
+
+
+def _columns(n_frames=37):
+    rng = np.random.default_rng(0)
+    return {
+        'time': np.arange(n_frames) * 0.07,
+        'position': rng.normal(size=(n_frames, 3)),
+        'rpm': rng.uniform(0, 3000, size=(n_frames, 4)),
+    }
+
+
+@pytest.mark.parametrize('mmap', [True, False])
+def test_telemetry_round_trip(tmp_path, mmap):
+    columns = _columns()
+    filename = str(tmp_path / 'flight.tlm')
+    with TelemetrySink(filename, chunk_frames=8) as sink:
+        sink.open({name: values.shape[1:] for name, values in columns.items()}, metadata={'dt': 0.007})
+        for start in range(0, 37, 8):
+            sink.write({name: values[start:start + 8] for name, values in columns.items()})
+    data, metadata = load_telemetry(filename, mmap=mmap)
+    assert metadata == {'dt': 0.007}
+    assert set(data) == set(columns)
+    for name, values in columns.items():
+        np.testing.assert_array_equal(data[name], values)
+
+
+def test_telemetry_ignores_incomplete_record(tmp_path):
+    columns = _columns()
+    filename = str(tmp_path / 'flight.tlm')
+    with TelemetrySink(filename) as sink:
+        sink.open({name: values.shape[1:] for name, values in columns.items()})
+        sink.write(columns)
+    with open(filename, 'ab') as file:
+        file.write(b'\x00' * 5)  # Partial record left by an interrupted run
+    data, _ = load_telemetry(filename, columns=['rpm'], mmap=False)
+    np.testing.assert_array_equal(data['rpm'], columns['rpm'])
+
+
+def test_telemetry_readable_before_close(tmp_path):
+    # A run that crashes never closes its sink: the chunks written so far must still be readable
+    columns = _columns()
+    filename = str(tmp_path / 'flight.tlm')
+    sink = TelemetrySink(filename, chunk_frames=8)
+    sink.open({name: values.shape[1:] for name, values in columns.items()})
+    sink.write({name: values[:16] for name, values in columns.items()})
+    data, _ = load_telemetry(filename, mmap=False)
+    np.testing.assert_array_equal(data['position'], columns['position'][:16])
+    sink.close()
+
+
+def test_telemetry_rejects_invalid_chunk_size(tmp_path):
+    with pytest.raises(ValueError):
+        TelemetrySink(str(tmp_path / 'flight.tlm'), chunk_frames=0)
+
+
+def test_simulation_telemetry_matches_recorded_histories(tmp_path, parameters, world):
+    waypoints = mainfunc.create_training_waypoints()
+    sim = mainfunc.create_simulation(create_drone(parameters), world, waypoints, parameters)
+    sim.startSimulation(verbose=False)
+
+    filename = str(tmp_path / 'flight.tlm')
+    streamed = mainfunc.create_simulation(create_drone(parameters), world, waypoints, parameters)
+    streamed.startSimulation(verbose=False, telemetry=TelemetrySink(filename, chunk_frames=7))
+    data, _ = load_telemetry(filename)
+
+    assert streamed.recorder.capacity <= 7
+    np.testing.assert_array_equal(data['time'], sim.time_history)
+    np.testing.assert_array_equal(data['position'], sim.positions)
+    np.testing.assert_array_equal(data['rpm'], sim.rpms_history)
@@ -0,0 +1,131 @@
+# Author: Andrea Vaiuso
+# Version: 1.0
+# Date: 18.10.2026
+# Description: Tests of the Dryden turbulence generators of Wind.py.
+
+import numpy as np
+import pytest
+from scipy import signal
+import main as mainfunc
+from Wind import (DrydenGenerator, DrydenCoefficientTable, ScheduledDrydenGenerator, dryden_filter, dryden_scales,
+                  dryden_wind_batch, get_dryden_table)
+from conftest import create_drone
+
+DT = 0.01
+
+
+def _generate(generator, n_steps):
+    return np.array([generator.step() for _ in range(n_steps)])
+
+
+def test_generator_is_reproducible_and_leaves_global_rng_alone():
+    state = np.random.get_state()
+    first = _generate(DrydenGenerator(DT, seed=3), 200)
+    after = np.random.get_state()
+    assert after[0] == state[0] and np.array_equal(after[1], state[1])
+
+    generator = DrydenGenerator(DT, seed=3)
+    np.testing.assert_array_equal(_generate(generator, 200), first)
+    generator.reset()
+    np.testing.assert_array_equal(_generate(generator, 200), first)
+    generator.reset(seed=4)
+    assert not np.allclose(_generate(generator, 200), first)
+    assert first.shape == (200, 3)
+
+
+@pytest.mark.parametrize('method', ['zoh', 'bilinear'])
+def test_generator_matches_discretized_transfer_functions(method):
+    axes = ('u', 'v', 'w')
+    generator = DrydenGenerator(DT, height=50, airspeed=8, turbulence_level=20, axis=axes, seed=7, method=method)
+    samples = _generate(generator, 500)
+    # Same white noise as the generator: one draw per axis at each step, scaled to variance pi / dt
+    noise = np.random.default_rng(7).standard_normal((500, len(axes))) * np.sqrt(np.pi / DT)
+    for j, axis in enumerate(axes):
+        b, a = dryden_filter(DT, 50, 8, axis, 20, method)
+        np.testing.assert_allclose(samples[:, j], signal.lfilter(b, a, noise[:, j]), rtol=1e-9, atol=1e-9)
+
+
+def _fly(parameters, world, **wind):
+    sim = mainfunc.create_simulation(create_drone(parameters), world, mainfunc.create_training_waypoints(), parameters)
+    if wind:
+        sim.setWind(max_simulation_time=parameters['simulation_time'], dt=parameters['dt'], **wind)
+    sim.startSimulation(verbose=False)
+    return sim
+
+
+def test_streaming_wind_in_simulation(parameters, world):
+    # The wind enters the model through the blade flapping angle delta_b (see QuadcopterModel.update_wind)
+    windy = _fly(parameters, world, seed=5, streaming=True)
+    assert np.any(windy.delta_b_history != 0)
+    assert not np.any(_fly(parameters, world).delta_b_history)
+    np.testing.assert_array_equal(_fly(parameters, world, seed=5, streaming=True).delta_b_history,
+                                  windy.delta_b_history)
+
+
+def test_wind_batch_matches_generators():
+    seeds = [1, 2, 3]
+    wind = dryden_wind_batch(seeds, 300, DT, height=40, airspeed=6, turbulence_level=25)
+    assert wind.shape == (3, 3, 300)
+    assert wind.flags['C_CONTIGUOUS']
+    for i, seed in enumerate(seeds):
+        expected = _generate(DrydenGenerator(DT, height=40, airspeed=6, turbulence_level=25, seed=seed), 300)
+        np.testing.assert_allclose(wind[i], expected.T, rtol=1e-9, atol=1e-9)
+
+
+def test_wind_batch_standard_deviation_matches_dryden_sigma():
+    wind = dryden_wind_batch(range(4), 100000, DT, height=20, airspeed=10, turbulence_level=30, axis='w')
+    assert wind.shape == (4, 1, 100000)
+    _, sigma = dryden_scales(20, 30)
+    assert wind.std() == pytest.approx(sigma, rel=0.1)
+
+
+def test_simulation_uses_wind_batch_realization(parameters, world):
+    wind = dryden_wind_batch([5], int(parameters['simulation_time'] / parameters['dt']), parameters['dt'])
+    sim = mainfunc.create_simulation(create_drone(parameters), world, mainfunc.create_training_waypoints(), parameters)
+    with pytest.raises(ValueError):
+        sim.setWindSignals(wind[0][:, :10])
+    sim.setWindSignals(wind[0])
+    sim.startSimulation(verbose=False)
+    # The generator with the same seed produces the same realization, step by step
+    streamed = _fly(parameters, world, seed=5, streaming=True)
+    np.testing.assert_allclose(sim.delta_b_history, streamed.delta_b_history, rtol=1e-9, atol=1e-12)
+
+
+def test_coefficient_table_grid_points_and_clamping():
+    table = DrydenCoefficientTable(DT, heights=(10, 50), airspeeds=(5, 10), turbulence_levels=(30,))
+    coefficients = table.lookup(50, 5, 30)
+    assert coefficients.shape == (3, 2, 3)
+    for j, axis in enumerate(('u', 'v', 'w')):
+        b, a = dryden_filter(DT, 50, 5, axis, 30)
+        np.testing.assert_allclose(coefficients[j, 1, :len(a)], a / a[0], rtol=1e-12)
+        np.testing.assert_allclose(coefficients[j, 0, len(a) - len(b):len(a)], b / a[0], rtol=1e-12)
+    # Linear interpolation between grid points, closest point outside the grid
+    np.testing.assert_allclose(table.lookup(30, 5, 30), 0.5 * (table.lookup(10, 5, 30) + coefficients), rtol=1e-12)
+    np.testing.assert_array_equal(table.lookup(500, 1, 80), table.lookup(50, 5, 30))
+    with pytest.raises(ValueError):
+        table.coefficients[0, 0, 0, 0, 0, 0] = 1.0
+
+
+def test_interpolated_filters_are_stable():
+    table = get_dryden_table(DT)
+    assert get_dryden_table(DT) is table
+    rng = np.random.default_rng(0)
+    for height, airspeed, level in zip(rng.uniform(1, 200, 50), rng.uniform(1, 30, 50), rng.uniform(10, 50, 50)):
+        for a in table.lookup(height, airspeed, level)[:, 1]:
+            assert np.all(np.abs(np.roots(np.trim_zeros(a, 'b'))) < 1.0)
+
+
+def test_scheduled_generator_with_constant_conditions_matches_generator():
+    table = get_dryden_table(DT)
+    scheduled = ScheduledDrydenGenerator(table, turbulence_level=30, seed=9)
+    samples = np.array([scheduled.step(height=50, airspeed=10) for _ in range(300)])
+    expected = _generate(DrydenGenerator(DT, height=50, airspeed=10, turbulence_level=30, seed=9), 300)
+    np.testing.assert_allclose(samples, expected, rtol=1e-7, atol=1e-9)
+    scheduled.reset()
+    np.testing.assert_array_equal(np.array([scheduled.step(height=50, airspeed=10) for _ in range(300)]), samples)
+
+
+def test_scheduled_wind_in_simulation(parameters, world):
+    sim = _fly(parameters, world, seed=5, streaming=True, schedule=True)
+    assert isinstance(sim.wind_generator, ScheduledDrydenGenerator)
+    assert np.all(np.isfinite(sim.delta_b_history)) and np.any(sim.delta_b_history != 0)
@@ -0,0 +1,88 @@
+# Author: Andrea Vaiuso
+# Version: 1.0
+# Date: 18.10.2026
+# Description: Tests of the spatially correlated WindField: deterministic tiles, continuity across tiles,
+# trilinear sampling, advection by the mean wind and the bounded tile cache.
+
+import numpy as np
+import pytest
+import main as mainfunc
+from Wind import dryden_scales
+from WindField import WindField
+from conftest import create_drone
+
+
+def _field(**kwargs):
+    options = dict(grid_size=10.0, sigma=2.0, length_scale=20.0, tile_cells=8, seed=1)
+    options.update(kwargs)
+    return WindField(**options)
+
+
+def test_tiles_do_not_depend_on_computation_order():
+    first, second = _field(), _field()
+    indices = [(0, 0, 0), (1, 0, 0), (0, -1, 2)]
+    tiles = [first.tile(index) for index in indices]
+    for index, tile in zip(reversed(indices), reversed(tiles)):
+        np.testing.assert_array_equal(second.tile(index), tile)
+    assert not np.array_equal(_field(seed=2).tile((0, 0, 0)), tiles[0])
+    assert tiles[0].shape == (3, 9, 9, 9)
+    assert not tiles[0].flags.writeable
+
+
+def test_neighbouring_tiles_share_their_boundary():
+    field = _field()
+    np.testing.assert_allclose(field.tile((0, 0, 0))[:, -1], field.tile((1, 0, 0))[:, 0], rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(field.tile((0, 0, 0))[:, :, :, -1], field.tile((0, 0, 1))[:, :, :, 0],
+                               rtol=1e-12, atol=1e-12)
+
+
+def test_sampling_interpolates_grid_points():
+    field = _field()
+    tile = field.tile((0, 0, 0))
+    np.testing.assert_allclose(field.sample([30.0, 40.0, 50.0]), tile[:, 3, 4, 5], rtol=1e-12)
+    midpoint = 0.5 * (tile[:, 3, 4, 5] + tile[:, 4, 4, 5])
+    np.testing.assert_allclose(field.sample([35.0, 40.0, 50.0]), midpoint, rtol=1e-12)
+    # Continuous across a tile boundary (x = 80 m)
+    np.testing.assert_allclose(field.sample([80.0 - 1e-9, 12.0, 7.0]), field.sample([80.0, 12.0, 7.0]), atol=1e-6)
+
+
+def test_turbulence_is_advected_by_the_mean_wind():
+    field = _field(mean_wind=(3.0, -1.0, 0.5))
+    position = np.array([12.0, 25.0, 40.0])
+    t = 4.0
+    np.testing.assert_allclose(field.sample(position + field.mean_wind * t, t=t),
+                               field.sample(position, t=0.0), rtol=1e-9)
+    np.testing.assert_allclose(field.sample(position) - field.mean_wind, _field().sample(position), rtol=1e-12)
+
+
+def test_standard_deviation_matches_sigma():
+    field = _field(tile_cells=32)
+    samples = np.concatenate([field.tile((i, 0, 0))[:, :-1, :-1, :-1].reshape(3, -1) for i in range(4)], axis=1)
+    assert samples.std() == pytest.approx(field.sigma, rel=0.2)
+
+
+def test_tile_cache_is_bounded_and_least_recently_used():
+    field = _field(max_tiles=2)
+    field.tile((0, 0, 0))
+    field.tile((1, 0, 0))
+    field.tile((0, 0, 0))
+    field.tile((2, 0, 0))
+    assert len(field) == 2
+    assert set(field._tiles) == {(0, 0, 0), (2, 0, 0)}
+    field.clear()
+    assert len(field) == 0
+
+
+def test_wind_field_in_simulation(parameters, world):
+    field = WindField.from_dryden(world, height=50, turbulence_level=30, tile_cells=8, seed=3)
+    length_scale, sigma = dryden_scales(50, 30)
+    assert (field.grid_size, field.length_scale, field.sigma) == (world.grid_size, length_scale, sigma)
+
+    sim = mainfunc.create_simulation(create_drone(parameters), world, mainfunc.create_training_waypoints(), parameters)
+    sim.setWindField(field)
+    sim.startSimulation(verbose=False)
+    assert np.any(sim.delta_b_history != 0)
+    assert 0 < len(field) <= field.max_tiles
+
+    sim.setWindField(None)
+    assert not sim.simulate_wind
@@ -0,0 +1,107 @@
+# Author: Andrea Vaiuso
+# Version: 1.0
+# Date: 18.10.2026
+# Description: Tests of the World area raster (batch lookups, legacy pickles) and of the area queries against the
+# original point-by-point implementation.
+
+import pickle
+import numpy as np
+import pytest
+from World import World, _disk_stencil
+
+
+def _reference_areas_in_circle(world, x, y, height, radius, include_areas_out_of_bounds):
+    """
+    Original get_areas_in_circle: sample grid from the (clipped) circle bounds, one lookup per point.
+    """
+    if include_areas_out_of_bounds:
+        min_x, max_x, min_y, max_y = x - radius, x + radius, y - radius, y + radius
+    else:
+        max_coordinate = world.max_world_size * world.grid_size
+        min_x, max_x = max(0, x - radius), min(max_coordinate, x + radius)
+        min_y, max_y = max(0, y - radius), min(max_coordinate, y + radius)
+    areas, parameters = [], []
+    for i in np.arange(min_x, max_x + 1, world.grid_size):
+        for j in np.arange(min_y, max_y + 1, world.grid_size):
+            if (i - x) ** 2 + (j - y) ** 2 > radius ** 2:
+                continue
+            for z in np.arange(0, height * world.grid_size, world.grid_size):
+                areas.append(tuple(float(c) for c in world.get_area_center_point(i, j, z)))
+                parameters.append(world.get_area_parameters(i, j, z))
+    return areas, parameters
+
+
+@pytest.mark.parametrize('include_areas_out_of_bounds', [False, True])
+@pytest.mark.parametrize('grid_size, max_world_size', [(10, 300), (5, 120), (1, 40)])
+def test_areas_in_circle_match_reference(grid_size, max_world_size, include_areas_out_of_bounds):
+    world = World(grid_size, max_world_size)
+    world.set_area_parameters(0, max_world_size // 2, 0, max_world_size // 4, World.AREA_PARAMS[1])
+    world.set_area_parameters(max_world_size // 4, max_world_size, max_world_size // 3, max_world_size,
+                              World.AREA_PARAMS[2])
+    rng = np.random.default_rng(grid_size)
+    for query in range(40):
+        # Centers near the world borders (integer and fractional) and well inside it
+        x, y = rng.uniform(-50, max_world_size * grid_size + 50, 2) if query % 3 == 0 else \
+            rng.uniform(-50, max_world_size + 50, 2)
+        if query % 2:
+            x, y = int(x), int(y)
+        radius = float(rng.choice([3 * grid_size, 7.5 * grid_size, 55.0]))
+        areas, parameters = world.get_areas_in_circle(x, y, 2, radius, include_areas_out_of_bounds)
+        expected_areas, expected_parameters = _reference_areas_in_circle(world, x, y, 2, radius,
+                                                                         include_areas_out_of_bounds)
+        assert areas == expected_areas
+        assert parameters == expected_parameters
+
+
+def _sample_world():
+    world = World(10, 200)
+    world.set_area_parameters(0, 100, 0, 50, World.AREA_PARAMS[1])
+    world.set_area_parameters(50, 150, 60, 200, World.AREA_PARAMS[2])
+    return world
+
+
+def test_batch_lookup_matches_scalar_lookup():
+    world = _sample_world()
+    rng = np.random.default_rng(0)
+    xs, ys = rng.uniform(-30, 230, (2, 500))
+    zs = rng.uniform(-5, 250, 500)
+    ids = world.get_area_ids_batch(xs, ys, zs)
+    assert ids.dtype == np.uint8
+    assert ids.tolist() == [world.get_area_id(x, y, z) for x, y, z in zip(xs, ys, zs)]
+    params = world.get_area_parameters_batch(xs, ys, zs)
+    for key in World.AREA_PARAM_KEYS:
+        assert params[key].tolist() == [world.get_area_parameters(x, y, z).get(key, 0)
+                                        for x, y, z in zip(xs, ys, zs)]
+
+
+def test_load_world_converts_legacy_grid(tmp_path):
+    world = _sample_world()
+    # Legacy pickles store every (ix, iy, iz) cell in a dict
+    grid = {(ix, iy, iz): int(world.area_ids[ix, iy])
+            for ix in range(world.n_cells) for iy in range(world.n_cells) for iz in range(3)}
+    filename = str(tmp_path / 'legacy.pkl')
+    with open(filename, 'wb') as file:
+        pickle.dump({'grid_size': 10, 'max_world_size': 200, 'grid': grid, 'world_name': 'legacy',
+                     'background_image': None}, file)
+    np.testing.assert_array_equal(World.load_world(filename).area_ids, world.area_ids)
+
+    world.save_world(str(tmp_path / 'raster.pkl'))
+    np.testing.assert_array_equal(World.load_world(str(tmp_path / 'raster.pkl')).area_ids, world.area_ids)
+
+
+def test_areas_in_circle_array_matches_list_version():
+    world = _sample_world()
+    for x, y, include_areas_out_of_bounds in [(100, 80, True), (3, 190, True), (57.5, 20.25, False)]:
+        centers, area_ids = world.get_areas_in_circle_array(x, y, 2, 40.0, include_areas_out_of_bounds)
+        areas, parameters = world.get_areas_in_circle(x, y, 2, 40.0, include_areas_out_of_bounds)
+        assert centers.shape == (len(areas), 3)
+        assert [tuple(c) for c in centers.tolist()] == areas
+        assert [World.AREA_PARAMS.get(i, {}) for i in area_ids.tolist()] == parameters
+
+
+def test_disk_stencil_is_cached_and_read_only():
+    dx, dy = _disk_stencil(100.0, 10)
+    assert _disk_stencil(100.0, 10)[0] is dx
+    assert np.all(dx ** 2 + dy ** 2 <= 100.0 ** 2)
+    with pytest.raises(ValueError):
+        dx[0] = 0.0